@@ -0,0 +1,255 @@
+"""
+Бенчмарки запускаются из каталога src:
+
+    python benchmark.py --output bench.json
+    python benchmark.py --only make_rogue_move draw_map --repeat 200
+
+Результаты - JSON со сводкой замеров каждого бенчмарка (min, медиана, среднее, p95, max в миллисекундах),
+чтобы их можно было сравнивать между коммитами.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+from random import Random
+from time import perf_counter
+
+# Логи и статистика бенчмарков пишутся во временные директории, чтобы не трогать log/ и datasets/ в рабочем дереве;
+# переменные задаются до импорта модулей игры, потому что логгеры настраиваются при импорте
+os.environ.setdefault("ROGUE_LOG_DIR", tempfile.mkdtemp(prefix="rogue-bench-log-"))
+os.environ.setdefault("ROGUE_STATS_DIR", tempfile.mkdtemp(prefix="rogue-bench-stats-"))
+
+from controller.controller import Controller
+from controller.sound.sound_controller import SoundController
+from datalayer.stats import RogueStats
+from domain.map.level_map import LevelMap
+from domain.map.settings import HEIGHT, WIDTH
+from domain.objects.character import Character
+from domain.objects.enemies.enemy import Enemy
+from view.headless_renderer import HeadlessRenderer
+
+
+NICKNAME = "bench"
+ENEMY_COUNTS = (0, 25, 50, 100, 200)
+POPULATE_ATTEMPTS = 200
+STATS_RECORDS = 10_000
+ROOM_GRIDS = ((3, 3, HEIGHT, WIDTH), (5, 5, 100, 200), (8, 8, 200, 400))  # строки и столбцы сетки комнат, высота и ширина карты
+GRID_LEVEL = 11
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rogue Game benchmarks")
+    parser.add_argument("--output", type=Path, default=None, help="файл для результатов в JSON; по умолчанию stdout")
+    parser.add_argument("--repeat", type=int, default=50, help="количество замеров в каждом бенчмарке")
+    parser.add_argument("--seed", type=int, default=0, help="seed генерации уровней")
+    parser.add_argument("--only", nargs="*", default=None, help="имена бенчмарков, которые нужно запустить")
+    return parser.parse_args()
+
+
+def summarize(samples: list[float]) -> dict:
+    """
+    Сводка замеров в миллисекундах.
+    """
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        "runs": len(ms),
+        "min_ms": round(ms[0], 4),
+        "median_ms": round(statistics.median(ms), 4),
+        "mean_ms": round(statistics.fmean(ms), 4),
+        "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 4),
+        "max_ms": round(ms[-1], 4),
+    }
+
+
+def timed(func: Callable[[], object]) -> float:
+    start = perf_counter()
+    func()
+    return perf_counter() - start
+
+
+def new_character() -> Character:
+    Character.reset_instance()
+    return Character(NICKNAME)
+
+
+def new_level_map(level: int, rng: Random) -> LevelMap:
+    new_character()
+    return LevelMap(HEIGHT, WIDTH, level, 1, rng)
+
+
+def count_enemies(level_map: LevelMap) -> int:
+    return sum(isinstance(obj, Enemy) for room in level_map.rooms for obj in room.objects.values())
+
+
+def populate(level_map: LevelMap, level: int, enemies: int) -> int:
+    """
+    Разбудить все комнаты уровня и добавить в них противников, пока их не станет не меньше enemies
+    или пока в комнатах не кончится место.
+    :return: фактическое количество противников
+    """
+    for room in level_map.rooms:
+        room.visit()
+    for _ in range(POPULATE_ATTEMPTS):
+        if count_enemies(level_map) >= enemies:
+            break
+        for room in level_map.rooms:
+            room.generate_enemies(level, 2)
+    return count_enemies(level_map)
+
+
+def bench_level_map_init(repeat: int, seed: int) -> dict:
+    results = {}
+    for level in (1, 11, 21):
+        rng = Random(f"{seed}:{level}")
+        samples = []
+        for _ in range(repeat):
+            new_character()
+            samples.append(timed(lambda: LevelMap(HEIGHT, WIDTH, level, 1, Random(rng.random()))))
+        results[f"level_{level}"] = summarize(samples)
+    return results
+
+
+def bench_move_character(repeat: int, seed: int) -> dict:
+    rng = Random(seed)
+    level_map = new_level_map(1, Random(seed))
+    samples = []
+    for _ in range(repeat * 10):
+        direction = rng.choice("wasd")
+        samples.append(timed(lambda: level_map.move_character(direction)))
+    return summarize(samples)
+
+
+def bench_make_rogue_move(repeat: int, seed: int) -> dict:
+    """
+    Ход противников при растущем количестве противников на уровне.
+    Все комнаты считаются посещенными, чтобы противники не спали из-за непосещенных комнат.
+    Если персонаж погибает, уровень генерируется заново; enemies - среднее количество противников на уровнях.
+    """
+    results = {}
+    for enemies in ENEMY_COUNTS:
+        rng = Random(f"{seed}:{enemies}")
+        level_map = None
+        samples, counts = [], []
+        while len(samples) < repeat:
+            if level_map is None:
+                level_map = new_level_map(1, Random(rng.random()))
+                counts.append(populate(level_map, 1, enemies))
+            level_map.move_character(rng.choice("wasd"))
+            start = perf_counter()
+            _, alive = level_map.make_rogue_move()
+            samples.append(perf_counter() - start)
+            if not alive:
+                level_map = None
+        results[f"enemies_{enemies}"] = {"enemies": round(statistics.fmean(counts)), **summarize(samples)}
+    return results
+
+
+def bench_turn_by_room_grid(repeat: int, seed: int) -> dict:
+    """
+    Ход персонажа и противников на картах с растущим количеством комнат.
+    Все комнаты считаются посещенными, поэтому противников на уровне пропорционально больше;
+    время хода не должно расти вместе с количеством комнат, потому что ходят только противники рядом с персонажем.
+    """
+    results = {}
+    for rows, columns, height, width in ROOM_GRIDS:
+        rng = Random(f"{seed}:{rows}x{columns}")
+        level_map = None
+        samples, counts = [], []
+        while len(samples) < repeat * 10:
+            if level_map is None:
+                new_character()
+                level_map = LevelMap(height, width, GRID_LEVEL, 1, Random(rng.random()), rows, columns)
+                for room in level_map.rooms:
+                    room.visit()
+                counts.append(count_enemies(level_map))
+            direction = rng.choice("wasd")
+            start = perf_counter()
+            level_map.move_character(direction)
+            _, alive = level_map.make_rogue_move()
+            samples.append(perf_counter() - start)
+            if not alive:
+                level_map = None
+        results[f"rooms_{rows * columns}"] = {
+            "map": f"{height}x{width}",
+            "enemies": round(statistics.fmean(counts)),
+            **summarize(samples),
+        }
+    return results
+
+
+def bench_draw_map(repeat: int, seed: int) -> dict:
+    """
+    Полная перерисовка окна игры на картах с растущим количеством комнат.
+    Рисуется только видимое окно карты, поэтому время не должно зависеть от размера карты.
+    """
+    results = {}
+    renderer = HeadlessRenderer(HEIGHT, WIDTH)
+    controller = Controller(renderer, sound=False)
+    controller.renderer = renderer
+    try:
+        for rows, columns, height, width in ROOM_GRIDS:
+            new_character()
+            controller.level_map = LevelMap(height, width, 1, 1, Random(seed), rows, columns)
+            results[f"rooms_{rows * columns}"] = {
+                "map": f"{height}x{width}",
+                **summarize([timed(controller.redraw) for _ in range(repeat)]),
+            }
+    finally:
+        controller.close()
+    return results
+
+
+def bench_dump_json_stats(repeat: int, seed: int) -> dict:
+    """
+    Сохранение статистики в файл, в котором уже STATS_RECORDS записей.
+    Файл статистики игры не изменяется: бенчмарки работают с временной директорией ROGUE_STATS_DIR.
+    """
+    stats = RogueStats()
+    stats.nickname = NICKNAME
+    records = [stats.form_stats_dict() for _ in range(STATS_RECORDS)]
+    stats_file = Path(os.environ["ROGUE_STATS_DIR"]) / "stats.json"
+    stats_file.write_text(json.dumps(records, ensure_ascii=False), encoding="utf-8")
+    samples = [timed(stats.dump_json_stats) for _ in range(repeat)]
+    return {"records": STATS_RECORDS, **summarize(samples)}
+
+
+BENCHMARKS: dict[str, Callable[[int, int], dict]] = {
+    "level_map_init": bench_level_map_init,
+    "move_character": bench_move_character,
+    "make_rogue_move": bench_make_rogue_move,
+    "turn_by_room_grid": bench_turn_by_room_grid,
+    "draw_map": bench_draw_map,
+    "dump_json_stats": bench_dump_json_stats,
+}
+
+
+def main():
+    args = parse_args()
+    SoundController(enabled=False)
+    RogueStats()
+
+    results = {
+        "python": platform.python_version(),
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "benchmarks": {},
+    }
+    for name, bench in BENCHMARKS.items():
+        if args.only and name not in args.only:
+            continue
+        results["benchmarks"][name] = bench(args.repeat, args.seed)
+
+    output = json.dumps(results, ensure_ascii=False, indent=4)
+    if args.output:
+        args.output.write_text(output, encoding="utf-8")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,20 @@
 import curses  # Импортируем библиотеку curses для работы с терминалом
+import hashlib  # Импортируем модуль hashlib для хеша кадра в проверке записи
+import signal  # Импортируем модуль signal для сохранения трассы по запросу
 from contextlib import suppress  # Импортируем функцию suppress из модуля contextlib для подавления исключений
 from enum import Enum  # Импортируем класс Enum для создания перечислений
-from time import sleep  # Импортируем функцию sleep из модуля time для задержек
+from pathlib import Path  # Импортируем класс Path из модуля pathlib для работы с путями
+from time import perf_counter_ns  # Импортируем функцию perf_counter_ns из модуля time для замеров
 
 from controller.game_info import GameInfo  # Импортируем класс GameInfo из модуля controller.game_info
+from controller.hit_flash import HitFlashes  # Импортируем класс HitFlashes из модуля controller.hit_flash
+from controller.level_prefetch import LevelPrefetch  # Импортируем класс LevelPrefetch из модуля controller.level_prefetch
+from controller.viewport import Viewport  # Импортируем класс Viewport из модуля controller.viewport
 from controller.sound.sound_controller import SoundController  # Импортируем класс SoundController из модуля controller.sound.sound_controller
+from datalayer.replay import Replay  # Импортируем класс Replay из модуля datalayer.replay
 from datalayer.stats import RogueStats  # Импортируем класс RogueStats из модуля datalayer.stats
 from domain.map.level_map import LevelMap  # Импортируем класс LevelMap из модуля domain.map.level_map
-from domain.map.settings import HEIGHT, MAX_LEVEL, WIDTH  # Импортируем константы HEIGHT, MAX_LEVEL, WIDTH из модуля domain.map.settings
+from domain.map.settings import HEIGHT, MAP_HEIGHT, MAP_WIDTH, MAX_LEVEL, WIDTH  # Импортируем константы размеров и MAX_LEVEL из модуля domain.map.settings
 from domain.objects.backpack.backpack import Backpack  # Импортируем класс Backpack из модуля domain.objects.backpack.backpack
 from domain.objects.character import Character  # Импортируем класс Character из модуля domain.objects.character
 from domain.objects.items.food import Food  # Импортируем класс Food из модуля domain.objects.items.food
@@ -15,8 +22,12 @@ from domain.objects.items.potion import Potion  # Импортируем кла
 from domain.objects.items.scroll import Scroll  # Импортируем класс Scroll из модуля domain.objects.items.scroll
 from domain.objects.items.weapon import Weapon  # Импортируем класс Weapon из модуля domain.objects.items.weapon
 from domain.objects.utils import RogueEvent  # Импортируем класс RogueEvent из модуля domain.objects.utils
+from domain.rng import new_seed  # Импортируем функцию new_seed из модуля domain.rng
+from utils.latency import TurnLatency  # Импортируем класс TurnLatency из модуля utils.latency
 from utils.logger import controller_log, domain_log  # Импортируем логгеры controller_log и domain_log из модуля utils.logger
+from utils.trace import domain_trace  # Импортируем трассу действий из модуля utils.trace
 from view.map_renderer import MapRenderer  # Импортируем класс MapRenderer из модуля view.map_renderer
+from view.renderer import Renderer  # Импортируем интерфейс Renderer из модуля view.renderer
 
 class GameState(Enum):  # Определяем перечисление GameState для состояний игры
     INPUT = 1  # Состояние ожидания ввода
@@ -71,27 +82,70 @@ class Controller:  # Определяем класс Controller для упра
         "h": Weapon,
     }
 
-    def __init__(self):  # Конструктор класса Controller
+    def __init__(
+        self,
+        renderer: Renderer | None = None,
+        seed: int | None = None,
+        record: Path | None = None,
+        persist: bool = True,
+        trace: Path | None = None,
+        sound: bool = True,
+        latency: bool = False,
+    ):  # Конструктор класса Controller
+        """
+        :param renderer: рендерер без терминала (например, HeadlessRenderer); по умолчанию игра рисуется через curses
+        :param seed: seed новых игр; если не задан, для каждой новой игры выбирается случайный
+        :param record: путь к файлу, в который записываются seed и клавиши новой игры для воспроизведения
+        :param persist: загружать и сохранять игру и статистику; при воспроизведении записи отключается
+        :param trace: путь к файлу трассы действий; по умолчанию trace.bin в директории логов
+        :param sound: False - играть без звука и не загружать pygame
+        :param latency: True - замерять задержки фаз хода и сохранить их сводку в latency.json в директории логов при выходе
+        """
         self.rogue_stats = RogueStats()  # Инициализируем статистику игры
         self.stdscr = None  # Инициализируем экран
-        self.renderer: MapRenderer | None = None  # Инициализируем рендерер карты
+        self.renderer: Renderer | None = None  # Инициализируем рендерер карты
+        self.__headless_renderer = renderer  # Запоминаем переданный рендерер
         self.game_info: GameInfo | None = None  # Инициализируем информацию об игре
-        self.height = HEIGHT  # Устанавливаем высоту карты
-        self.width = WIDTH  # Устанавливаем ширину карты
+        self.height = HEIGHT  # Устанавливаем высоту окна игры
+        self.width = WIDTH  # Устанавливаем ширину окна игры
+        self.map_height = MAP_HEIGHT  # Устанавливаем высоту карты
+        self.map_width = MAP_WIDTH  # Устанавливаем ширину карты
         self.sound_muted = False  # Устанавливаем флаг отключения звука
         self.state = GameState.INPUT  # Устанавливаем начальное состояние игры
         self.fsm = self.__generate_fsm()  # Генерируем конечный автомат состояний
         self.inventory_section = None  # Инициализируем секцию инвентаря
         self.level = 1  # Устанавливаем начальный уровень
-
+        self.__seed_option = seed  # Запоминаем seed, заданный при запуске
+        self.seed = seed  # Seed текущей игры
+        self.__record_path = record  # Путь к файлу записи игры
+        self.__persist = persist  # Флаг работы с сохранениями и статистикой
+        self.__replay: Replay | None = None  # Запись текущей игры
+        self.__trace_path = trace  # Путь к файлу трассы действий
+
+        self.__viewport = Viewport(self.height - 4, self.width)  # Видимое в окне игры окно карты
         self.level_map = None  # Инициализируем карту уровня
         self.map = []  # Инициализируем карту
         self.__prev_hp = 0  # Инициализируем предыдущее значение здоровья персонажа
+        self.__full_redraw = True  # Флаг полной перерисовки карты
+        self.__flashes = HitFlashes()  # Вспышки клеток, по которым пришлись атаки
+        self.latency = TurnLatency(latency)  # Задержки фаз обработки хода
+        self.__prefetch = LevelPrefetch(self.map_height, self.map_width)  # Фоновая генерация следующего уровня
 
-        SoundController()  # Инициализируем контроллер звука
+        SoundController(enabled=sound)  # Инициализируем контроллер звука
 
         controller_log.info("{cls} initialized", cls=self.__class__.__name__)  # Логируем инициализацию контроллера
 
+    @property
+    def level_map(self) -> LevelMap | None:  # Свойство для получения карты текущего уровня
+        return self.__level_map  # Возвращаем карту уровня
+
+    @level_map.setter
+    def level_map(self, level_map: LevelMap | None):  # Свойство для смены карты текущего уровня
+        self.__level_map = level_map  # Запоминаем карту уровня
+        if level_map is not None:  # Если карта задана
+            self.__viewport.reset(level_map.height, level_map.width, level_map.extent)  # Буфер клеток прошлой карты больше не нужен
+            self.__full_redraw = True  # Новую карту рисуем целиком
+
     def __generate_fsm(self):  # Метод для генерации конечного автомата состояний
         return {
             (GameState.INPUT, UserAction.MOVE): self.__move,  # Перемещение персонажа
@@ -121,23 +175,39 @@ class Controller:  # Определяем класс Controller для упра
         """
         Запустить контроллер Rogue Game.
         """
-        curses.wrapper(self.__start)  # Запускаем игру в оболочке curses
-
-    def __start(self, stdscr):  # Метод для начала игры
-        self.__curser_init(stdscr)  # Инициализируем экран
+        if hasattr(signal, "SIGUSR1"):  # Если система поддерживает пользовательские сигналы
+            signal.signal(signal.SIGUSR1, lambda *_: self.dump_trace())  # Сохраняем трассу по сигналу SIGUSR1
+        try:
+            if self.__headless_renderer:  # Если передан рендерер без терминала
+                self.__start()  # Запускаем игру без curses
+            else:  # Иначе
+                curses.wrapper(self.__start)  # Запускаем игру в оболочке curses
+        except Exception:  # Если игра упала
+            self.dump_trace()  # Сохраняем трассу последних действий
+            raise
+        finally:
+            self.close()  # Останавливаем фоновую генерацию уровней
+            if self.latency.enabled:  # Если задержки фаз хода замерялись
+                path = self.latency.dump()  # Сохраняем перцентили задержек в отдельный файл
+                controller_log.info("Turn latency report saved to {path}", path=path)  # Логируем сохранение сводки
+
+    def __start(self, stdscr=None):  # Метод для начала игры
+        if stdscr:  # Если игра запущена в терминале
+            self.__curser_init(stdscr)  # Инициализируем экран
 
         while self.state != GameState.END:  # Основной цикл игры
             SoundController.get_instance().intro.play(-1)  # Включаем музыку вступления
-            self.renderer = MapRenderer(self.height, self.width)  # Инициализируем рендерер карты
+            self.renderer = self.__headless_renderer or MapRenderer(self.height, self.width)  # Инициализируем рендерер карты
             self.renderer.show_intro(pause=True)  # Показываем вступление
             self.__try_load()  # Пытаемся загрузить сохраненную игру
             if self.state == GameState.END:  # Если игра завершена, выходим из цикла
                 break
             self.renderer.clear_intro()  # Очищаем вступление
             self.game_info = GameInfo(self.level)  # Инициализируем информацию об игре
-            self.level_map = LevelMap(self.height, self.width, self.level, 1)  # Инициализируем карту уровня
+            self.level_map = self.__create_level_map(1)  # Инициализируем карту уровня
             SoundController.get_instance().intro.stop()  # Останавливаем музыку вступления
             self.__game_loop()  # Запускаем игровой цикл
+            self.dump_trace()  # Сохраняем трассу завершенной игры
 
             self.rogue_stats.rogue_level = self.level  # Обновляем уровень персонажа
 
@@ -148,11 +218,37 @@ class Controller:  # Определяем класс Controller для упра
                 SoundController.get_instance().game_over.stop()  # Останавливаем музыку игры
                 self.renderer.show_intro(pause=True)  # Показываем вступление
 
+    def close(self):  # Метод для освобождения ресурсов контроллера
+        """
+        Остановить рабочий поток фоновой генерации уровней.
+        start_rogue вызывает его сам; вызывать нужно, если контроллер используется без start_rogue.
+        """
+        self.__prefetch.shutdown()  # Останавливаем фоновую генерацию уровней
+
+    def final_state(self) -> dict:  # Метод для получения итога игры
+        """
+        Итог игры для проверки воспроизведения записи: уровень, координаты персонажа и хеш символов видимого окна карты.
+        """
+        self.__viewport.invalidate(self.level_map.pop_dirty_cells())  # Клетки, изменившиеся после последней отрисовки, запрашиваем заново
+        frame = "\n".join(
+            "".join(symbol for symbol, _ in self.__viewport.cells(y, x, length, self.level_map.get_cell))
+            for y, x, length in self.__viewport.rows()
+        )  # Символы видимого окна карты
+        return {
+            "level": self.level,  # Уровень
+            "crd": list(Character.get_instance().get_crd()),  # Координаты персонажа
+            "frame": hashlib.md5(frame.encode("utf-8")).hexdigest(),  # Хеш окна карты
+        }
+
+    def dump_trace(self):  # Метод для сохранения трассы действий
+        path = domain_trace.dump(self.__trace_path)  # Сохраняем трассу в файл
+        controller_log.info("Trace of {records} records saved to {path}", records=len(domain_trace), path=path)  # Логируем сохранение трассы
+
     def __try_load(self):  # Метод для загрузки сохраненной игры
         """
         Найти сохраненную игру, создать персонажа.
         """
-        if save := self.rogue_stats.load_json_save():  # Если есть сохраненная игра, загружаем её
+        if self.__persist and (save := self.rogue_stats.load_json_save()):  # Если есть сохраненная игра, загружаем её
             user_input = UserAction.DROP
             with suppress(ValueError):  # Подавляем исключения при некорректном вводе
                 user_input = UserAction.from_key(self.__normalize_input(self.renderer.render_load_question()))
@@ -172,7 +268,14 @@ class Controller:  # Определяем класс Controller для упра
         Character(save["nickname"])._load(**save["character_state"])  # Загружаем состояние персонажа
         self.level = save["stats"]["rogue_level"]  # Устанавливаем уровень персонажа
         self.rogue_stats._load(**save["stats"])  # Загружаем статистику
+        self.seed = save.get("seed")  # Загружаем seed игры
+        if self.seed is None:  # Если сохранение сделано до появления seed
+            self.seed = new_seed()  # Выбираем новый seed
+        self.rogue_stats.seed = self.seed  # Сохраняем seed в статистике
         self.__prev_hp = Character.get_instance().hp  # Обновляем предыдущее значение здоровья персонажа
+        self.__replay = None  # Загруженную игру нельзя воспроизвести с начала по seed
+        if self.__record_path:  # Если запись игры включена
+            controller_log.warning("Loaded game is not recorded")  # Логируем пропуск записи
 
     def __start_new_game(self):  # Метод для начала новой игры
         user_input = UserAction.DROP
@@ -182,7 +285,7 @@ class Controller:  # Определяем класс Controller для упра
                 return
 
         ch_name = self.renderer.get_player_name()  # Получаем имя персонажа
-        while not self.rogue_stats.check_nickname(ch_name):  # Проверяем корректность имени
+        while self.__persist and not self.rogue_stats.check_nickname(ch_name):  # Проверяем, что имя не занято; без статистики имя не с чем сравнивать
             with suppress(ValueError):
                 user_input = UserAction.from_key(self.renderer.confirm_name())
 
@@ -196,17 +299,26 @@ class Controller:  # Определяем класс Controller для упра
             Character.reset_instance()
             self.level = 1  # Устанавливаем начальный уровень
         Character(ch_name)  # Создаем нового персонажа
+        self.seed = self.__seed_option if self.__seed_option is not None else new_seed()  # Выбираем seed новой игры
+        self.rogue_stats.seed = self.seed  # Сохраняем seed в статистике
+        controller_log.info("New game seed: {seed}", seed=self.seed)  # Логируем seed новой игры
+        if self.__record_path:  # Если запись игры включена
+            self.__replay = Replay(self.seed, ch_name)  # Начинаем новую запись
         self.__prev_hp = Character.get_instance().hp  # Обновляем предыдущее значение здоровья персонажа
 
     def __game_loop(self):  # Метод для игрового цикла
         self.renderer.render_game_info(self.game_info)  # Рендерим информацию об игре
+        self.__full_redraw = True  # Первый кадр рисуем целиком
+        self.__flashes.clear()  # Вспышки прошлой игры не нужны
         self.__draw_map()  # Рисуем карту
         self.renderer.draw_event_box()  # Рисуем окно событий
         self.renderer.render_controls()  # Рендерим управление
+        self.__flush()  # Выводим первый кадр на экран
         SoundController.get_instance().play_background()  # Включаем фоновую музыку
 
         controller_log.debug("loop started")  # Логируем начало цикла
         while self.state not in {GameState.DEATH, GameState.WIN, GameState.END}:  # Основной цикл игры
+            self.__full_redraw = self.__full_redraw or self.state != GameState.INPUT  # Диалоговые окна перекрывают карту
             if self.state in {GameState.INVENTORY, GameState.DROP_SLOT}:  # Если состояние инвентаря или выброса предмета
                 self.__input_to_action(
                     self.renderer.draw_inventory(
@@ -221,41 +333,59 @@ class Controller:  # Определяем класс Controller для упра
                 self.__input_to_action(self.renderer.draw_exit_window())
                 SoundController.get_instance().mute(not self.sound_muted)  # Включаем звук
             else:  # В других состояниях
-                self.__input_to_action(self.renderer.get_input(self.state.value))
+                timeout = self.__flashes.timeout() if self.state == GameState.INPUT else None  # Ждем клавишу не дольше, чем до окончания вспышки
+                key = self.renderer.get_input(self.state.value, timeout)  # Получаем клавишу
+                if key is None:  # Если вспышка закончилась раньше, чем нажата клавиша
+                    self.__draw_map()  # Перерисовываем погасшие клетки
+                    self.__flush()  # Выводим кадр на экран
+                    continue  # Снова ждем клавишу
+                self.__input_to_action(key)
 
             if self.state == GameState.ROGUE_MOVE:  # Если состояние перемещения персонажа
                 self.state = GameState.INPUT  # Устанавливаем состояние ожидания ввода
                 self.__update_rogue_state()  # Обновляем состояние персонажа
 
         SoundController.get_instance().stop_background()  # Останавливаем фоновую музыку
+        if self.__replay is not None:  # Если игра записывалась
+            self.__replay.final = self.final_state()  # Запоминаем итог игры для проверки воспроизведения
+            self.__replay.dump(self.__record_path)  # Сохраняем запись игры
+            controller_log.info("Replay of {keys} keys saved to {path}", keys=len(self.__replay), path=self.__record_path)  # Логируем сохранение записи
         if self.state == GameState.DEATH:  # Если персонаж погиб
-            self.rogue_stats.dump_json_stats()  # Сохраняем статистику
+            if self.__persist:  # Если статистика сохраняется
+                self.rogue_stats.dump_json_stats()  # Сохраняем статистику
+                self.rogue_stats.remove_save()  # Удаляем сохранение
             SoundController.get_instance().game_over.play(-1)  # Включаем музыку игры
-            self.rogue_stats.remove_save()  # Удаляем сохранение
             self.renderer.show_intro(start=False, death=True)  # Показываем вступление с информацией о смерти
         if self.state == GameState.WIN:  # Если персонаж победил
-            self.rogue_stats.dump_json_stats()  # Сохраняем статистику
+            if self.__persist:  # Если статистика сохраняется
+                self.rogue_stats.dump_json_stats()  # Сохраняем статистику
+                self.rogue_stats.remove_save()  # Удаляем сохранение
             SoundController.get_instance().win.play()  # Включаем музыку победы
-            self.rogue_stats.remove_save()  # Удаляем сохранение
             self.renderer.show_intro(start=False, death=False)  # Показываем вступление с информацией о победе
 
     def __input_to_action(self, key: int):  # Метод для обработки ввода пользователя
-        controller_log.info(f"Processing user input: {key}")  # Логируем ввод пользователя
+        controller_log.debug("Processing user input: {key}", key=key)  # Логируем ввод пользователя
 
+        start = perf_counter_ns()  # Начало нормализации ввода
         key_str = self.__normalize_input(key)  # Нормализуем ввод
+        self.latency.record(TurnLatency.NORMALIZE, perf_counter_ns() - start)  # Запоминаем задержку нормализации
 
-        controller_log.info(f"Normalized user input to: {key_str}")  # Логируем нормализованный ввод
+        controller_log.debug("Normalized user input to: {key}", key=key_str)  # Логируем нормализованный ввод
+        if self.__replay is not None:  # Если игра записывается
+            self.__replay.append(key_str)  # Записываем нормализованную клавишу
 
         user_input = None
         try:
             user_input = UserAction.from_key(key_str)  # Преобразуем ввод в действие
-            controller_log.info(f"{self.state} {user_input}")
+            controller_log.debug("{state} {action}", state=self.state, action=user_input)
         except ValueError:
-            controller_log.info(f"key: '{key_str}' is not in input options. Ignore")  # Логируем ошибку ввода
+            controller_log.debug("key: '{key}' is not in input options. Ignore", key=key_str)  # Логируем ошибку ввода
 
         if user_input and (action := self.fsm.get((self.state, user_input))):  # Если действие найдено
-            controller_log.info(f"action: {action.__name__}")  # Логируем действие
+            controller_log.debug("action: {action}", action=action.__name__)  # Логируем действие
+            start = perf_counter_ns()  # Начало действия
             events = action(key_str)  # Выполняем действие
+            self.latency.record(TurnLatency.ACTION, perf_counter_ns() - start)  # Запоминаем задержку действия
             for event in events:  # Обрабатываем события
                 self.renderer.render_event(event)
 
@@ -263,9 +393,13 @@ class Controller:  # Определяем класс Controller для упра
             self.renderer.render_game_info(self.game_info)  # Рендерим информацию об игре
             self.__draw_map()  # Рисуем карту
 
+        self.__flush()  # Выводим кадр на экран одним обновлением
+
     def __update_rogue_state(self):  # Метод для обновления состояния персонажа
-        controller_log.info("Getting Rogue update")  # Логируем обновление состояния
+        controller_log.debug("Getting Rogue update")  # Логируем обновление состояния
+        start = perf_counter_ns()  # Начало хода противников
         events, alive = self.level_map.make_rogue_move()  # Получаем события и состояние персонажа
+        self.latency.record(TurnLatency.ROGUE_MOVE, perf_counter_ns() - start)  # Запоминаем задержку хода противников
 
         for event in events:  # Обрабатываем события
             self.renderer.render_event(event)
@@ -278,6 +412,12 @@ class Controller:  # Определяем класс Controller для упра
         self.game_info.refresh(self.level)  # Обновляем информацию об игре
         self.__draw_map()  # Рисуем карту
         self.renderer.render_game_info(self.game_info)  # Рендерим информацию об игре
+        self.__flush()  # Выводим кадр на экран одним обновлением
+
+    def __flush(self):  # Метод для вывода кадра на экран
+        start = perf_counter_ns()  # Начало вывода кадра
+        self.renderer.flush()  # Выводим кадр на экран одним обновлением
+        self.latency.record(TurnLatency.FLUSH, perf_counter_ns() - start)  # Запоминаем задержку вывода кадра
 
     def __normalize_input(self, key: str | int) -> str:  # Метод для нормализации ввода
         key_str = chr(key).lower() if isinstance(key, int) else key.lower()  # Преобразуем ввод в строку и приводим к нижнему регистру
@@ -305,7 +445,7 @@ class Controller:  # Определяем класс Controller для упра
         max_coef = 2
         coef = Character.get_instance().hp / (self.__prev_hp / 2)  # Рассчитываем коэффициент сложности
         self.__prev_hp = Character.get_instance().hp  # Обновляем предыдущее значение здоровья персонажа
-        controller_log.info(f"Complexity coef: {coef}")  # Логируем коэффициент сложности
+        controller_log.info("Complexity coef: {coef}", coef=coef)  # Логируем коэффициент сложности
         return coef if coef <= max_coef else max_coef  # Возвращаем коэффициент сложности
 
     def __enter(self, _=None) -> list[RogueEvent]:  # Метод для входа в дверь или перехода на следующий уровень
@@ -315,21 +455,28 @@ class Controller:  # Определяем класс Controller для упра
         if self.level_map.is_exit() and self.level == MAX_LEVEL:  # Если персонаж на последнем уровне и находится у выхода
             self.state = GameState.WIN  # Устанавливаем состояние победы
             events = [RogueEvent("Поздравляем, вы прошли игру!")]  # Добавляем событие победы
-            sleep(1)  # Задержка
         elif self.level_map.is_exit():  # Если персонаж находится у выхода
             controller_log.info("On exit")  # Логируем вход в выход
             self.level += 1  # Увеличиваем уровень
             self.rogue_stats.rogue_level += 1  # Обновляем уровень персонажа
-            self.level_map = LevelMap(self.height, self.width, self.level, self.__calc_complexity_coef())  # Инициализируем карту уровня
-            self.rogue_stats.dump_json_save()  # Сохраняем статистику
+            self.level_map = self.__create_level_map(self.__calc_complexity_coef())  # Инициализируем карту уровня
+            self.__flashes.clear()  # Вспышки относятся к клеткам прошлого уровня
+            if self.__persist:  # Если игра сохраняется
+                self.rogue_stats.dump_json_save()  # Сохраняем статистику
             events = [RogueEvent(f"Вы перешли на уровень {self.level}")]  # Добавляем событие перехода на следующий уровень
 
         return events
 
+    def __create_level_map(self, complexity_coef: float) -> LevelMap:  # Метод для создания карты текущего уровня
+        level_map = self.__prefetch.take(self.seed, self.level, complexity_coef)  # Забираем заранее построенную карту уровня
+        if self.level < MAX_LEVEL:  # Если впереди есть следующий уровень
+            self.__prefetch.schedule(self.seed, self.level + 1)  # Строим его, пока игрок проходит текущий
+        return level_map  # Возвращаем карту уровня
+
     def __inventory(self, key: str) -> list[RogueEvent]:  # Метод для открытия инвентаря
         self.inventory_section = self.__inventory_mapping[key]  # Устанавливаем секцию инвентаря
         self.state = GameState(self.state.value + 1)  # Устанавливаем состояние инвентаря
-        controller_log.info(f"opening {self.inventory_section, __name__} section")  # Логируем открытие секции инвентаря
+        controller_log.info("opening {section} section", section=self.inventory_section.__name__)  # Логируем открытие секции инвентаря
         self.inventory_content = Backpack.get_instance().show_items(self.inventory_section)  # Получаем содержимое инвентаря
 
         events = []
@@ -345,10 +492,10 @@ class Controller:  # Определяем класс Controller для упра
 
     def slot(self, key: str) -> list[RogueEvent]:  # Метод для выбора слота в инвентаре
         slot = int(key)  # Преобразуем ввод в номер слота
-        controller_log.info(f"using slot {slot} in {self.inventory_section, __name__} section")  # Логируем выбор слота
+        controller_log.info("using slot {slot} in {section} section", slot=slot, section=self.inventory_section.__name__)  # Логируем выбор слота
         events, item = Backpack.get_instance().use_item(self.inventory_section, slot)  # Используем предмет из слота
         if item:  # Если предмет найден
-            domain_log.debug(f"item: {item.__str__()}")  # Логируем предмет
+            domain_log.debug("item: {item}", item=item)  # Логируем предмет
             if isinstance(item, Weapon):  # Если предмет - оружие
                 w_events, weapon_to_drop = Character.get_instance().equip_weapon(item)  # Экипируем оружие
                 events.extend(w_events)  # Добавляем события экипировки
@@ -382,9 +529,43 @@ class Controller:  # Определяем класс Controller для упра
 
         return events
 
+    def redraw(self):  # Метод для полной перерисовки карты
+        self.__viewport.invalidate_view()  # Заново запрашиваем у карты все клетки окна
+        self.__full_redraw = True  # Требуем полную перерисовку
+        self.__draw_map()  # Рисуем карту
+
     def __draw_map(self):  # Метод для рисования карты
-        self.renderer.clear_game_window()  # Очищаем окно игры
-        for y in range(1, self.height - 3):  # Проходим по высоте карты
-            for x in range(1, self.width + 1):  # Проходим по ширине карты
-                self.renderer.render_map_crd(y - 1, x - 1, *self.level_map.get_cell(y - 1, x - 1))  # Рисуем ячейку карты
+        """
+        Перерисовать видимое окно карты.
+        Целиком - после диалоговых окон, смены уровня и прокрутки окна, иначе только клетки, изменившиеся за ход.
+        Клетки, которые не менялись, берутся из буфера окна, поэтому у карты запрашиваются только изменившиеся.
+        """
+        start = perf_counter_ns()  # Начало сбора клеток карты
+        dirty = self.level_map.pop_dirty_cells()  # Клетки, изменившиеся с прошлой отрисовки
+        dirty |= self.__flashes.pop_expired()  # Погасшие вспышки рисуем обычным цветом
+        hits = self.level_map.pop_hits()  # Клетки, по которым пришлись атаки
+        if hits and self.renderer.interactive:  # Вспышки нужны только игроку у терминала, без терминала и при воспроизведении их нет
+            self.__flashes.start(hits)  # Подсвечиваем клетки атак
+            dirty |= hits  # Отмечаем подсвеченные клетки для перерисовки
+        self.__viewport.invalidate(dirty)  # Изменившиеся клетки нужно запросить у карты заново
+        if self.__viewport.follow(Character.get_instance().get_crd()):  # Если окно прокрутилось за персонажем
+            self.__full_redraw = True  # Окно рисуем целиком
+        if self.__full_redraw:  # Если нужна полная перерисовка
+            self.__full_redraw = False  # Сбрасываем флаг полной перерисовки
+            self.renderer.clear_game_window()  # Очищаем окно игры
+            spans = self.__viewport.rows()  # Рисуем все строки окна
+        else:  # Если достаточно перерисовать изменения
+            spans = self.__viewport.spans(dirty)  # Рисуем отрезки изменившихся клеток
+        for y, x, length in spans:  # Проходим по отрезкам строк
+            self.__draw_map_span(y, x, length)  # Рисуем отрезок строки карты
+        self.latency.record(TurnLatency.GET_CELL, perf_counter_ns() - start)  # Запоминаем задержку сбора клеток
         self.renderer.refresh_game_window()  # Обновляем окно игры
+
+    def __draw_map_span(self, y: int, x: int, length: int):  # Метод для рисования отрезка строки карты
+        cells = self.__viewport.cells(y, x, length, self.level_map.get_cell)  # Клетки отрезка
+        if self.__flashes:  # Если есть вспышки
+            cells = [
+                (symbol, self.renderer.flash_color) if (y, x_) in self.__flashes else (symbol, color)
+                for x_, (symbol, color) in enumerate(cells, x)
+            ]  # Подсвечиваем клетки со вспышками
+        self.renderer.render_map_row(*self.__viewport.to_screen(y, x), cells)  # Рисуем клетки отрезка в окне
@@ -0,0 +1,43 @@
+from collections.abc import Iterable  # Импортируем Iterable для аннотации клеток
+from time import monotonic  # Импортируем функцию monotonic из модуля time для таймера вспышек
+
+from domain import Coordinate  # Импортируем класс Coordinate из модуля domain
+
+
+class HitFlashes:  # Определяем класс HitFlashes для вспышек попаданий
+    """
+    Вспышки клеток, по которым пришлась атака.
+    Вместо паузы игры клетка подсвечивается на DURATION секунд, а ввод и ход игры продолжаются:
+    контроллер ждет клавишу не дольше, чем до окончания ближайшей вспышки, и затем перерисовывает погасшие клетки.
+    """
+
+    DURATION = 0.2  # Длительность вспышки в секундах
+
+    def __init__(self):  # Конструктор класса HitFlashes
+        self.__until: dict[Coordinate, float] = {}  # Время окончания вспышки по клеткам
+
+    def __bool__(self) -> bool:  # Метод для проверки, есть ли активные вспышки
+        return bool(self.__until)  # Возвращаем True, если вспышки есть
+
+    def __contains__(self, crd: Coordinate) -> bool:  # Метод для проверки, подсвечена ли клетка
+        return crd in self.__until  # Возвращаем True, если клетка подсвечена
+
+    def start(self, cells: Iterable[Coordinate]):  # Метод для запуска вспышек
+        until = monotonic() + self.DURATION  # Время окончания вспышек
+        for crd in cells:  # Проходим по клеткам
+            self.__until[crd] = until  # Подсвечиваем клетку до окончания вспышки
+
+    def timeout(self) -> float | None:  # Метод для получения времени до окончания ближайшей вспышки
+        if not self.__until:  # Если вспышек нет
+            return None  # Ждать ввод можно без ограничения
+        return max(min(self.__until.values()) - monotonic(), 0.0)  # Возвращаем время до окончания ближайшей вспышки
+
+    def pop_expired(self) -> set[Coordinate]:  # Метод для получения погасших клеток
+        now = monotonic()  # Текущее время
+        expired = {crd for crd, until in self.__until.items() if until <= now}  # Клетки, вспышка которых закончилась
+        for crd in expired:  # Проходим по погасшим клеткам
+            del self.__until[crd]  # Убираем вспышку
+        return expired  # Возвращаем погасшие клетки
+
+    def clear(self):  # Метод для отмены всех вспышек
+        self.__until.clear()  # Убираем все вспышки
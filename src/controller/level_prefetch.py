@@ -0,0 +1,66 @@
+from concurrent.futures import Future, ThreadPoolExecutor  # Импортируем пул потоков для фоновой генерации уровня
+
+from domain.map.level_map import LevelMap  # Импортируем класс LevelMap из модуля domain.map.level_map
+from domain.rng import level_random  # Импортируем функцию level_random из модуля domain.rng
+from utils.logger import controller_log  # Импортируем логгер controller_log из модуля utils.logger
+
+
+class LevelPrefetch:  # Определяем класс LevelPrefetch для фоновой генерации уровней
+    """
+    Фоновая генерация следующего уровня.
+    Пока игрок проходит уровень N, рабочий поток строит карту уровня N + 1 с генератором level_random(seed, N + 1).
+    Карта строится без персонажа, противников и предметов: их контроллер добавляет через LevelMap.populate при переходе,
+    когда известен коэффициент сложности, поэтому заранее построенная карта совпадает с построенной на месте.
+    """
+
+    def __init__(self, height: int, width: int):  # Конструктор класса LevelPrefetch
+        self.height = height  # Высота карты
+        self.width = width  # Ширина карты
+        self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-prefetch")  # Рабочий поток генерации
+        self.__key: tuple[int, int] | None = None  # Seed и номер уровня заранее построенной карты
+        self.__future: Future | None = None  # Заранее построенная карта
+
+    def __generate(self, seed: int, level: int) -> LevelMap:  # Метод для генерации карты без заселения
+        return LevelMap(self.height, self.width, level, None, level_random(seed, level))  # Карта с генератором, зависящим только от seed и номера уровня
+
+    def schedule(self, seed: int, level: int):  # Метод для запуска фоновой генерации
+        """
+        Начать строить карту уровня в рабочем потоке.
+        :param seed: seed текущей игры
+        :param level: номер уровня
+        """
+        if self.__key == (seed, level):  # Если эта карта уже строится
+            return
+        self.cancel()  # Прошлая заранее построенная карта больше не понадобится
+        self.__key = (seed, level)  # Запоминаем, какая карта строится
+        self.__future = self.__executor.submit(self.__generate, seed, level)  # Запускаем генерацию
+        controller_log.debug("Prefetching level {level}", level=level)  # Логируем запуск генерации
+
+    def take(self, seed: int, level: int, complexity_coef: float) -> LevelMap:  # Метод для получения карты уровня
+        """
+        Получить заселенную карту уровня.
+        Если карта была построена заранее, она забирается из рабочего потока, иначе строится на месте.
+        :param seed: seed текущей игры
+        :param level: номер уровня
+        :param complexity_coef: сложность [0, 2], где 1 = не изменять стандартный шанс на генерацию
+        """
+        level_map = None  # Карта уровня
+        if self.__key == (seed, level) and self.__future is not None:  # Если нужная карта строилась заранее
+            try:
+                level_map = self.__future.result()  # Дожидаемся окончания генерации
+            except Exception as e:  # Если генерация в рабочем потоке упала
+                controller_log.warning("Level {level} prefetch failed: {error}", level=level, error=e)  # Логируем ошибку
+        self.__key, self.__future = None, None  # Карта забрана
+        if level_map is None:  # Если заранее построенной карты нет
+            level_map = self.__generate(seed, level)  # Строим карту на месте
+        level_map.populate(complexity_coef)  # Заселяем карту
+        return level_map  # Возвращаем карту уровня
+
+    def cancel(self):  # Метод для отмены фоновой генерации
+        if self.__future is not None:  # Если карта строится
+            self.__future.cancel()  # Отменяем генерацию, если она еще не началась
+        self.__key, self.__future = None, None  # Забываем карту
+
+    def shutdown(self):  # Метод для остановки рабочего потока
+        self.cancel()  # Отменяем генерацию
+        self.__executor.shutdown(wait=False)  # Останавливаем рабочий поток
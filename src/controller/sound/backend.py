@@ -0,0 +1,70 @@
+from abc import ABC, abstractmethod  # Импортируем ABC и abstractmethod для интерфейса аудио
+from pathlib import Path  # Импортируем класс Path из модуля pathlib для работы с путями
+from typing import Protocol  # Импортируем Protocol для описания звука
+
+
+class Sound(Protocol):  # Определяем протокол Sound для загруженного звука
+    def play(self, loops: int = 0): ...  # Воспроизвести звук
+
+    def stop(self): ...  # Остановить звук
+
+    def set_volume(self, volume: float): ...  # Установить громкость
+
+
+class AudioBackend(ABC):  # Определяем интерфейс AudioBackend для аудио
+    """
+    Интерфейс аудио, через который SoundController загружает звуки и управляет фоновой музыкой.
+    """
+
+    @abstractmethod
+    def load_sound(self, path: Path) -> Sound:  # Метод для загрузки звука
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_music(self, path: Path):  # Метод для загрузки фоновой музыки
+        raise NotImplementedError
+
+    @abstractmethod
+    def play_music(self, loops: int):  # Метод для воспроизведения фоновой музыки
+        raise NotImplementedError
+
+    @abstractmethod
+    def stop_music(self):  # Метод для остановки фоновой музыки
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_music_volume(self, volume: float):  # Метод для установки громкости фоновой музыки
+        raise NotImplementedError
+
+
+class NullSound:  # Определяем класс NullSound для беззвучного звука
+    def play(self, loops: int = 0):  # Метод для воспроизведения звука
+        pass  # Ничего не воспроизводим
+
+    def stop(self):  # Метод для остановки звука
+        pass  # Нечего останавливать
+
+    def set_volume(self, volume: float):  # Метод для установки громкости
+        pass  # Громкость не нужна
+
+
+class NullBackend(AudioBackend):  # Определяем класс NullBackend для работы без звука
+    """
+    Аудио без звука: не импортирует pygame и не открывает аудиоустройство.
+    Используется с --no-sound, без терминала и когда микшер недоступен.
+    """
+
+    def load_sound(self, path: Path) -> Sound:  # Метод для загрузки звука
+        return NullSound()  # Возвращаем беззвучный звук
+
+    def load_music(self, path: Path):  # Метод для загрузки фоновой музыки
+        pass  # Нечего загружать
+
+    def play_music(self, loops: int):  # Метод для воспроизведения фоновой музыки
+        pass  # Ничего не воспроизводим
+
+    def stop_music(self):  # Метод для остановки фоновой музыки
+        pass  # Нечего останавливать
+
+    def set_music_volume(self, volume: float):  # Метод для установки громкости фоновой музыки
+        pass  # Громкость не нужна
@@ -0,0 +1,25 @@
+from pathlib import Path  # Импортируем класс Path из модуля pathlib для работы с путями
+
+import pygame  # Импортируем библиотеку pygame для работы с аудио
+
+from controller.sound.backend import AudioBackend, Sound  # Импортируем интерфейс аудио из модуля controller.sound.backend
+
+
+class PygameBackend(AudioBackend):  # Определяем класс PygameBackend для звука через pygame
+    def __init__(self):  # Конструктор класса PygameBackend
+        pygame.mixer.init()  # Инициализируем только микшер pygame; без аудиоустройства выбрасывает pygame.error
+
+    def load_sound(self, path: Path) -> Sound:  # Метод для загрузки звука
+        return pygame.mixer.Sound(path)  # Декодируем звук
+
+    def load_music(self, path: Path):  # Метод для загрузки фоновой музыки
+        pygame.mixer.music.load(path)  # Загружаем фоновую музыку
+
+    def play_music(self, loops: int):  # Метод для воспроизведения фоновой музыки
+        pygame.mixer.music.play(loops=loops)  # Воспроизводим фоновую музыку
+
+    def stop_music(self):  # Метод для остановки фоновой музыки
+        pygame.mixer.music.stop()  # Останавливаем фоновую музыку
+
+    def set_music_volume(self, volume: float):  # Метод для установки громкости фоновой музыки
+        pygame.mixer.music.set_volume(volume)  # Устанавливаем громкость фоновой музыки
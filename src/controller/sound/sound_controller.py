@@ -1,7 +1,9 @@
 from enum import Enum  # Импортируем класс Enum для создания перечислений
+from pathlib import Path  # Импортируем класс Path из модуля pathlib для работы с путями
+from threading import Event, Lock, Thread  # Импортируем примитивы threading для фоновой загрузки звуков
 
-import pygame  # Импортируем библиотеку pygame для работы с аудио
-
+from controller.sound.backend import AudioBackend, NullBackend, Sound  # Импортируем интерфейс аудио из модуля controller.sound.backend
+from utils.logger import controller_log  # Импортируем логгер controller_log из модуля utils.logger
 from utils.utils import get_project_root  # Импортируем функцию get_project_root из модуля utils.utils
 
 class SoundType(Enum):  # Определяем перечисление SoundType для типов звуков
@@ -31,69 +33,140 @@ class SoundUsage(Enum):  # Определяем перечисление SoundUs
     closed = 6  # Звук закрытия
     open = 7  # Звук открытия
 
+class SoundHandle:  # Определяем класс SoundHandle для звука с отложенной загрузкой
+    """
+    Звук, который декодируется фоновым потоком или при первом воспроизведении.
+    Объект можно раздавать и настраивать сразу: громкость запоминается и применяется после загрузки.
+    """
+
+    def __init__(self, path: Path, backend: AudioBackend):  # Конструктор класса SoundHandle
+        self.path = path  # Путь к файлу звука
+        self.__backend = backend  # Аудио, которое декодирует звук
+        self.__sound: Sound | None = None  # Декодированный звук
+        self.__volume: float | None = None  # Громкость, заданная до загрузки
+        self.__lock = Lock()  # Блокировка загрузки и громкости между потоками
+
+    @property
+    def ready(self) -> bool:  # Свойство для проверки, загружен ли звук
+        return self.__sound is not None  # Возвращаем True, если звук декодирован
+
+    def load(self) -> Sound:  # Метод для загрузки звука
+        with self.__lock:  # Блокируем загрузку от других потоков
+            if self.__sound is None:  # Если звук еще не загружен
+                self.__sound = self.__backend.load_sound(self.path)  # Декодируем звук
+                if self.__volume is not None:  # Если громкость задавалась до загрузки
+                    self.__sound.set_volume(self.__volume)  # Применяем громкость
+        return self.__sound  # Возвращаем звук
+
+    def play(self, loops: int = 0):  # Метод для воспроизведения звука
+        self.load().play(loops)  # Воспроизводим звук, загрузив его при необходимости
+
+    def stop(self):  # Метод для остановки звука
+        if self.__sound is not None:  # Если звук загружен
+            self.__sound.stop()  # Останавливаем звук
+
+    def set_volume(self, volume: float):  # Метод для установки громкости
+        with self.__lock:  # Блокируем громкость от потока загрузки
+            self.__volume = volume  # Запоминаем громкость
+            if self.__sound is not None:  # Если звук загружен
+                self.__sound.set_volume(volume)  # Устанавливаем громкость
+
 class SoundController:  # Определяем класс SoundController для управления звуками
     __instance = None  # Приватное статическое поле для хранения единственного экземпляра класса
+    __sounds_dir = get_project_root() / "misc/sounds"  # Путь к директории со звуками
+    __sound_files = {  # Файлы звуков по типу и использованию
+        (SoundType.Food, SoundUsage.add): "add_food.ogg",  # Звук добавления еды
+        (SoundType.Food, SoundUsage.use): "use_food.ogg",  # Звук использования еды
+        (SoundType.Gold, SoundUsage.add): "add_gold.ogg",  # Звук добавления золота
+        (SoundType.Weapon, SoundUsage.add): "add_weapon.ogg",  # Звук добавления оружия
+        (SoundType.Weapon, SoundUsage.use): "use_weapon.ogg",  # Звук использования оружия
+        (SoundType.Enemy, SoundUsage.miss): "miss_sound.ogg",  # Звук промаха врага
+        (SoundType.Enemy, SoundUsage.engaged): "enemy_engaged.ogg",  # Звук взаимодействия с врагом
+        (SoundType.Ghost, SoundUsage.hit): "hit_ghost.ogg",  # Звук попадания по призраку
+        (SoundType.Mimic, SoundUsage.hit): "hit_ogre.ogg",  # Звук попадания по мимику
+        (SoundType.Ogre, SoundUsage.hit): "hit_ogre.ogg",  # Звук попадания по огру
+        (SoundType.SnakeMage, SoundUsage.hit): "hit_snake_mage.ogg",  # Звук попадания по змеиному магу
+        (SoundType.Vampire, SoundUsage.hit): "hit_vampire.ogg",  # Звук попадания по вампиру
+        (SoundType.Zombie, SoundUsage.hit): "hit_zombie.ogg",  # Звук попадания по зомби
+        (SoundType.Character, SoundUsage.hit): "hit_character.ogg",  # Звук попадания по персонажу
+        (SoundType.Character, SoundUsage.miss): "miss_sound.ogg",  # Звук промаха персонажа
+        (SoundType.Door, SoundUsage.closed): "door_closed.ogg",  # Звук закрытия двери
+        (SoundType.Door, SoundUsage.open): "door_open.ogg",  # Звук открытия двери
+        (SoundType.Key, SoundUsage.add): "key_add.ogg",  # Звук добавления ключа
+        (SoundType.Potion, SoundUsage.add): "potion_add.ogg",  # Звук добавления зелья
+        (SoundType.Potion, SoundUsage.use): "potion_use.ogg",  # Звук использования зелья
+        (SoundType.Scroll, SoundUsage.add): "scroll_add.ogg",  # Звук добавления свитка
+        (SoundType.Scroll, SoundUsage.use): "scroll_use.ogg",  # Звук использования свитка
+        (SoundType.Level, SoundUsage.open): "next_level.ogg",  # Звук перехода на следующий уровень
+        (SoundType.Character, SoundUsage.add): "level_up.ogg",  # Звук повышения уровня персонажа
+    }
 
     def __new__(cls, *args, **kwargs):  # Переопределяем метод __new__ для реализации паттерна Singleton
         if cls.__instance is None:  # Если экземпляр не создан
-            cls.__instance = super().__new__(cls, *args, **kwargs)  # Создаем новый экземпляр
+            cls.__instance = super().__new__(cls)  # Создаем новый экземпляр
         return cls.__instance  # Возвращаем единственный экземпляр
 
     @classmethod
     def get_instance(cls):  # Метод для получения единственного экземпляра класса
         return cls.__instance  # Возвращаем единственный экземпляр
 
-    def __init__(self):  # Конструктор класса SoundController
-        pygame.init()  # Инициализируем pygame
-        #pygame.mixer.init()  # Инициализируем микшер pygame (закомментировано)
-        self.sounds = {  # Словарь для хранения звуков
-            (SoundType.Food, SoundUsage.add): pygame.mixer.Sound(get_project_root() / "misc/sounds/add_food.ogg"),  # Звук добавления еды
-            (SoundType.Food, SoundUsage.use): pygame.mixer.Sound(get_project_root() / "misc/sounds/use_food.ogg"),  # Звук использования еды
-            (SoundType.Gold, SoundUsage.add): pygame.mixer.Sound(get_project_root() / "misc/sounds/add_gold.ogg"),  # Звук добавления золота
-            (SoundType.Weapon, SoundUsage.add): pygame.mixer.Sound(get_project_root() / "misc/sounds/add_weapon.ogg"),  # Звук добавления оружия
-            (SoundType.Weapon, SoundUsage.use): pygame.mixer.Sound(get_project_root() / "misc/sounds/use_weapon.ogg"),  # Звук использования оружия
-            (SoundType.Enemy, SoundUsage.miss): pygame.mixer.Sound(get_project_root() / "misc/sounds/miss_sound.ogg"),  # Звук промаха врага
-            (SoundType.Enemy, SoundUsage.engaged): pygame.mixer.Sound(get_project_root() / "misc/sounds/enemy_engaged.ogg"),  # Звук взаимодействия с врагом
-            (SoundType.Ghost, SoundUsage.hit): pygame.mixer.Sound(get_project_root() / "misc/sounds/hit_ghost.ogg"),  # Звук попадания по призраку
-            (SoundType.Mimic, SoundUsage.hit): pygame.mixer.Sound(get_project_root() / "misc/sounds/hit_ogre.ogg"),  # Звук попадания по мимику
-            (SoundType.Ogre, SoundUsage.hit): pygame.mixer.Sound(get_project_root() / "misc/sounds/hit_ogre.ogg"),  # Звук попадания по огру
-            (SoundType.SnakeMage, SoundUsage.hit): pygame.mixer.Sound(get_project_root() / "misc/sounds/hit_snake_mage.ogg"),  # Звук попадания по змеиному магу
-            (SoundType.Vampire, SoundUsage.hit): pygame.mixer.Sound(get_project_root() / "misc/sounds/hit_vampire.ogg"),  # Звук попадания по вампиру
-            (SoundType.Zombie, SoundUsage.hit): pygame.mixer.Sound(get_project_root() / "misc/sounds/hit_zombie.ogg"),  # Звук попадания по зомби
-            (SoundType.Character, SoundUsage.hit): pygame.mixer.Sound(get_project_root() / "misc/sounds/hit_character.ogg"),  # Звук попадания по персонажу
-            (SoundType.Character, SoundUsage.miss): pygame.mixer.Sound(get_project_root() / "misc/sounds/miss_sound.ogg"),  # Звук промаха персонажа
-            (SoundType.Door, SoundUsage.closed): pygame.mixer.Sound(get_project_root() / "misc/sounds/door_closed.ogg"),  # Звук закрытия двери
-            (SoundType.Door, SoundUsage.open): pygame.mixer.Sound(get_project_root() / "misc/sounds/door_open.ogg"),  # Звук открытия двери
-            (SoundType.Key, SoundUsage.add): pygame.mixer.Sound(get_project_root() / "misc/sounds/key_add.ogg"),  # Звук добавления ключа
-            (SoundType.Potion, SoundUsage.add): pygame.mixer.Sound(get_project_root() / "misc/sounds/potion_add.ogg"),  # Звук добавления зелья
-            (SoundType.Potion, SoundUsage.use): pygame.mixer.Sound(get_project_root() / "misc/sounds/potion_use.ogg"),  # Звук использования зелья
-            (SoundType.Scroll, SoundUsage.add): pygame.mixer.Sound(get_project_root() / "misc/sounds/scroll_add.ogg"),  # Звук добавления свитка
-            (SoundType.Scroll, SoundUsage.use): pygame.mixer.Sound(get_project_root() / "misc/sounds/scroll_use.ogg"),  # Звук использования свитка
-            (SoundType.Level, SoundUsage.open): pygame.mixer.Sound(get_project_root() / "misc/sounds/next_level.ogg"),  # Звук перехода на следующий уровень
-            (SoundType.Character, SoundUsage.add): pygame.mixer.Sound(get_project_root() / "misc/sounds/level_up.ogg"),  # Звук повышения уровня персонажа
-        }
-        pygame.mixer.music.load(get_project_root() / "misc/sounds/background.ogg")  # Загружаем фоновую музыку
-        self.intro = pygame.mixer.Sound(get_project_root() / "misc/sounds/intro_2.ogg")  # Звук вступления
-        self.game_over = pygame.mixer.Sound(get_project_root() / "misc/sounds/gameover.ogg")  # Звук конца игры
-        self.win = pygame.mixer.Sound(get_project_root() / "misc/sounds/win.ogg")  # Звук победы
+    def __init__(self, enabled: bool = True):  # Конструктор класса SoundController
+        """
+        Сразу загружается только музыка вступления, остальные звуки декодируются фоновым потоком.
+        :param enabled: False - работать без звука и не импортировать pygame
+        """
+        self.__backend = self.__select_backend(enabled)  # Аудио, через которое играют звуки
+        self.enabled = not isinstance(self.__backend, NullBackend)  # Флаг наличия звука
+        self.__handles: dict[str, SoundHandle] = {}  # Звуки по именам файлов, чтобы общий файл декодировался один раз
+        self.intro = self.__handle("intro_2.ogg")  # Звук вступления
+        self.intro.load()  # Вступление играет сразу, поэтому загружаем его до первого кадра
+        self.sounds = {key: self.__handle(file) for key, file in self.__sound_files.items()}  # Словарь для хранения звуков
+        self.game_over = self.__handle("gameover.ogg")  # Звук конца игры
+        self.win = self.__handle("win.ogg")  # Звук победы
+        self.__background_loaded = False  # Флаг загрузки фоновой музыки
+        self.preloaded = Event()  # Событие окончания фоновой загрузки звуков
 
         self.mute(1)  # Отключаем звук
+        if self.enabled:  # Если звук есть
+            Thread(target=self.__preload, name="sound-preload", daemon=True).start()  # Запускаем фоновую загрузку звуков
+        else:  # Если звука нет
+            self.preloaded.set()  # Загружать нечего
 
     @staticmethod
-    def play_background() -> None:  # Метод для воспроизведения фоновой музыки
-        pygame.mixer.music.play(loops=-1)  # Воспроизводим фоновую музыку в бесконечном цикле
+    def __select_backend(enabled: bool) -> AudioBackend:  # Метод для выбора аудио
+        if not enabled:  # Если звук отключен
+            return NullBackend()  # Работаем без звука
+        try:
+            from controller.sound.pygame_backend import PygameBackend  # Импортируем pygame только когда нужен звук
 
-    @staticmethod
-    def stop_background() -> None:  # Метод для остановки фоновой музыки
-        pygame.mixer.music.stop()  # Останавливаем воспроизведение фоновой музыки
+            return PygameBackend()  # Работаем со звуком через pygame
+        except (ImportError, RuntimeError) as e:  # Если pygame не установлен или нет аудиоустройства (pygame.error - RuntimeError)
+            controller_log.warning("Sound is disabled: {error}", error=e)  # Логируем отключение звука
+            return NullBackend()  # Работаем без звука
+
+    def __handle(self, file: str) -> SoundHandle:  # Метод для получения звука по имени файла
+        if file not in self.__handles:  # Если звук еще не создан
+            self.__handles[file] = SoundHandle(self.__sounds_dir / file, self.__backend)  # Создаем звук с отложенной загрузкой
+        return self.__handles[file]  # Возвращаем звук
+
+    def __preload(self):  # Метод для фоновой загрузки звуков
+        for handle in list(self.__handles.values()):  # Проходим по всем звукам
+            handle.load()  # Декодируем звук
+        self.preloaded.set()  # Сообщаем об окончании загрузки
+
+    def play_background(self) -> None:  # Метод для воспроизведения фоновой музыки
+        if not self.__background_loaded:  # Если фоновая музыка еще не загружена
+            self.__backend.load_music(self.__sounds_dir / "background.ogg")  # Загружаем фоновую музыку
+            self.__background_loaded = True  # Отмечаем фоновую музыку загруженной
+        self.__backend.play_music(-1)  # Воспроизводим фоновую музыку в бесконечном цикле
+
+    def stop_background(self) -> None:  # Метод для остановки фоновой музыки
+        self.__backend.stop_music()  # Останавливаем воспроизведение фоновой музыки
 
-    def get_sound(self, object_type, usage):  # Метод для получения звука по типу и использованию
+    def get_sound(self, object_type, usage) -> SoundHandle | None:  # Метод для получения звука по типу и использованию
         return self.sounds.get((object_type, usage))  # Возвращаем звук из словаря
 
     def mute(self, volume):  # Метод для отключения звука
-        pygame.mixer.music.set_volume(volume * 0.4)  # Устанавливаем громкость фоновой музыки
-        for sound in self.sounds.values():  # Для всех звуков в словаре
+        self.__backend.set_music_volume(volume * 0.4)  # Устанавливаем громкость фоновой музыки
+        for sound in self.__handles.values():  # Для всех звуков
             sound.set_volume(volume * 0.7)  # Устанавливаем громкость звука
-        self.game_over.set_volume(volume * 0.7)  # Устанавливаем громкость звука конца игры
-        self.win.set_volume(volume * 0.7)  # Устанавливаем громкость звука победы
-        self.intro.set_volume(volume * 0.7)  # Устанавливаем громкость звука вступления
@@ -0,0 +1,102 @@
+from collections.abc import Callable, Iterable  # Импортируем Callable и Iterable для аннотаций
+
+from domain import Coordinate  # Импортируем класс Coordinate из модуля domain
+
+
+Cell = tuple[str, int]  # Символ и цвет клетки
+
+
+class Viewport:  # Определяем класс Viewport для окна карты в терминале
+    """
+    Окно карты размером с окно игры в терминале и буфер клеток карты за ним.
+    Камера следует за персонажем: когда он подходит к краю окна ближе чем на MARGIN клеток, окно центрируется на нем,
+    но не выходит за часть карты, занятую комнатами и коридорами.
+    Буфер хранит уже собранные клетки карты. У карты запрашиваются только изменившиеся клетки и клетки,
+    впервые попавшие в окно, поэтому стоимость кадра зависит от размера окна, а не уровня.
+    """
+
+    MARGIN = 5  # Расстояние от персонажа до края окна, при котором окно прокручивается
+
+    def __init__(self, height: int, width: int):  # Конструктор класса Viewport
+        self.height = height  # Высота окна
+        self.width = width  # Ширина окна
+        self.y, self.x = 0, 0  # Координата карты в левом верхнем углу окна
+        self.__map_height, self.__map_width = 0, 0  # Размер карты
+        self.__max_y, self.__max_x = 0, 0  # Наибольшие координаты левого верхнего угла окна
+        self.__tiles: list[Cell | None] = []  # Буфер клеток карты; None - клетку нужно запросить у карты
+
+    def reset(self, map_height: int, map_width: int, extent: tuple[int, int]):  # Метод для перехода на новую карту
+        """
+        Очистить буфер и вернуть окно в левый верхний угол новой карты.
+        :param extent: высота и ширина части карты, занятой комнатами и коридорами
+        """
+        self.__map_height, self.__map_width = map_height, map_width  # Запоминаем размер карты
+        self.__max_y = max(min(extent[0], map_height) - self.height, 0)  # Окно не прокручивается за нижний край комнат
+        self.__max_x = max(min(extent[1], map_width) - self.width, 0)  # Окно не прокручивается за правый край комнат
+        self.__tiles = [None] * (map_height * map_width)  # Пустой буфер клеток
+        self.y, self.x = 0, 0  # Возвращаем окно в угол карты
+
+    def follow(self, crd: Coordinate) -> bool:  # Метод для прокрутки окна к персонажу
+        """
+        Прокрутить окно так, чтобы координата была не ближе MARGIN клеток к его краю.
+        :return: True, если окно сдвинулось и его нужно перерисовать целиком
+        """
+        y = self.__scroll(self.y, crd[0], self.height, self.__max_y)  # Новая строка угла окна
+        x = self.__scroll(self.x, crd[1], self.width, self.__max_x)  # Новый столбец угла окна
+        moved = (y, x) != (self.y, self.x)  # Флаг сдвига окна
+        self.y, self.x = y, x  # Сдвигаем окно
+        return moved  # Возвращаем флаг сдвига
+
+    def __scroll(self, origin: int, pos: int, size: int, limit: int) -> int:  # Метод для прокрутки по одной оси
+        margin = min(self.MARGIN, (size - 1) // 2)  # Отступ от края окна
+        if origin + margin <= pos <= origin + size - 1 - margin:  # Если координата далеко от краев окна
+            return origin  # Окно остается на месте
+        return min(max(pos - size // 2, 0), limit)  # Центрируем окно на координате
+
+    def invalidate(self, cells: Iterable[Coordinate]):  # Метод для сброса изменившихся клеток
+        for y, x in cells:  # Проходим по клеткам
+            if 0 <= y < self.__map_height and 0 <= x < self.__map_width:  # Если клетка на карте
+                self.__tiles[y * self.__map_width + x] = None  # Клетку нужно запросить у карты заново
+
+    def invalidate_view(self):  # Метод для сброса клеток окна
+        for y, x, length in self.rows():  # Проходим по строкам окна
+            i = y * self.__map_width + x  # Индекс начала строки в буфере
+            self.__tiles[i : i + length] = [None] * length  # Клетки строки нужно запросить у карты заново
+
+    def rows(self) -> list[tuple[int, int, int]]:  # Метод для получения строк окна
+        """
+        Строки карты, видимые в окне.
+        :return: список (строка карты, начальный столбец карты, длина)
+        """
+        length = min(self.width, self.__map_width - self.x)  # Длина видимой части строки
+        return [(y, self.x, length) for y in range(self.y, min(self.y + self.height, self.__map_height))]  # Возвращаем строки окна
+
+    def spans(self, cells: Iterable[Coordinate]) -> list[tuple[int, int, int]]:  # Метод для объединения клеток в отрезки строк
+        """
+        Сгруппировать видимые в окне клетки в непрерывные отрезки строк.
+        :return: список (строка карты, начальный столбец карты, длина)
+        """
+        spans = []  # Список отрезков
+        for y, x in sorted(cells):  # Проходим по клеткам по строкам слева направо
+            if not (self.y <= y < min(self.y + self.height, self.__map_height) and self.x <= x < min(self.x + self.width, self.__map_width)):  # Если клетка не попадает в окно
+                continue  # Пропускаем клетку
+            if spans and spans[-1][0] == y and spans[-1][1] + spans[-1][2] == x:  # Если клетка продолжает отрезок
+                spans[-1] = (y, spans[-1][1], spans[-1][2] + 1)  # Удлиняем отрезок
+            else:  # Если клетка начинает новый отрезок
+                spans.append((y, x, 1))  # Добавляем новый отрезок
+        return spans  # Возвращаем отрезки
+
+    def cells(self, y: int, x: int, length: int, get_cell: Callable[[int, int], Cell]) -> list[Cell]:  # Метод для получения клеток отрезка
+        """
+        Получить клетки отрезка строки карты из буфера.
+        :param get_cell: функция карты, которой запрашиваются клетки, отсутствующие в буфере
+        """
+        tiles = self.__tiles  # Буфер клеток
+        start = y * self.__map_width + x  # Индекс начала отрезка в буфере
+        for i in range(start, start + length):  # Проходим по клеткам отрезка
+            if tiles[i] is None:  # Если клетки нет в буфере
+                tiles[i] = get_cell(y, x + i - start)  # Запрашиваем клетку у карты
+        return tiles[start : start + length]  # Возвращаем клетки отрезка
+
+    def to_screen(self, y: int, x: int) -> Coordinate:  # Метод для перевода координаты карты в координату окна
+        return y - self.y, x - self.x  # Возвращаем координату в окне
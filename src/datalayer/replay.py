@@ -0,0 +1,53 @@
+import gzip  # Импортируем модуль gzip для сжатия файла записи
+import json  # Импортируем модуль json для работы с JSON
+from pathlib import Path  # Импортируем класс Path из модуля pathlib для работы с путями
+
+
+class Replay:  # Определяем класс Replay для записи сессии игры
+    """
+    Запись игровой сессии: seed, имя персонажа и нормализованные клавиши, обработанные конечным автоматом контроллера.
+    Нормализованная клавиша - один символ, поэтому клавиши хранятся одной строкой в сжатом gzip JSON-файле.
+    Вместе с клавишами хранится итог игры (Controller.final_state), с которым сверяется воспроизведение.
+    """
+
+    VERSION = 2  # Версия формата файла записи
+    SUPPORTED_VERSIONS = (1, 2)  # Версии, которые можно воспроизвести; в версии 1 нет итога игры
+
+    def __init__(self, seed: int, nickname: str, keys: str = ""):  # Конструктор класса Replay
+        self.seed = seed  # Seed игры
+        self.nickname = nickname  # Имя персонажа
+        self.__keys: list[str] = list(keys)  # Записанные клавиши
+        self.final: dict | None = None  # Итог игры: уровень, координаты персонажа и хеш окна карты
+
+    @property
+    def keys(self) -> str:  # Свойство для получения записанных клавиш
+        return "".join(self.__keys)  # Возвращаем клавиши одной строкой
+
+    def __len__(self) -> int:  # Метод для получения количества записанных клавиш
+        return len(self.__keys)  # Возвращаем количество клавиш
+
+    def append(self, key: str):  # Метод для записи клавиши
+        self.__keys.append(key)  # Добавляем клавишу в запись
+
+    def dump(self, path: Path):  # Метод для сохранения записи в файл
+        data = {
+            "version": self.VERSION,
+            "seed": self.seed,
+            "nickname": self.nickname,
+            "keys": self.keys,
+            "final": self.final,
+        }  # Данные записи
+        with gzip.open(path, mode="wt", encoding="utf-8") as wr_f:  # Открываем сжатый файл для записи
+            json.dump(data, wr_f, ensure_ascii=False, separators=(",", ":"))  # Сохраняем данные без лишних пробелов
+
+    @classmethod
+    def load(cls, path: Path) -> "Replay":  # Метод для загрузки записи из файла
+        with gzip.open(path, mode="rt", encoding="utf-8") as rd_f:  # Открываем сжатый файл для чтения
+            data = json.load(rd_f)  # Загружаем данные из файла
+
+        if data.get("version") not in cls.SUPPORTED_VERSIONS:  # Если формат записи не поддерживается
+            raise ValueError(f"Unsupported replay version: {data.get('version')}")  # Выбрасываем исключение
+
+        replay = cls(data["seed"], data["nickname"], data["keys"])  # Запись
+        replay.final = data.get("final")  # Итог игры
+        return replay  # Возвращаем запись
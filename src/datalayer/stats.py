@@ -1,4 +1,5 @@
 import json  # Импортируем модуль json для работы с JSON-файлами
+import os  # Импортируем модуль os для чтения переменных окружения
 from pathlib import Path  # Импортируем класс Path из модуля pathlib для работы с путями
 
 from utils.utils import get_project_root  # Импортируем функцию get_project_root из модуля utils.utils
@@ -26,20 +27,22 @@ class RogueStats:  # Определяем класс RogueStats для хран
         self.total_hits: int = 0  # Инициализируем количество нанесенных ударов
         self.missed_hits: int = 0  # Инициализируем количество промахов
         self.passed_cells: int = 0  # Инициализируем количество пройденных клеток
+        self.seed: int | None = None  # Инициализируем seed генератора случайных чисел игры
 
     @classmethod
     def get_instance(cls):  # Метод для получения единственного экземпляра класса
         return cls.__instance  # Возвращаем единственный экземпляр
 
     def __get_stats_file(self) -> Path:  # Метод для получения пути к файлу статистики
-        if not self.__stats_dir.exists():  # Если директория для статистики не существует
-            raise FileExistsError(f"Stats directory does not exist: {self.__stats_dir}")  # Выбрасываем исключение
+        stats_dir = Path(os.environ.get("ROGUE_STATS_DIR") or self.__stats_dir)  # Директория для статистики; ROGUE_STATS_DIR переопределяет ее
+        if not stats_dir.exists():  # Если директория для статистики не существует
+            raise FileExistsError(f"Stats directory does not exist: {stats_dir}")  # Выбрасываем исключение
 
-        for f in self.__stats_dir.iterdir():  # Проходим по всем файлам в директории
+        for f in stats_dir.iterdir():  # Проходим по всем файлам в директории
             if f.name == self.__stats_file:  # Если находим файл статистики
                 return f  # Возвращаем путь к файлу
 
-        f_path = self.__stats_dir / self.__stats_file  # Формируем путь к файлу статистики
+        f_path = stats_dir / self.__stats_file  # Формируем путь к файлу статистики
         f_path.touch()  # Создаем файл, если он не существует
 
         return f_path  # Возвращаем путь к файлу
@@ -137,7 +140,12 @@ class RogueStats:  # Определяем класс RogueStats для хран
     def __form_current_state_dict(self) -> dict:  # Метод для формирования словаря с текущим состоянием
         from domain.objects.character import Character  # Импортируем класс Character
 
-        return {"nickname": self.nickname, "stats": self._dump(), "character_state": Character.get_instance()._dump()}  # Возвращаем словарь с текущим состоянием
+        return {
+            "nickname": self.nickname,
+            "seed": self.seed,
+            "stats": self._dump(),
+            "character_state": Character.get_instance()._dump(),
+        }  # Возвращаем словарь с текущим состоянием
 
     def dump_json_save(self):  # Метод для сохранения текущего состояния персонажа
         """
@@ -0,0 +1,42 @@
+"""
+Декодер трассы действий, которую Controller сохраняет в конце игры, при падении или по сигналу SIGUSR1.
+Запуск из каталога src:
+
+    python decode_trace.py ../log/trace.bin --tail 50
+    python decode_trace.py --actor 0 --summary
+"""
+
+import argparse
+from collections import Counter
+from pathlib import Path
+
+from utils.trace import TraceBuffer
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rogue Game trace decoder")
+    parser.add_argument("path", type=Path, nargs="?", default=None, help="файл трассы (по умолчанию trace.bin в директории логов)")
+    parser.add_argument("--actor", type=int, default=None, help="показать только записи действующего лица (0 - персонаж)")
+    parser.add_argument("--tail", type=int, default=None, help="показать только последние записи")
+    parser.add_argument("--summary", action="store_true", help="показать количество записей по действиям")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    records = [rec for rec in TraceBuffer.decode(args.path or TraceBuffer.default_path()) if args.actor is None or rec[1] == args.actor]
+    if args.tail is not None:
+        records = records[-args.tail :]
+
+    if args.summary:
+        for action, count in Counter(rec[2] for rec in records).most_common():
+            print(f"{action.name:<13} {count}")
+        return
+
+    for turn, actor, action, y, x in records:
+        who = "character" if actor == TraceBuffer.CHARACTER else f"enemy#{actor}"
+        print(f"{turn:>7} {who:<12} {action.name:<13} {y:>4} {x:>4}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
-from random import choice, randint  # Импортируем функции choice и randint из модуля random для генерации случайных чисел
+from random import Random  # Импортируем класс Random из модуля random для генерации случайных чисел
 from typing import Any  # Импортируем тип Any из модуля typing для аннотации типов
 
 from controller.sound.sound_controller import SoundController, SoundType, SoundUsage  # Импортируем классы и перечисления из модуля sound_controller
 from domain import Coordinate  # Импортируем класс Coordinate из модуля domain
 from domain.objects.character import Character  # Импортируем класс Character из модуля domain.objects.character
 from domain.objects.enemies.enemy import Enemy  # Импортируем класс Enemy из модуля domain.objects.enemies.enemy
+from domain.map.free_cells import FreeCells  # Импортируем класс FreeCells из модуля domain.map.free_cells
+from domain.map.spatial_hash import SpatialHash  # Импортируем класс SpatialHash из модуля domain.map.spatial_hash
 from domain.objects.utils import IS_MACOS  # Импортируем константу IS_MACOS из модуля domain.objects.utils
 from utils.logger import domain_log  # Импортируем логгер domain_log из модуля utils.logger
 
@@ -14,10 +16,15 @@ class Key:  # Определяем класс Key для представлен
         16: "красный",
         17: "зеленый",
         18: "синий",
+        31: "желтый",
+        32: "голубой",
+        33: "пурпурный",
     }
+    __key_colors = {16: 19, 17: 20, 18: 21, 31: 34, 32: 35, 33: 36}  # Словарь для сопоставления цвета двери с цветом ключа
 
     def __init__(self, color):  # Конструктор класса Key
-        self.color = color + 3  # Устанавливаем цвет ключа
+        self.door_color = color  # Цвет двери, которую открывает ключ
+        self.color = self.__key_colors[color]  # Устанавливаем цвет ключа
         self.info = self.__info_map[color]  # Получаем описание цвета ключа
         self.add_sound = SoundController.get_instance().get_sound(SoundType.Key, SoundUsage.add)  # Звук добавления ключа
 
@@ -47,12 +54,14 @@ class Corridor:  # Определяем класс Corridor для предст
     empty_symbol = " "  # Символ пустой клетки
     color = 6  # Цвет коридора
 
-    def __init__(self, start_door: Door, finish_door: Door, direction: str):  # Конструктор класса Corridor
+    def __init__(self, start_door: Door, finish_door: Door, direction: str, rng: Random):  # Конструктор класса Corridor
         """
         Начало и конец коридора - это двери в границе комнаты.
         Для генерации оставшегося коридора двери обрезаются.
         :param direction: 'v' (vertical) | 'h' (horizontal)
+        :param rng: генератор случайных чисел уровня
         """
+        self.__rng = rng  # Генератор случайных чисел уровня
         self.__doors = {  # Словарь для хранения дверей коридора
             start_door.crd: start_door,
             finish_door.crd: finish_door,
@@ -60,8 +69,10 @@ class Corridor:  # Определяем класс Corridor для предст
         self.__corridor: dict[Coordinate, Any] = {}  # Словарь для хранения клеток коридора
         self.__objects: dict[Coordinate, Any] = {}  # Словарь для хранения объектов в коридоре
         self.__items: dict[Coordinate, Any] = {}  # Словарь для хранения предметов в коридоре
+        self.__enemy_index: SpatialHash | None = None  # Пространственный индекс противников уровня
         self.start, self.finish = self.__shift_initials(start_door.crd, finish_door.crd, direction)  # Сдвигаем начальные координаты дверей
         self.__generate_corridor(direction)  # Генерируем коридор
+        self.__free_cells = FreeCells(rng, self.__corridor)  # Свободные клетки коридора без объектов и предметов
         self.has_character = False  # Флаг наличия персонажа в коридоре
         self.__visited = False  # Флаг посещения коридора
         domain_log.info("{cls} initialized", cls=self.__class__.__name__)  # Логируем инициализацию коридора
@@ -70,6 +81,10 @@ class Corridor:  # Определяем класс Corridor для предст
     def doors(self):  # Свойство для получения словаря дверей
         return self.__doors  # Возвращаем словарь дверей
 
+    @property
+    def cells(self):  # Свойство для получения клеток коридора без дверей
+        return self.__corridor.keys()  # Возвращаем координаты клеток коридора
+
     @staticmethod
     def __shift_initials(start: Coordinate, finish: Coordinate, direction: str) -> tuple[Coordinate, Coordinate]:  # Метод для сдвига начальных координат дверей
         y, x = start  # Начальные координаты первой двери
@@ -97,7 +112,7 @@ class Corridor:  # Определяем класс Corridor для предст
             if x == x_:  # Если координаты по x совпадают
                 self.__build_vertical_corridor(y, y_, x)  # Строим вертикальный коридор
             else:  # Если координаты по x не совпадают
-                y_turn = randint(min(y, y_), max(y, y_))  # Генерируем случайную координату поворота по y
+                y_turn = self.__rng.randint(min(y, y_), max(y, y_))  # Генерируем случайную координату поворота по y
                 self.__build_vertical_corridor(y, y_turn, x)  # Строим вертикальный коридор до поворота
                 self.__build_horizontal_corridor(x, x_, y_turn)  # Строим горизонтальный коридор до поворота
                 self.__build_vertical_corridor(y_, y_turn, x_)  # Строим вертикальный коридор после поворота
@@ -106,7 +121,7 @@ class Corridor:  # Определяем класс Corridor для предст
             if y == y_:  # Если координаты по y совпадают
                 self.__build_horizontal_corridor(x, x_, y)  # Строим горизонтальный коридор
             else:  # Если координаты по y не совпадают
-                x_turn = randint(min(x, x_), max(x, x_))  # Генерируем случайную координату поворота по x
+                x_turn = self.__rng.randint(min(x, x_), max(x, x_))  # Генерируем случайную координату поворота по x
                 self.__build_horizontal_corridor(x, x_turn, y)  # Строим горизонтальный коридор до поворота
                 self.__build_vertical_corridor(y, y_, x_turn)  # Строим вертикальный коридор до поворота
                 self.__build_horizontal_corridor(x_, x_turn, y_)  # Строим горизонтальный коридор после поворота
@@ -154,25 +169,34 @@ class Corridor:  # Определяем класс Corridor для предст
         :param radius: радиус, если радиус == 0 выбрать всю доступную область
         """
         if not radius:  # Если радиус равен 0
-            y_, x_ = choice(list(self.__corridor))  # Выбираем случайную координату из коридора
-            while (y_, x_) in self.__objects or (y_, x_) in self.__items:  # Пока в координате есть объекты или предметы
-                y_, x_ = choice(list(self.__corridor))  # Выбираем новую случайную координату
-            return y_, x_  # Возвращаем случайную координату
+            return self.__free_cells.choice() or crd  # Возвращаем случайную свободную координату или начальную, если свободных нет
 
         y, x = crd  # Начальная координата
-        available_cord = []  # Список доступных координат
-        for cor_crd in self.__corridor:  # Проходим по всем координатам коридора
-            if cor_crd in self.__objects or cor_crd in self.__items:  # Если в координате есть объекты или предметы
-                continue  # Пропускаем координату
-            if y - radius <= cor_crd[0] <= y + radius and x - radius <= cor_crd[1] <= x + radius:  # Если координата в зоне радиуса
-                available_cord.append(cor_crd)  # Добавляем координату в список доступных
-        return choice(available_cord)  # Возвращаем случайную координату из списка доступных
+        zone = [
+            (y_, x_)
+            for y_ in range(y - radius, y + radius + 1)
+            for x_ in range(x - radius, x + radius + 1)
+            if (y_, x_) in self.__free_cells
+        ]  # Свободные клетки коридора в зоне
+        return self.__rng.choice(zone) if zone else crd  # Возвращаем случайную координату из зоны или начальную, если свободных нет
+
+    def track_enemies(self, index: SpatialHash):  # Метод для подключения пространственного индекса противников
+        self.__enemy_index = index  # Запоминаем индекс
+        for crd, obj in self.__objects.items():  # Проходим по объектам коридора
+            if isinstance(obj, Enemy):  # Если объект является противником
+                index.add(crd, obj, self)  # Добавляем противника в индекс
 
     def add_object(self, crd: Coordinate, obj: Character | Enemy):  # Метод для добавления объекта в коридор
         self.__objects[crd] = obj  # Добавляем объект в словарь объектов
+        self.__free_cells.discard(crd)  # Клетка больше не свободна
+        if self.__enemy_index is not None and isinstance(obj, Enemy):  # Если объект является противником
+            self.__enemy_index.add(crd, obj, self)  # Добавляем противника в индекс
 
     def remove_object(self, crd: Coordinate):  # Метод для удаления объекта из коридора
         del self.__objects[crd]  # Удаляем объект из словаря объектов
+        self.__release(crd)  # Освобождаем клетку
+        if self.__enemy_index is not None:  # Если индекс противников подключен
+            self.__enemy_index.discard(crd)  # Удаляем противника из индекса
 
     def get_object(self, crd: Coordinate) -> Character | Enemy | None:  # Метод для получения объекта коридора по координате
         """
@@ -187,9 +211,15 @@ class Corridor:  # Определяем класс Corridor для предст
 
     def add_item(self, crd: Coordinate, obj: Any):  # Метод для добавления предмета в коридор
         self.__items[crd] = obj  # Добавляем предмет в словарь предметов
+        self.__free_cells.discard(crd)  # Клетка больше не свободна
 
     def remove_item(self, crd: Coordinate):  # Метод для удаления предмета из коридора
         del self.__items[crd]  # Удаляем предмет из словаря предметов
+        self.__release(crd)  # Освобождаем клетку
+
+    def __release(self, crd: Coordinate):  # Метод для возврата клетки в свободные
+        if crd in self.__corridor and crd not in self.__objects and crd not in self.__items:  # Если в клетке коридора ничего не осталось
+            self.__free_cells.add(crd)  # Возвращаем клетку в свободные
 
     def get_item(self, crd: Coordinate) -> Any | None:  # Метод для получения предмета коридора по координате
         """
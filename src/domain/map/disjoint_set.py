@@ -0,0 +1,36 @@
+class DisjointSet:  # Определяем класс DisjointSet для системы непересекающихся множеств
+    """
+    Система непересекающихся множеств над элементами 0..size-1.
+    Поиск сжимает путь, объединение подвешивает меньшее дерево к большему,
+    поэтому любая последовательность операций выполняется почти за линейное время.
+    """
+
+    def __init__(self, size: int):  # Конструктор класса DisjointSet
+        self.__parent = list(range(size))  # Родитель каждого элемента
+        self.__size = [1] * size  # Размер дерева каждого корня
+        self.groups = size  # Количество множеств
+
+    def find(self, i: int) -> int:  # Метод для поиска представителя множества
+        parent = self.__parent  # Список родителей
+        while parent[i] != i:  # Пока элемент не корень
+            parent[i] = parent[parent[i]]  # Подвешиваем элемент к деду
+            i = parent[i]  # Переходим к родителю
+        return i  # Возвращаем корень
+
+    def union(self, a: int, b: int) -> bool:  # Метод для объединения множеств
+        """
+        Объединить множества элементов a и b.
+        :return: True, если элементы были в разных множествах
+        """
+        a, b = self.find(a), self.find(b)  # Корни множеств
+        if a == b:  # Если элементы уже в одном множестве
+            return False
+        if self.__size[a] < self.__size[b]:  # Если первое дерево меньше
+            a, b = b, a  # Подвешиваем меньшее дерево к большему
+        self.__parent[b] = a  # Объединяем деревья
+        self.__size[a] += self.__size[b]  # Обновляем размер дерева
+        self.groups -= 1  # Уменьшаем количество множеств
+        return True
+
+    def connected(self, a: int, b: int) -> bool:  # Метод для проверки, в одном ли множестве элементы
+        return self.find(a) == self.find(b)  # Возвращаем True, если корни совпадают
@@ -0,0 +1,61 @@
+from array import array  # Импортируем array для компактного хранения расстояний
+from collections import deque  # Импортируем deque для очереди обхода в ширину
+from collections.abc import Callable  # Импортируем Callable для аннотации функции проходимости
+
+from domain import Coordinate  # Импортируем класс Coordinate из модуля domain
+
+
+class DistanceMap:  # Определяем класс DistanceMap для карты расстояний до цели
+    """
+    Карта расстояний по проходимым клеткам, рассчитанная обходом в ширину от одной точки.
+    Противник, делающий шаг в соседнюю клетку с меньшим расстоянием, идет к цели кратчайшим путем.
+    """
+
+    UNREACHABLE = 0xFFFF  # Расстояние до недостижимой клетки
+
+    __steps = ((0, 1), (0, -1), (1, 0), (-1, 0))  # Смещения соседних клеток
+
+    def __init__(self, height: int, width: int):  # Конструктор класса DistanceMap
+        self.height = height  # Высота карты
+        self.width = width  # Ширина карты
+        self.__distances = array("H", [self.UNREACHABLE]) * (height * width)  # Расстояния до цели
+        self.__reached: list[int] = []  # Индексы достигнутых клеток для быстрой очистки
+
+    def compute(self, origin: Coordinate, max_distance: int, is_walkable: Callable[[Coordinate], bool]):  # Метод для расчета расстояний
+        """
+        Рассчитать расстояния от точки origin.
+        :param max_distance: клетки дальше этого расстояния считаются недостижимыми
+        :param is_walkable: функция, возвращающая True для клеток, по которым можно пройти
+        """
+        for i in self.__reached:  # Проходим по ранее достигнутым клеткам
+            self.__distances[i] = self.UNREACHABLE  # Сбрасываем расстояние
+        self.__reached.clear()  # Очищаем список достигнутых клеток
+
+        y, x = origin  # Координаты цели
+        if not (0 <= y < self.height and 0 <= x < self.width):  # Если цель вне карты
+            return  # Выходим из метода
+        self.__set(y * self.width + x, 0)  # Расстояние до цели равно 0
+        queue = deque([(y, x, 0)])  # Очередь обхода
+        while queue:  # Пока очередь не пуста
+            y, x, dist = queue.popleft()  # Забираем клетку из очереди
+            if dist == max_distance:  # Если достигнуто максимальное расстояние
+                continue  # Дальше от клетки не идем
+            for dy, dx in self.__steps:  # Проходим по соседним клеткам
+                y_, x_ = y + dy, x + dx  # Координаты соседней клетки
+                if not (0 <= y_ < self.height and 0 <= x_ < self.width):  # Если клетка вне карты
+                    continue  # Пропускаем клетку
+                i = y_ * self.width + x_  # Индекс клетки
+                if self.__distances[i] != self.UNREACHABLE or not is_walkable((y_, x_)):  # Если клетка уже достигнута или непроходима
+                    continue  # Пропускаем клетку
+                self.__set(i, dist + 1)  # Записываем расстояние
+                queue.append((y_, x_, dist + 1))  # Добавляем клетку в очередь
+
+    def __set(self, i: int, dist: int):  # Метод для записи расстояния
+        self.__distances[i] = dist  # Записываем расстояние
+        self.__reached.append(i)  # Запоминаем индекс клетки
+
+    def distance(self, crd: Coordinate) -> int:  # Метод для получения расстояния до цели
+        y, x = crd  # Координаты клетки
+        if 0 <= y < self.height and 0 <= x < self.width:  # Если клетка внутри карты
+            return self.__distances[y * self.width + x]  # Возвращаем расстояние
+        return self.UNREACHABLE  # Возвращаем расстояние до недостижимой клетки
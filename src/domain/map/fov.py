@@ -0,0 +1,100 @@
+from collections.abc import Callable  # Импортируем Callable для аннотации функции прозрачности
+
+from domain import Coordinate  # Импортируем класс Coordinate из модуля domain
+
+
+class FieldOfView:  # Определяем класс FieldOfView для поля зрения персонажа
+    """
+    Поле зрения, рассчитанное рекурсивным алгоритмом теневого отбрасывания (shadowcasting).
+    Видимые клетки хранятся в битовой карте размером с уровень.
+    """
+
+    __octants = (  # Матрицы преобразования координат для восьми октантов
+        (1, 0, 0, 1),
+        (0, 1, 1, 0),
+        (0, -1, 1, 0),
+        (-1, 0, 0, 1),
+        (-1, 0, 0, -1),
+        (0, -1, -1, 0),
+        (0, 1, -1, 0),
+        (1, 0, 0, -1),
+    )
+
+    def __init__(self, height: int, width: int):  # Конструктор класса FieldOfView
+        self.height = height  # Высота карты
+        self.width = width  # Ширина карты
+        self.__visible = bytearray(height * width)  # Битовая карта видимых клеток
+        self.__lit: list[int] = []  # Индексы видимых клеток для быстрой очистки
+
+    def compute(self, origin: Coordinate, radius: int, is_transparent: Callable[[Coordinate], bool]):  # Метод для расчета поля зрения
+        """
+        Рассчитать видимые клетки из точки origin.
+        :param radius: радиус видимости
+        :param is_transparent: функция, возвращающая True для клеток, не закрывающих обзор
+        """
+        for i in self.__lit:  # Проходим по ранее видимым клеткам
+            self.__visible[i] = 0  # Сбрасываем видимость клетки
+        self.__lit.clear()  # Очищаем список видимых клеток
+
+        self.__mark(origin)  # Точка обзора всегда видима
+        for xx, xy, yx, yy in self.__octants:  # Проходим по октантам
+            self.__cast(origin, 1, 1.0, 0.0, radius, (xx, xy, yx, yy), is_transparent)  # Рассчитываем октант
+
+    def __cast(
+        self,
+        origin: Coordinate,
+        row: int,
+        start: float,
+        end: float,
+        radius: int,
+        octant: tuple[int, int, int, int],
+        is_transparent: Callable[[Coordinate], bool],
+    ):  # Метод для рекурсивного расчета одного октанта
+        if start < end:  # Если сектор обзора пуст
+            return  # Выходим из метода
+
+        o_y, o_x = origin  # Координаты точки обзора
+        xx, xy, yx, yy = octant  # Матрица преобразования октанта
+        radius_sq = radius * radius  # Квадрат радиуса видимости
+        new_start = start  # Начало сектора после препятствия
+        for j in range(row, radius + 1):  # Проходим по строкам октанта
+            dx, dy = -j - 1, -j  # Начальное смещение в строке
+            blocked = False  # Флаг препятствия в предыдущей клетке
+            while dx <= 0:  # Проходим по клеткам строки
+                dx += 1  # Смещаемся на следующую клетку
+                crd = (o_y + dx * yx + dy * yy, o_x + dx * xx + dy * xy)  # Координата клетки на карте
+                l_slope = (dx - 0.5) / (dy + 0.5)  # Левый наклон клетки
+                r_slope = (dx + 0.5) / (dy - 0.5)  # Правый наклон клетки
+                if start < r_slope:  # Если клетка левее сектора
+                    continue  # Пропускаем клетку
+                if end > l_slope:  # Если клетка правее сектора
+                    break  # Выходим из строки
+
+                if dx * dx + dy * dy <= radius_sq:  # Если клетка в радиусе видимости
+                    self.__mark(crd)  # Отмечаем клетку видимой
+
+                if blocked:  # Если предыдущая клетка закрывала обзор
+                    if not is_transparent(crd):  # Если текущая клетка тоже закрывает обзор
+                        new_start = r_slope  # Сдвигаем начало сектора
+                        continue  # Переходим к следующей клетке
+                    blocked = False  # Препятствие закончилось
+                    start = new_start  # Продолжаем сектор после препятствия
+                elif not is_transparent(crd) and j < radius:  # Если клетка закрывает обзор
+                    blocked = True  # Начинаем препятствие
+                    self.__cast(origin, j + 1, start, l_slope, radius, octant, is_transparent)  # Рассчитываем сектор до препятствия
+                    new_start = r_slope  # Начало сектора после препятствия
+
+            if blocked:  # Если строка закончилась препятствием
+                break  # Дальше ничего не видно
+
+    def __mark(self, crd: Coordinate):  # Метод для отметки клетки видимой
+        y, x = crd  # Координаты клетки
+        if 0 <= y < self.height and 0 <= x < self.width:  # Если клетка внутри карты
+            i = y * self.width + x  # Индекс клетки
+            if not self.__visible[i]:  # Если клетка еще не отмечена
+                self.__visible[i] = 1  # Отмечаем клетку видимой
+                self.__lit.append(i)  # Запоминаем индекс клетки
+
+    def is_visible(self, crd: Coordinate) -> bool:  # Метод для проверки видимости клетки
+        y, x = crd  # Координаты клетки
+        return 0 <= y < self.height and 0 <= x < self.width and bool(self.__visible[y * self.width + x])  # Возвращаем True, если клетка видима
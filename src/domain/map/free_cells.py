@@ -0,0 +1,39 @@
+from collections.abc import Iterable  # Импортируем Iterable для аннотации начальных клеток
+from random import Random  # Импортируем класс Random из модуля random для выбора случайной клетки
+
+from domain import Coordinate  # Импортируем класс Coordinate из модуля domain
+
+
+class FreeCells:  # Определяем класс FreeCells для множества свободных клеток
+    """
+    Индексированное множество свободных клеток.
+    Клетки хранятся в списке, а их позиции - в словаре, поэтому добавление, удаление и выбор случайной клетки занимают O(1).
+    """
+
+    def __init__(self, rng: Random, cells: Iterable[Coordinate] = ()):  # Конструктор класса FreeCells
+        self.__rng = rng  # Генератор случайных чисел
+        self.__cells: list[Coordinate] = list(cells)  # Список свободных клеток
+        self.__index: dict[Coordinate, int] = {crd: i for i, crd in enumerate(self.__cells)}  # Позиции клеток в списке
+
+    def __len__(self) -> int:  # Метод для получения количества свободных клеток
+        return len(self.__cells)  # Возвращаем количество свободных клеток
+
+    def __contains__(self, crd: Coordinate) -> bool:  # Метод для проверки, свободна ли клетка
+        return crd in self.__index  # Возвращаем True, если клетка свободна
+
+    def add(self, crd: Coordinate):  # Метод для добавления свободной клетки
+        if crd not in self.__index:  # Если клетки еще нет в множестве
+            self.__index[crd] = len(self.__cells)  # Запоминаем позицию клетки
+            self.__cells.append(crd)  # Добавляем клетку в конец списка
+
+    def discard(self, crd: Coordinate):  # Метод для удаления клетки из свободных
+        i = self.__index.pop(crd, None)  # Позиция удаляемой клетки
+        if i is None:  # Если клетки нет в множестве
+            return  # Выходим из метода
+        last = self.__cells.pop()  # Забираем последнюю клетку списка
+        if i < len(self.__cells):  # Если удаляемая клетка была не последней
+            self.__cells[i] = last  # Ставим последнюю клетку на место удаляемой
+            self.__index[last] = i  # Обновляем позицию перемещенной клетки
+
+    def choice(self) -> Coordinate | None:  # Метод для выбора случайной свободной клетки
+        return self.__rng.choice(self.__cells) if self.__cells else None  # Возвращаем случайную клетку или None, если свободных клеток нет
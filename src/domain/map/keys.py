@@ -1,28 +1,30 @@
+# Импортируем deque для очереди обхода комнат в ширину
+from collections import deque
 # Импортируем модуль Enum для создания перечислений
 from enum import Enum
-# Импортируем функции choice и sample из модуля random для случайного выбора элементов
-from random import choice, sample
+# Импортируем класс Random из модуля random для случайного выбора элементов
+from random import Random
 
-# Импортируем классы Door, Room и Character из соответствующих модулей
+# Импортируем классы Door и Room из соответствующих модулей
 from domain.map.corridor import Door
 from domain.map.room import Room
-from domain.objects.character import Character
+# Импортируем количество цветов ключей из настроек карты
+from domain.map.settings import KEY_COLORS
 
-# Создаем перечисление DoorsColor с тремя цветами дверей
+# Создаем перечисление DoorsColor с цветами дверей; на уровне используются первые KEY_COLORS цветов
 class DoorsColor(Enum):
     RED = 16
     GREEN = 17
     BLUE = 18
+    YELLOW = 31
+    CYAN = 32
+    MAGENTA = 33
 
-# Функция для генерации закрытых дверей на уровне
-def generate_locked_doors(level_map):
-    # Очищаем список ключей у персонажа
-    Character.get_instance().keys = []
-    # Определяем доступные цвета дверей
-    colors = (DoorsColor.RED, DoorsColor.GREEN, DoorsColor.BLUE)
-    # Определяем количество ключей
-    keys_amt = len(colors)
+# Граф комнат: для каждой комнаты - соседние комнаты и цвет закрытой двери между ними (None, если проход открыт)
+RoomGraph = dict[Room, list[tuple[Room, int | None]]]
 
+# Функция для генерации закрытых дверей на уровне
+def generate_locked_doors(level_map, rng: Random, colors: tuple[DoorsColor, ...] = tuple(DoorsColor)[:KEY_COLORS]):
     # Создаем список всех дверей на уровне
     all_doors: list[Door] = []
     for room in level_map.rooms:
@@ -30,25 +32,18 @@ def generate_locked_doors(level_map):
         # Находим комнату, в которой находится персонаж
         if room.has_character:
             start_room = room
-    # Выбираем случайные двери для закрытия
-    locked_doors = sample(all_doors, keys_amt)
+    # Выбираем случайные двери для закрытия, по одной на цвет
+    colors = colors[: len(all_doors)]
+    locked_doors = rng.sample(all_doors, len(colors))
     # Закрываем выбранные двери
     lock_doors(locked_doors, colors)
 
-    # Распределяем ключи по комнатам
-    for _ in range(keys_amt):
-        keys, available_rooms = [], []
-        get_available_rooms(keys, available_rooms, start_room)
-        key = keys.pop()
-        place_key(available_rooms, key)
-        # Открываем двери, соответствующие найденным ключам
-        for door in locked_doors:
-            if door.color == key.value:
-                door.lock = False
-                door.color = Door.base_color
-
-    # Закрываем двери снова после распределения ключей
-    lock_doors(locked_doors, colors)
+    # Раскладываем ключи так, чтобы каждый был достижим без ключей, лежащих за его дверью
+    graph = build_room_graph(level_map.rooms)
+    place_keys(graph, start_room, rng)
+    # Проверяем, что с разложенными ключами персонаж может дойти до всех комнат
+    if not is_solvable(graph, start_room):
+        raise RuntimeError("Generated locked doors can not be opened")
 
 # Функция для закрытия дверей
 def lock_doors(doors_to_lock, colors):
@@ -57,27 +52,83 @@ def lock_doors(doors_to_lock, colors):
         door.color = colors[i].value
 
 # Функция для размещения ключа в одной из доступных комнат
-def place_key(available_rooms: list[Room], key: DoorsColor):
-    room = choice(available_rooms)
+def place_key(available_rooms: list[Room], key: DoorsColor, rng: Random):
+    room = rng.choice(available_rooms)
     room.has_keys.append(key.value)
 
-# Функция для получения списка доступных комнат
-def get_available_rooms(keys: list[DoorsColor], available_rooms: list[Room], room: Room):
-    available_rooms.append(room)
-    for door in room.doors:
-        door_ = get_2nd_door(room, door)
-        closed_door = get_closed_door(door, door_)
-        if not closed_door and door.room not in available_rooms:
-            get_available_rooms(keys, available_rooms, door.room)
-        elif closed_door and DoorsColor(closed_door.color) not in keys:
-            keys.append(DoorsColor(door.color if door.is_closed else door_.color))
+# Функция для построения графа комнат по парам дверей
+def build_room_graph(rooms: list[Room]) -> RoomGraph:
+    # Каждая дверь ведет из комнаты в door.room; парная дверь ведет обратно
+    doors = {(room, door.room): door for room in rooms for door in room.doors}
+    graph: RoomGraph = {room: [] for room in rooms}
+    for (room, next_room), door in doors.items():
+        closed_door = get_closed_door(door, doors[next_room, room])
+        graph[room].append((next_room, closed_door.color if closed_door else None))
+    return graph
 
-# Функция для получения второй двери, соединяющей две комнаты
-def get_2nd_door(room: Room, door_: Door):
-    for door in door_.room.doors:
-        if door.room == room:
-            return door
-    return None
+# Функция для раскладки ключей обходом в ширину
+def place_keys(graph: RoomGraph, start_room: Room, rng: Random):
+    """
+    Обойти комнаты в ширину от начальной комнаты, раскладывая ключи.
+    Когда обход упирается только в закрытые двери, ключ от одной из них кладется в уже достижимую комнату,
+    и обход продолжается за дверями этого цвета. Каждая комната и каждый проход рассматриваются один раз.
+    """
+    available_rooms, reached = [start_room], {start_room}
+    queue = deque(available_rooms)
+    # Комнаты за закрытыми дверями по цветам в порядке обнаружения
+    blocked: dict[int, list[Room]] = {}
+    opened: set[int] = set()
+    while True:
+        while queue:
+            room = queue.popleft()
+            for next_room, color in graph[room]:
+                # Ключ нужен от каждой закрытой двери, даже если за ней уже достижимая комната
+                if color is not None and color not in opened:
+                    blocked.setdefault(color, []).append(next_room)
+                elif next_room not in reached:
+                    reached.add(next_room)
+                    available_rooms.append(next_room)
+                    queue.append(next_room)
+        if not blocked:
+            return
+        # Кладем ключ от двери, найденной последней, и открываем двери этого цвета
+        color, rooms = blocked.popitem()
+        place_key(available_rooms, DoorsColor(color), rng)
+        opened.add(color)
+        for room in rooms:
+            if room not in reached:
+                reached.add(room)
+                available_rooms.append(room)
+                queue.append(room)
+
+# Функция для проверки проходимости уровня
+def is_solvable(graph: RoomGraph, start_room: Room) -> bool:
+    """
+    Проверить за один обход в ширину, что персонаж может дойти до всех комнат, подбирая ключи по пути.
+    Комнаты за дверью, ключ от которой еще не найден, ждут этого ключа.
+    """
+    reached = {start_room}
+    queue = deque(reached)
+    keys: set[int] = set()
+    waiting: dict[int, list[Room]] = {}
+    while queue:
+        room = queue.popleft()
+        for key in room.has_keys:
+            keys.add(key)
+            # Ключ открывает все двери своего цвета, за которыми ждут комнаты
+            for next_room in waiting.pop(key, []):
+                if next_room not in reached:
+                    reached.add(next_room)
+                    queue.append(next_room)
+        for next_room, color in graph[room]:
+            if next_room in reached:
+                continue
+            if color is None or color in keys:
+                reached.add(next_room)
+                queue.append(next_room)
+            else:
+                waiting.setdefault(color, []).append(next_room)
+    return len(reached) == len(graph)
 
 # Функция для получения закрытой двери из двух дверей
 def get_closed_door(door1: Door, door2: Door) -> None | Door:
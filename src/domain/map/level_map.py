@@ -1,57 +1,122 @@
-from random import choice  # Импортируем функцию choice из модуля random для случайного выбора
-from time import sleep  # Импортируем функцию sleep из модуля time для задержек
+from random import Random  # Импортируем класс Random из модуля random для случайного выбора
 
 from controller.sound.sound_controller import SoundController, SoundType, SoundUsage  # Импортируем классы и перечисления из модуля sound_controller
 from datalayer.stats import RogueStats  # Импортируем класс RogueStats из модуля datalayer.stats
 from domain import Coordinate  # Импортируем класс Coordinate из модуля domain
 from domain.map.corridor import Corridor, Door  # Импортируем классы Corridor и Door из модуля domain.map.corridor
+from domain.map.disjoint_set import DisjointSet  # Импортируем класс DisjointSet из модуля domain.map.disjoint_set
+from domain.map.distance_map import DistanceMap  # Импортируем класс DistanceMap из модуля domain.map.distance_map
+from domain.map.fov import FieldOfView  # Импортируем класс FieldOfView из модуля domain.map.fov
 from domain.map.keys import generate_locked_doors  # Импортируем функцию generate_locked_doors из модуля domain.map.keys
 from domain.map.room import Room  # Импортируем класс Room из модуля domain.map.room
+from domain.map.settings import DORMANT_DISTANCE, ROOM_COLUMNS, ROOM_ROWS  # Импортируем константы из модуля domain.map.settings
+from domain.map.spatial_hash import SpatialHash  # Импортируем класс SpatialHash из модуля domain.map.spatial_hash
+from domain.map.tile_grid import TileGrid  # Импортируем класс TileGrid из модуля domain.map.tile_grid
+from domain.map.turn_scheduler import TurnScheduler  # Импортируем класс TurnScheduler из модуля domain.map.turn_scheduler
 from domain.objects.character import Character  # Импортируем класс Character из модуля domain.objects.character
 from domain.objects.enemies.enemy import Enemy  # Импортируем класс Enemy из модуля domain.objects.enemies.enemy
 from domain.objects.items.item import Item  # Импортируем класс Item из модуля domain.objects.items.item
 from domain.objects.utils import MovePattern, RogueEvent  # Импортируем перечисления MovePattern и RogueEvent из модуля domain.objects.utils
 from utils.logger import domain_log  # Импортируем логгер domain_log из модуля utils.logger
+from utils.trace import TraceAction, TraceBuffer, domain_trace  # Импортируем трассу действий из модуля utils.trace
 
 class LevelMap:
     """
     Класс - карта уровня.
-    При инициализации генерирует 9 комнат и случайные коридоры.
+    При инициализации генерирует сетку комнат rows x columns и случайные коридоры между соседними комнатами.
     """
 
     __map_symbol = " "  # Символ для пустой клетки карты
     __map_color = 1  # Цвет для пустой клетки карты
     __corridor_color = Corridor.color  # Цвет для коридора
-
-    def __init__(self, height: int, width: int, level: int, complexity_coef: float):
+    __visibility = 3  # Радиус, в котором персонаж видит клетки карты
+    __pursuit_distance = Enemy.MAX_HOSTILITY * 2  # Длина пути, в пределах которой противники идут кратчайшим путем; дальше - жадным шагом
+
+    def __init__(
+        self,
+        height: int,
+        width: int,
+        level: int,
+        complexity_coef: float | None,
+        rng: Random | None = None,
+        rows: int = ROOM_ROWS,
+        columns: int = ROOM_COLUMNS,
+    ):
         """
         Сгенерировать карту уровня.
+        Генерация не трогает персонажа, поэтому карту можно построить заранее в фоновом потоке;
+        персонаж, противники и предметы появляются на карте при вызове populate.
         :param level: Уровень игры от 1 до 21
-        :param complexity_coef: сложность [0, 2], где 1 = не изменять стандартный шанс на генерацию
+        :param complexity_coef: сложность [0, 2], где 1 = не изменять стандартный шанс на генерацию;
+            None - не заселять карту, пока не будет вызван populate
+        :param rng: генератор случайных чисел уровня; им пользуются генерация, противники, предметы и бои на уровне
+        :param rows: количество строк в сетке комнат
+        :param columns: количество столбцов в сетке комнат
         """
+        self.__rng = rng or Random()  # Генератор случайных чисел уровня
+        self.level = level  # Номер уровня
         self.height = height  # Высота карты
         self.width = width  # Ширина карты
         self.y, self.x, self.y_, self.x_ = 0, 0, self.height - 1, self.width - 1  # Границы карты
-        self.__character = self.__get_character()  # Получаем экземпляр персонажа
-        self.__rooms = self.__generate_level_rooms()  # Генерируем комнаты уровня
+        self.__character: Character | None = None  # Персонаж появляется на карте при заселении
+        self.__rooms = self.__generate_level_rooms(rows, columns)  # Генерируем комнаты уровня
         self.__corridors: list[Corridor] = []  # Список для хранения коридоров
         self.__generate_doors_and_corridors()  # Генерируем двери и коридоры
-        self.__place_character_to_initial_room()  # Размещаем персонажа в начальной комнате
-        generate_locked_doors(self)  # Генерируем закрытые двери
+        self.__start_room, self.__start_crd = self.__place_character_to_initial_room()  # Выбираем начальную клетку персонажа
+        generate_locked_doors(self, self.__rng)  # Генерируем закрытые двери
         self.__place_exit()  # Размещаем выход
-        self.__generate_enemies(level, complexity_coef)  # Генерируем врагов
-        self.__generate_items(level, complexity_coef)  # Генерируем предметы
+        self.__grid = TileGrid(height, width)  # Индекс клеток уровня
+        self.__grid.build(self.__rooms, self.__corridors)  # Заполняем индекс комнатами и коридорами
+        self.__fov = FieldOfView(height, width)  # Поле зрения персонажа
+        self.__distances = DistanceMap(height, width)  # Карта расстояний до персонажа для преследования
+        self.__distances_ready = False  # Флаг актуальности карты расстояний в текущем ходе
+        self.__lit_cells: set[Coordinate] = set()  # Клетки, которые персонаж видит на карте
+        self.__dirty: set[Coordinate] = set()  # Клетки, изменившиеся с последней отрисовки
+        self.__hits: set[Coordinate] = set()  # Клетки, по которым пришлись атаки с последней отрисовки
+        self.__enemies = SpatialHash(Enemy.MAX_HOSTILITY)  # Пространственный индекс противников
+        self.__scheduler = TurnScheduler()  # Очередь ходов активных противников
+        for place in self.__rooms + self.__corridors:  # Проходим по комнатам и коридорам
+            place.track_enemies(self.__enemies)  # Подключаем индекс противников
+        self.__generate_keys()  # Генерируем ключи до врагов и предметов, чтобы для них всегда хватило места
         self.__visited_corridors = set()  # Множество для хранения посещенных коридоров
+        domain_log.info("{cls} generated: level={level}", cls=self.__class__.__name__, level=level)  # Логируем генерацию карты уровня
+
+        if complexity_coef is not None:  # Если сложность уже известна
+            self.populate(complexity_coef)  # Сразу заселяем карту
+
+    def populate(self, complexity_coef: float):
+        """
+        Поместить персонажа на карту и сгенерировать противников и предметы.
+        Вызывается в основном потоке, когда карта становится текущей: генератор уровня к этому моменту
+        уже прошел генерацию комнат, поэтому результат не зависит от того, была ли карта построена заранее.
+        :param complexity_coef: сложность [0, 2], где 1 = не изменять стандартный шанс на генерацию
+        """
+        self.__character = self.__get_character()  # Получаем экземпляр персонажа
+        self.__character.rng = self.__rng  # Бои персонажа на уровне используют генератор уровня
+        self.__character.keys = []  # Ключи прошлого уровня к этому уровню не подходят
+        self.__start_room.add_object(self.__start_crd, self.__character)  # Размещаем персонажа в начальной комнате
+        self.__character.place(self.__start_crd)  # Устанавливаем координаты персонажа
+        self.__update_fov()  # Рассчитываем поле зрения из начальной позиции персонажа
+        self.__generate_enemies(self.level, complexity_coef)  # Генерируем врагов
+        self.__generate_items(self.level, complexity_coef)  # Генерируем предметы
         domain_log.info("{cls} initialized", cls=self.__class__.__name__)  # Логируем инициализацию карты уровня
+        domain_trace.record(TraceAction.LEVEL, TraceBuffer.CHARACTER, (self.level, 0))  # Записываем создание уровня в трассу
         self.__sound = SoundController.get_instance().get_sound(SoundType.Level, SoundUsage.open)  # Получаем звук открытия уровня
 
-        if level > 1:  # Если уровень больше 1
+        if self.level > 1:  # Если уровень больше 1
             self.__sound.play()  # Воспроизводим звук открытия уровня
 
     @property
     def rooms(self):
         return self.__rooms  # Возвращаем список комнат
 
+    @property
+    def extent(self) -> tuple[int, int]:
+        """
+        Высота и ширина части карты от ее левого верхнего угла, занятой комнатами вместе с границами и коридорами.
+        """
+        return max(room.y_ for room in self.__rooms) + 2, max(room.x_ for room in self.__rooms) + 2  # Коридоры проходят между комнатами
+
     def __get_character(self) -> Character:
         ch = Character.get_instance()  # Получаем экземпляр персонажа
         if not ch:  # Если персонаж не существует
@@ -59,32 +124,38 @@ class LevelMap:
             raise AttributeError("Please create a character before LevelMap initializing.")  # Выбрасываем исключение
         return ch  # Возвращаем экземпляр персонажа
 
-    def __generate_level_rooms(self) -> list[Room]:
+    def __generate_level_rooms(self, rows: int, columns: int) -> list[Room]:
         rooms = []  # Список для хранения комнат
-        w_size = self.width // 3  # Ширина комнаты
-        h_size = self.height // 3  # Высота комнаты
+        w_size = self.width // columns  # Ширина комнаты
+        h_size = self.height // rows  # Высота комнаты
         w_step = w_size - 1  # Шаг по ширине
         h_step = h_size - 1  # Шаг по высоте
 
         room_id = 0  # Идентификатор комнаты
-        for col in range(3):  # Проходим по столбцам
-            for row in range(3):  # Проходим по строкам
-                rooms.append(Room(self.x + w_step * row, self.y + h_step * col, h_size, w_size, room_id))  # Добавляем комнату в список
+        for row in range(rows):  # Проходим по строкам сетки
+            for col in range(columns):  # Проходим по столбцам сетки
+                rooms.append(
+                    Room(self.x + w_step * col, self.y + h_step * row, h_size, w_size, room_id, self.__rng, rows, columns)
+                )  # Добавляем комнату в список
                 room_id += 1  # Увеличиваем идентификатор комнаты
 
         return rooms  # Возвращаем список комнат
 
-    def __place_character_to_initial_room(self):
-        choice(self.__rooms).place_character()  # Размещаем персонажа в случайной комнате
+    def __place_character_to_initial_room(self) -> tuple[Room, Coordinate]:
+        room = self.__rng.choice(self.__rooms)  # Выбираем случайную комнату
+        return room, room.place_character()  # Возвращаем комнату и клетку персонажа
 
     def __place_exit(self):
-        choice(list(filter(lambda r: not r.has_character, self.__rooms))).place_exit()  # Размещаем выход в случайной комнате без персонажа
+        self.__rng.choice(list(filter(lambda r: not r.has_character, self.__rooms))).place_exit()  # Размещаем выход в случайной комнате без персонажа
 
     def __generate_doors_and_corridors(self):
-        room_id = 0  # Идентификатор комнаты
-
-        room_groups = [set()]  # Список для хранения групп комнат
-        cur_group = 0  # Текущая группа
+        """
+        Сгенерировать двери и коридоры между соседними комнатами.
+        Сначала случайный обход комнат прокладывает коридоры в случайные стороны,
+        затем оставшиеся пары соседей в случайном порядке соединяют разные группы комнат, пока группа не останется одна.
+        Группы хранятся в системе непересекающихся множеств, поэтому генерация почти линейна по количеству комнат.
+        """
+        groups = DisjointSet(len(self.__rooms))  # Группы комнат, соединенных коридорами
 
         def gen_doors_and_corridor(id_: int, side_: str) -> int:
             next_id_, next_busy_side, start_coord = self.__rooms[id_].generate_door(side_)  # Генерируем дверь
@@ -97,54 +168,38 @@ class LevelMap:
                 n_id=next_id_,
                 side=side_,
             )  # Логируем генерацию нового коридора
-            self.__corridors.append(Corridor(start_door, finish_door, direction="v" if side_ in ["U", "D"] else "h"))  # Добавляем коридор в список
+            self.__corridors.append(Corridor(start_door, finish_door, "v" if side_ in ["U", "D"] else "h", self.__rng))  # Добавляем коридор в список
+            groups.union(id_, next_id_)  # Объединяем группы комнат
             return next_id_  # Возвращаем идентификатор следующей комнаты
 
-        def union_groups():
-            nonlocal room_groups  # Используем nonlocal для изменения переменной room_groups
-            for i in range(len(room_groups) - 1):  # Проходим по группам комнат
-                for j in range(i + 1, len(room_groups)):  # Проходим по оставшимся группам
-                    if room_groups[i] & room_groups[j]:  # Если группы пересекаются
-                        room_groups[i] |= room_groups[j]  # Объединяем группы
-                        domain_log.info("Corridor groups are united")  # Логируем объединение групп
-
-        def check_connections() -> bool:
-            nonlocal room_groups  # Используем nonlocal для изменения переменной room_groups
-            return all(room_groups[0] & room_groups[i] for i in range(1, len(room_groups)))  # Проверяем, что все группы соединены
-
-        def add_connection():
-            nonlocal room_groups  # Используем nonlocal для изменения переменной room_groups
-            for i in range(1, len(room_groups)):  # Проходим по группам комнат
-                if not room_groups[0] & room_groups[i]:  # Если группа не соединена с первой группой
-                    id_ = choice(list(room_groups[i]))  # Выбираем случайную комнату из группы
-                    domain_log.warning("Adding new connection for room {id}", id=id_)  # Логируем добавление нового соединения
-                    for door in self.__rooms[id_].random_door_sides():  # Проходим по сторонам двери
-                        room_groups[i].add(gen_doors_and_corridor(id_, door))  # Добавляем комнату в группу
-
         visited_rooms = [False for _ in self.__rooms]  # Список для отслеживания посещенных комнат
-        while not all(visited_rooms):  # Пока есть непосещенные комнаты
+        unvisited = 0  # Наименьший идентификатор комнаты, которая может быть не посещена
+        room_id = 0  # Идентификатор комнаты
+        while unvisited < len(visited_rooms):  # Пока есть непосещенные комнаты
             visited_rooms[room_id] = True  # Отмечаем комнату как посещенную
             next_id = -1  # Идентификатор следующей комнаты
             for side in self.__rooms[room_id].random_door_sides():  # Проходим по сторонам двери
                 next_id = gen_doors_and_corridor(room_id, side)  # Генерируем дверь и коридор
-                room_groups[cur_group].add(room_id)  # Добавляем комнату в текущую группу
                 visited_rooms[next_id] = True  # Отмечаем следующую комнату как посещенную
-                room_groups[cur_group].add(next_id)  # Добавляем следующую комнату в текущую группу
 
+            while unvisited < len(visited_rooms) and visited_rooms[unvisited]:  # Сдвигаемся к первой непосещенной комнате
+                unvisited += 1
             if next_id == -1:  # Если не удалось сгенерировать соединение
-                domain_log.warning("Random doors generation: adding new group")  # Логируем добавление новой группы
-                room_id = visited_rooms.index(False)  # Выбираем случайную непосещенную комнату
-                room_groups.append(set())  # Добавляем новую группу
-                cur_group += 1  # Увеличиваем текущую группу
-                continue  # Продолжаем генерацию
-
-            room_id = next_id  # Устанавливаем идентификатор следующей комнаты
-
-        union_groups()  # Объединяем группы комнат
-        while not check_connections():  # Пока есть несоединенные группы
-            domain_log.warning("Found a rooms group without direct connection")  # Логируем наличие несоединенной группы
-            add_connection()  # Добавляем соединение
-            union_groups()  # Объединяем группы комнат
+                domain_log.warning("Random doors generation: adding new group")  # Логируем начало новой группы
+                room_id = unvisited  # Продолжаем обход с непосещенной комнаты
+                continue
+            room_id = next_id  # Переходим в следующую комнату
+
+        if groups.groups == 1:  # Если все комнаты уже соединены
+            return
+        domain_log.warning("Found {n} room groups without direct connection", n=groups.groups)  # Логируем наличие несоединенных групп
+        candidates = [(room.id, side) for room in self.__rooms for side in room.free_sides]  # Свободные стороны комнат
+        self.__rng.shuffle(candidates)  # Соединяем группы в случайном порядке
+        for id_, side in candidates:  # Проходим по свободным сторонам
+            if not groups.connected(id_, self.__rooms[id_].neighbour(side)[0]):  # Если соседняя комната в другой группе
+                gen_doors_and_corridor(id_, side)  # Соединяем группы коридором
+                if groups.groups == 1:  # Если все комнаты соединены
+                    break
 
     def __generate_enemies(self, level: int, coef: float):
         """
@@ -165,9 +220,31 @@ class LevelMap:
         """
         for room in self.__rooms:  # Проходим по комнатам
             room.generate_items(level, coef)  # Генерируем предметы в комнате
+
+    def __generate_keys(self):
+        for room in self.__rooms:  # Проходим по комнатам
             room.generate_keys()  # Генерируем ключи в комнате
 
+    def pop_dirty_cells(self) -> set[Coordinate]:
+        """
+        Вернуть клетки, изменившиеся с предыдущего вызова, и очистить их список.
+        """
+        dirty, self.__dirty = self.__dirty, set()  # Забираем накопленные клетки
+        return dirty  # Возвращаем изменившиеся клетки
+
+    def pop_hits(self) -> set[Coordinate]:
+        """
+        Вернуть клетки, по которым пришлись атаки с предыдущего вызова, и очистить их список.
+        """
+        hits, self.__hits = self.__hits, set()  # Забираем накопленные клетки
+        return hits  # Возвращаем клетки атак
+
+    def __mark_room_dirty(self, room: Room):
+        for y in range(room.y - 1, room.y_ + 2):  # Проходим по строкам комнаты вместе с границей
+            self.__dirty.update((y, x) for x in range(room.x - 1, room.x_ + 2))  # Отмечаем клетки строки
+
     def move_character(self, direction: str) -> list[RogueEvent]:
+        self.__dirty.add(self.__character.get_crd())  # Цвет персонажа может измениться после проверки эффектов
         events, able_to_move = self.__character.check_object_effects()  # Проверяем эффекты объектов на персонаже
         if not able_to_move:  # Если персонаж не может двигаться
             return events  # Возвращаем события
@@ -185,16 +262,16 @@ class LevelMap:
             case _:
                 raise ValueError(f"Invalid direction {direction}")  # Выбрасываем исключение при неверном направлении
 
-        domain_log.info("Moving character: {d}", d=direction)  # Логируем движение персонажа
+        domain_log.debug("Moving character: {d}", d=direction)  # Логируем движение персонажа
         events.extend(self.__move_character((y, x)))  # Двигаем персонажа
+        self.__update_fov()  # Пересчитываем поле зрения после хода
 
         return events  # Возвращаем события
 
     def __move_character(self, crd: Coordinate) -> list[RogueEvent]:
-        for place in self.__rooms + self.__corridors:  # Проходим по комнатам и коридорам
-            if place.is_in(crd) or place.face_door(crd):  # Если координата находится в комнате или коридоре или перед дверью
-                domain_log.info(f"Moving character in {place.__class__.__name__}")  # Логируем движение персонажа
-                return self.__move_actor(place, crd)  # Двигаем персонажа
+        if place := self.__grid.place(crd):  # Если координата находится в комнате, коридоре или двери
+            domain_log.debug("Moving character in {place}", place=place.__class__.__name__)  # Логируем движение персонажа
+            return self.__move_actor(place, crd)  # Двигаем персонажа
 
         return []  # Возвращаем пустой список событий
 
@@ -220,11 +297,21 @@ class LevelMap:
             key.add_sound.play()  # Воспроизводим звук подбора ключа
             events.append(RogueEvent(f"Вы нашли {key.info} ключ", key.color))  # Добавляем событие нахождения ключа
 
+        prev_place = self.__grid.place(self.__character.get_crd())  # Место, в котором находился персонаж
+        if prev_place is not place:  # Если персонаж переходит в другое место
+            for place_ in (prev_place, place):  # Проходим по старому и новому месту
+                if isinstance(place_, Room):  # Если место является комнатой
+                    self.__mark_room_dirty(place_)  # Комната открывается или скрывается целиком
+            if isinstance(place, Room):  # Если персонаж входит в комнату
+                place.visit()  # Отмечаем комнату посещенной
+
+        self.__dirty.update((self.__character.get_crd(), crd))  # Отмечаем старую и новую позиции персонажа
         self.__remove_character()  # Удаляем персонажа с текущей позиции
         place.has_character = True  # Устанавливаем флаг наличия персонажа в комнате или коридоре
         place.add_object(crd, self.__character)  # Добавляем персонажа в новую позицию
         self.__character.place(crd)  # Устанавливаем новые координаты персонажа
         RogueStats.get_instance().passed_cells += 1  # Увеличиваем количество пройденных клеток
+        domain_trace.record(TraceAction.MOVE, TraceBuffer.CHARACTER, crd)  # Записываем ход персонажа в трассу
         return events  # Возвращаем события
 
     def __knock_the_door(self, door: Door):
@@ -233,21 +320,28 @@ class LevelMap:
             door.lock = False  # Открываем дверь
             character.keys.remove(door.color)  # Удаляем ключ из инвентаря персонажа
             door.color = Door.base_color  # Устанавливаем базовый цвет двери
+            self.__grid.set_locked(door.crd, False)  # Обновляем индекс клеток
+            self.__dirty.add(door.crd)  # Отмечаем дверь для перерисовки
             door.open_sound.play()  # Воспроизводим звук открытия двери
+            domain_trace.record(TraceAction.DOOR_OPEN, TraceBuffer.CHARACTER, door.crd)  # Записываем открытие двери в трассу
             return RogueEvent("Вы открыли дверь с помощью ключа")  # Возвращаем событие открытия двери
         door.closed_sound.play()  # Воспроизводим звук закрытия двери
+        domain_trace.record(TraceAction.DOOR_LOCKED, TraceBuffer.CHARACTER, door.crd)  # Записываем запертую дверь в трассу
         return RogueEvent("Дверь заперта. Найдите подходящий ключ")  # Возвращаем событие закрытия двери
 
     def __remove_character(self):
-        for obj in self.__rooms + self.__corridors:  # Проходим по комнатам и коридорам
-            if obj.has_character:  # Если в объекте есть персонаж
-                obj.has_character = False  # Устанавливаем флаг отсутствия персонажа
-                obj.remove_object(self.__character.get_crd())  # Удаляем персонажа из объекта
-                break  # Выходим из цикла
+        crd = self.__character.get_crd()  # Координаты персонажа
+        if (place := self.__grid.place(crd)) and place.has_character:  # Если в месте есть персонаж
+            place.has_character = False  # Устанавливаем флаг отсутствия персонажа
+            place.remove_object(crd)  # Удаляем персонажа из места
 
     def __attack_enemy(self, place: Room | Corridor, crd: Coordinate) -> list[RogueEvent]:
+        self.__dirty.add(crd)  # Отмечаем клетку противника для перерисовки
+        domain_trace.record(TraceAction.ATTACK, TraceBuffer.CHARACTER, crd)  # Записываем атаку персонажа в трассу
+        self.__hits.add(crd)  # Отмечаем клетку противника для вспышки
         events, exp = place.get_object(crd).harm(*self.__character.attack())  # Атакуем врага
         if exp:  # Если враг повержен
+            domain_trace.record(TraceAction.KILL, TraceBuffer.CHARACTER, crd)  # Записываем победу над врагом в трассу
             place.remove_object(crd)  # Удаляем врага из объекта
             events.extend(self.__character.add_experience(exp))  # Добавляем опыт персонажу
             RogueStats.get_instance().defeated_enemies += 1  # Увеличиваем количество поверженных врагов
@@ -258,72 +352,80 @@ class LevelMap:
         events, picked_up = self.__character.pick_up_item(place.get_item(crd))  # Подбираем предмет
         if picked_up:  # Если предмет подобран
             place.remove_item(crd)  # Удаляем предмет из объекта
+            domain_trace.record(TraceAction.PICK_UP, TraceBuffer.CHARACTER, crd)  # Записываем подбор предмета в трассу
 
         return events  # Возвращаем события
 
-    def __is_point_visible(self, crd: Coordinate) -> bool:
+    def __update_fov(self):
         """
-        Оптимизированный алгоритм Брезенхема.
-        Перебирает все клетки матрицы, через которые проходит луч между двумя точками.
+        Пересчитать поле зрения персонажа.
+        Радиус совпадает с максимальной враждебностью, чтобы поле зрения годилось и для проверки преследования.
         """
-        y1, x1 = crd  # Координаты начальной точки
-        y2, x2 = self.__character.get_crd()  # Координаты конечной точки
-        dy, dx = abs(y2 - y1), abs(x2 - x1)  # Вычисляем разницу по y и x
-        n = 1 + dx + dy  # Вычисляем количество шагов
-        x_dir = 1 if x2 > x1 else -1  # Определяем направление по x
-        y_dir = 1 if y2 > y1 else -1  # Определяем направление по y
-        err = dx - dy  # Вычисляем начальную ошибку
-        dx *= 2  # Удваиваем разницу по x
-        dy *= 2  # Удваиваем разницу по y
-        x = x1  # Устанавливаем начальную координату x
-        y = y1  # Устанавливаем начальную координату y
-        for _ in range(n):  # Проходим по всем шагам
-            if not any(obj.is_in((y, x)) for obj in self.__rooms + self.__corridors):  # Если координата не находится в комнате или коридоре
-                for corridor in self.__corridors:  # Проходим по коридорам
-                    if crd in corridor.doors and crd == (y, x):  # Если координата находится в дверях коридора
-                        break  # Выходим из цикла
-                else:  # Если координата не находится в дверях коридора
-                    return False  # Возвращаем False
-            if err > 0:  # Если ошибка больше 0
-                x += x_dir  # Увеличиваем координату x
-                err -= dy  # Уменьшаем ошибку
-            else:  # Если ошибка меньше или равна 0
-                y += y_dir  # Увеличиваем координату y
-                err += dx  # Увеличиваем ошибку
-
-        return True  # Возвращаем True
+        c_y, c_x = self.__character.get_crd()  # Координаты персонажа
+        self.__fov.compute((c_y, c_x), Enemy.MAX_HOSTILITY, self.__grid.is_walkable)  # Рассчитываем видимые клетки
+        lit_cells = {
+            (y, x)
+            for y in range(c_y - self.__visibility, c_y + self.__visibility + 1)
+            for x in range(c_x - self.__visibility, c_x + self.__visibility + 1)
+            if self.__fov.is_visible((y, x))
+        }  # Видимые клетки рядом с персонажем
+        self.__dirty |= lit_cells ^ self.__lit_cells  # Отмечаем клетки, которые появились или скрылись
+        self.__lit_cells = lit_cells  # Сохраняем видимые клетки
 
     def make_rogue_move(self) -> tuple[list[RogueEvent], bool]:
         """
         Совершить ход всеми живыми объектами игры, кроме персонажа.
+        Противники ходят по очереди ходов в соответствии со своей задержкой между действиями.
+        Противники дальше DORMANT_DISTANCE от персонажа и в непосещенных комнатах спят и не ходят.
         """
         events = []  # Список для хранения событий
         alive = True  # Флаг наличия живых объектов
         cur_alive = True  # Флаг наличия живых объектов в текущем ходе
-
-        for crd, obj, place in [
-            (crd, obj, place_)
-            for place_ in self.__rooms + self.__corridors
-            for crd, obj in place_.objects.items()
-            if not isinstance(obj, Character)
-        ]:  # Проходим по всем объектам в комнатах и коридорах, кроме персонажа
+        self.__distances_ready = False  # Карта расстояний рассчитывается заново при первом преследовании
+
+        c_y, c_x = self.__character.get_crd()  # Координаты персонажа
+        for crd, obj, place in self.__enemies.query((c_y, c_x), DORMANT_DISTANCE):  # Проходим по противникам рядом с персонажем
+            if obj not in self.__scheduler and self.__is_active(place):  # Если противник проснулся
+                self.__scheduler.schedule(obj, self.__scheduler.time)  # Ставим противника в очередь ходов
+
+        while due := self.__scheduler.pop_due():  # Пока в текущем ходе есть действия
+            at, obj = due  # Время действия и противник
+            location = self.__enemies.locate(obj)  # Текущие координата и место противника
+            if location is None:  # Если противник погиб
+                continue  # Убираем противника из очереди
+            crd, place = location  # Координата и место противника
+            if abs(crd[0] - c_y) > DORMANT_DISTANCE or abs(crd[1] - c_x) > DORMANT_DISTANCE or not self.__is_active(place):  # Если противник уснул
+                continue  # Убираем противника из очереди до пробуждения
+            self.__scheduler.schedule(obj, at + obj.action_delay)  # Планируем следующее действие противника
+
+            self.__dirty.add(crd)  # Цвет и видимость объекта могут измениться за ход
             eff_events, able_to_move = obj.check_object_effects()  # Проверяем эффекты объектов
             events.extend(eff_events)  # Добавляем события в список
             if not able_to_move:  # Если объект не может двигаться
                 continue  # Пропускаем объект
-            if obj.is_engaged(crd) and (obj.status_engaged() or self.__is_point_visible(crd)):  # Если объект взаимодействует с персонажем
-                domain_log.info(f"{obj.__class__.__name__} is chasing Character!")  # Логируем преследование персонажа
+            if abs(crd[0] - c_y) > Enemy.MAX_HOSTILITY or abs(crd[1] - c_x) > Enemy.MAX_HOSTILITY:  # Если персонаж далеко от объекта
+                obj.idle()  # Объект точно не взаимодействует с персонажем
+                self.__casual_enemy_move(place, crd, obj)  # Двигаем объект случайным образом
+            elif obj.is_engaged(crd) and (obj.status_engaged() or self.__fov.is_visible(crd)):  # Если объект взаимодействует с персонажем
+                domain_log.debug("{name} is chasing Character!", name=obj.__class__.__name__)  # Логируем преследование персонажа
                 obj.set_engaged_status()  # Устанавливаем статус взаимодействия
                 g_events, cur_alive = self.__engaged_enemy_move(place, crd, obj)  # Двигаем объект
                 events.extend(g_events)  # Добавляем события в список
             else:  # Если объект не взаимодействует с персонажем
-                domain_log.info(f"{obj.__class__.__name__} makes a pattern move")  # Логируем случайное движение объекта
+                domain_log.debug("{name} makes a pattern move", name=obj.__class__.__name__)  # Логируем случайное движение объекта
                 self.__casual_enemy_move(place, crd, obj)  # Двигаем объект случайным образом
 
             alive = cur_alive if alive else alive  # Обновляем флаг наличия живых объектов
 
+        self.__scheduler.advance()  # Переходим к следующему ходу
+        domain_trace.next_turn()  # Переходим к следующему ходу в трассе
+        self.__dirty.add(self.__character.get_crd())  # Персонаж мог получить урон
         return events, alive  # Возвращаем события и флаг наличия живых объектов
 
+    @staticmethod
+    def __is_active(place: Room | Corridor) -> bool:
+        return not isinstance(place, Room) or place.visited  # Противники в непосещенных комнатах спят
+
     def __casual_enemy_move(self, place: Room | Corridor, crd: Coordinate, enemy: Enemy):
         if enemy.pattern == MovePattern.STANDARD:  # Если паттерн движения стандартный
             self.__make_standard_move(place, crd, enemy)  # Двигаем объект стандартным образом
@@ -345,8 +447,7 @@ class LevelMap:
         y, x = crd  # Координаты объекта
         options = []  # Список для хранения возможных координат
 
-        def is_in_place(crd: Coordinate):
-            return any(obj.is_in_and_available_for_move(crd) for obj in self.__rooms + self.__corridors)  # Проверяем, находится ли координата в комнате или коридоре
+        is_in_place = self.__is_available_for_move  # Проверка, можно ли переместиться в координату
 
         for x_ in range(x - enemy.speed, x):  # Проходим по координатам x
             if not is_in_place((y, x_)):  # Если координата не находится в комнате или коридоре
@@ -370,7 +471,7 @@ class LevelMap:
 
         if not options:  # Если список возможных координат пуст
             return  # Выходим из метода
-        self.__replace_enemy_on_map(place, crd, choice(options), enemy)  # Двигаем объект
+        self.__replace_enemy_on_map(place, crd, self.__rng.choice(options), enemy)  # Двигаем объект
 
     def __make_diagonal_move(self, place: Room | Corridor, crd: Coordinate, enemy: Enemy):
         if enemy.speed <= 0:  # Если скорость объекта равна 0
@@ -385,26 +486,26 @@ class LevelMap:
         options = []  # Список для хранения возможных координат
         ur, ul, dr, dl = True, True, True, True  # Флаги для определения возможных направлений
         for i in range(1, enemy.speed + 1):  # Проходим по шагам
-            if dr and any(obj.is_in_and_available_for_move((y + i, x + i)) for obj in self.__rooms + self.__corridors):  # Если координата находится в комнате или коридоре
+            if dr and self.__is_available_for_move((y + i, x + i)):  # Если координата находится в комнате или коридоре
                 options.append((y + i, x + i))  # Добавляем координату в список
             else:  # Если координата не находится в комнате или коридоре
                 dr = False  # Устанавливаем флаг невозможности движения в данном направлении
-            if ur and any(obj.is_in_and_available_for_move((y - i, x + i)) for obj in self.__rooms + self.__corridors):  # Если координата находится в комнате или коридоре
+            if ur and self.__is_available_for_move((y - i, x + i)):  # Если координата находится в комнате или коридоре
                 options.append((y - i, x + i))  # Добавляем координату в список
             else:  # Если координата не находится в комнате или коридоре
                 ur = False  # Устанавливаем флаг невозможности движения в данном направлении
-            if ul and any(obj.is_in_and_available_for_move((y - i, x - i)) for obj in self.__rooms + self.__corridors):  # Если координата находится в комнате или коридоре
+            if ul and self.__is_available_for_move((y - i, x - i)):  # Если координата находится в комнате или коридоре
                 options.append((y - i, x - i))  # Добавляем координату в список
             else:  # Если координата не находится в комнате или коридоре
                 ul = False  # Устанавливаем флаг невозможности движения в данном направлении
-            if dl and any(obj.is_in_and_available_for_move((y + i, x - i)) for obj in self.__rooms + self.__corridors):  # Если координата находится в комнате или коридоре
+            if dl and self.__is_available_for_move((y + i, x - i)):  # Если координата находится в комнате или коридоре
                 options.append((y + i, x - i))  # Добавляем координату в список
             else:  # Если координата не находится в комнате или коридоре
                 dl = False  # Устанавливаем флаг невозможности движения в данном направлении
 
         if not options:  # Если список возможных координат пуст
             return  # Выходим из метода
-        self.__replace_enemy_on_map(place, crd, choice(options), enemy)  # Двигаем объект
+        self.__replace_enemy_on_map(place, crd, self.__rng.choice(options), enemy)  # Двигаем объект
 
     def __engaged_enemy_move(
         self, place: Room | Corridor, crd: Coordinate, enemy: Enemy
@@ -415,54 +516,75 @@ class LevelMap:
         y, x = crd  # Координаты объекта
         possible_moves = [(y, x + 1), (y, x - 1), (y + 1, x), (y - 1, x)]  # Список возможных движений
         if self.__character.get_crd() in possible_moves:  # Если персонаж находится в зоне атаки
-            sleep(0.2)  # Задержка
-            domain_log.info(f"{enemy.__class__.__name__} attacks Character!")  # Логируем атаку персонажа
+            domain_log.info("{name} attacks Character!", name=enemy.__class__.__name__)  # Логируем атаку персонажа
+            self.__hits.add(self.__character.get_crd())  # Отмечаем клетку персонажа для вспышки
+            domain_trace.record(TraceAction.ENEMY_ATTACK, enemy.trace_id, crd)  # Записываем атаку противника в трассу
             g_events, alive = self.__character.harm(*enemy.attack())  # Атакуем персонажа
+            if not alive:  # Если персонаж погиб
+                domain_trace.record(TraceAction.DEATH, TraceBuffer.CHARACTER, self.__character.get_crd())  # Записываем гибель персонажа в трассу
             events.extend(g_events)  # Добавляем события в список
         else:  # Если персонаж не находится в зоне атаки
-            domain_log.info(f"{enemy.__class__.__name__} chases Character!")  # Логируем преследование персонажа
-            c_y, c_x = self.__character.get_crd()  # Координаты персонажа
-            min_dist = (abs(y - c_y) ** 2 + abs(x - c_x) ** 2) + 2  # Минимальное расстояние до персонажа
-            best_move = []  # Список для хранения лучших движений
-            for crd_ in possible_moves:  # Проходим по возможным движениям
-                if not any(obj.is_in_and_available_for_move(crd_) for obj in self.__rooms + self.__corridors):  # Если координата не находится в комнате или коридоре
-                    continue  # Пропускаем координату
-                y_, x_ = crd_  # Координаты возможного движения
-                if (new_dist := (abs(c_x - x_) ** 2 + abs(c_y - y_) ** 2)) <= min_dist:  # Если новое расстояние меньше или равно минимальному
-                    if new_dist < min_dist and best_move:  # Если новое расстояние меньше минимального и список лучших движений не пуст
-                        best_move.pop()  # Удаляем последнее движение из списка
-                    min_dist = new_dist  # Устанавливаем новое минимальное расстояние
-                    best_move.append((y_, x_))  # Добавляем координату в список лучших движений
+            domain_log.debug("{name} chases Character!", name=enemy.__class__.__name__)  # Логируем преследование персонажа
+            if not self.__distances_ready:  # Если карта расстояний в этом ходе еще не рассчитана
+                self.__distances.compute(
+                    self.__character.get_crd(), self.__pursuit_distance, self.__grid.is_walkable
+                )  # Рассчитываем расстояния от персонажа один раз за ход
+                self.__distances_ready = True  # Отмечаем карту расстояний актуальной
+            dist = self.__distances.distance(crd)  # Расстояние от объекта до персонажа
+            if dist == DistanceMap.UNREACHABLE:  # Если путь к персонажу длиннее предела карты расстояний
+                # Карта расстояний ограничена __pursuit_distance, чтобы обход в ширину за ход оставался дешевым;
+                # вовлеченный противник дальше предела не замирает, а идет прежним жадным шагом к персонажу
+                best_move = self.__greedy_moves(crd, possible_moves)  # Свободные соседние клетки по прямой ближе к персонажу
+            else:  # Если путь к персонажу известен
+                best_move = [
+                    crd_ for crd_ in possible_moves if self.__distances.distance(crd_) < dist and self.__is_available_for_move(crd_)
+                ]  # Свободные соседние клетки, которые ближе к персонажу
 
             if best_move:  # Если список лучших движений не пуст
-                self.__replace_enemy_on_map(place, crd, choice(best_move), enemy)  # Двигаем объект
+                self.__replace_enemy_on_map(place, crd, self.__rng.choice(best_move), enemy)  # Двигаем объект
 
         return events, alive  # Возвращаем события и флаг наличия живых объектов
 
+    def __greedy_moves(self, crd: Coordinate, possible_moves: list[Coordinate]) -> list[Coordinate]:
+        y, x = crd  # Координаты объекта
+        c_y, c_x = self.__character.get_crd()  # Координаты персонажа
+        min_dist = (abs(y - c_y) ** 2 + abs(x - c_x) ** 2) + 2  # Минимальное расстояние до персонажа
+        best_move = []  # Список для хранения лучших движений
+        for crd_ in possible_moves:  # Проходим по возможным движениям
+            if not self.__is_available_for_move(crd_):  # Если координата не находится в комнате или коридоре
+                continue  # Пропускаем координату
+            y_, x_ = crd_  # Координаты возможного движения
+            if (new_dist := (abs(c_x - x_) ** 2 + abs(c_y - y_) ** 2)) <= min_dist:  # Если новое расстояние меньше или равно минимальному
+                if new_dist < min_dist and best_move:  # Если новое расстояние меньше минимального и список лучших движений не пуст
+                    best_move.pop()  # Удаляем последнее движение из списка
+                min_dist = new_dist  # Устанавливаем новое минимальное расстояние
+                best_move.append((y_, x_))  # Добавляем координату в список лучших движений
+        return best_move  # Возвращаем лучшие движения
+
+    def __is_available_for_move(self, crd: Coordinate) -> bool:
+        place = self.__grid.walkable_place(crd)  # Комната или коридор, по которым можно пройти
+        return place is not None and place.get_object(crd) is None  # Проверяем, что клетка проходима и свободна
+
     def __replace_enemy_on_map(self, place: Room | Corridor, crd: Coordinate, new_crd: Coordinate, enemy: Enemy):
-        if place.is_in(new_crd):  # Если новая координата находится в комнате или коридоре
-            place.add_object(new_crd, enemy)  # Добавляем объект в новую координату
+        if new_place := self.__grid.walkable_place(new_crd):  # Если новая координата находится в комнате или коридоре
+            self.__dirty.add(new_crd)  # Отмечаем новую клетку объекта для перерисовки
+            new_place.add_object(new_crd, enemy)  # Добавляем объект в новую координату
             place.remove_object(crd)  # Удаляем объект из старой координаты
-        else:  # Если новая координата не находится в комнате или коридоре
-            for new_place in self.__rooms + self.__corridors:  # Проходим по комнатам и коридорам
-                if new_place.is_in(new_crd):  # Если новая координата находится в комнате или коридоре
-                    new_place.add_object(new_crd, enemy)  # Добавляем объект в новую координату
-                    place.remove_object(crd)  # Удаляем объект из старой координаты
-                    break  # Выходим из цикла
+            domain_trace.record(TraceAction.ENEMY_MOVE, enemy.trace_id, new_crd)  # Записываем ход противника в трассу
 
-    @staticmethod
-    def __make_jump_move(place: Room | Corridor, crd: Coordinate, enemy: Enemy) -> None:
+    def __make_jump_move(self, place: Room | Corridor, crd: Coordinate, enemy: Enemy) -> None:
         actual_move_crd = place.get_random_crd_in_zone(crd, enemy.speed)  # Получаем случайную координату в зоне
+        if actual_move_crd == crd:  # Если в зоне нет свободных клеток
+            return  # Объект остается на месте
+        self.__dirty.add(actual_move_crd)  # Отмечаем новую клетку объекта для перерисовки
         place.add_object(actual_move_crd, enemy)  # Добавляем объект в новую координату
         place.remove_object(crd)  # Удаляем объект из старой координаты
+        domain_trace.record(TraceAction.ENEMY_MOVE, enemy.trace_id, actual_move_crd)  # Записываем ход противника в трассу
 
     def is_exit(self) -> bool:
         crd = self.__character.get_crd()  # Координаты персонажа
-        for room in self.__rooms:  # Проходим по комнатам
-            if room.is_in(crd):  # Если координата находится в комнате
-                return room.is_exit(crd)  # Возвращаем True, если координата является выходом
-
-        return False  # Возвращаем False
+        room = self.__grid.place(crd)  # Место, в котором находится персонаж
+        return isinstance(room, Room) and room.is_exit(crd)  # Возвращаем True, если координата является выходом
 
     def get_cell(self, y: int, x: int) -> tuple[str, int]:
         """
@@ -470,35 +592,31 @@ class LevelMap:
         y = column, x = row
         """
         crd = (y, x)  # Координата клетки
-        for corridor in self.__corridors:  # Проходим по коридорам
-            if corridor.is_in_visible(crd):  # Если координата находится в коридоре
-                if self.__is_character_near(crd) and self.__is_point_visible(crd):  # Если персонаж находится рядом и координата видима
-                    self.__visited_corridors.add(crd)  # Добавляем координату в множество посещенных коридоров
-                    return corridor.get_cell(y, x)  # Возвращаем символ и цвет клетки
-                if crd in self.__visited_corridors:  # Если координата находится в множестве посещенных коридоров
-                    return self.__map_symbol, self.__corridor_color  # Возвращаем символ и цвет клетки
-
-        for room in self.__rooms:  # Проходим по комнатам
-            if room.is_in(crd) and (
-                room.has_character or (self.__is_character_near(crd) and self.__is_point_visible(crd))
-            ):  # Если координата находится в комнате и персонаж находится в комнате или рядом и координата видима
-                return room.get_cell(y, x)  # Возвращаем символ и цвет клетки
-            if room.visited:  # Если комната посещена
-                sym, col = room.get_border_symbol(y, x)  # Получаем символ и цвет границы комнаты
-                if sym:  # Если символ существует
-                    return sym, col  # Возвращаем символ и цвет клетки
-                if room.is_exit(crd):  # Если координата является выходом
-                    return room.get_cell(y, x)  # Возвращаем символ и цвет клетки
+        kind = self.__grid.kind(crd)  # Тип клетки
+        if kind == TileGrid.EMPTY:  # Если клетка пустая
+            return self.__map_symbol, self.__map_color  # Возвращаем символ и цвет пустой клетки
+
+        place = self.__grid.owner(crd)  # Комната или коридор, которому принадлежит клетка
+        if kind in (TileGrid.CORRIDOR, TileGrid.DOOR):  # Если координата находится в коридоре или двери
+            if crd in self.__lit_cells:  # Если персонаж находится рядом и координата видима
+                self.__visited_corridors.add(crd)  # Добавляем координату в множество посещенных коридоров
+                return place.get_cell(y, x)  # Возвращаем символ и цвет клетки
+            if crd in self.__visited_corridors:  # Если координата находится в множестве посещенных коридоров
+                return self.__map_symbol, self.__corridor_color  # Возвращаем символ и цвет клетки
+            if kind == TileGrid.DOOR:  # Если координата является дверью
+                place = self.__grid.door_room(crd)  # Комната, в границе которой находится дверь
+                if place.visited:  # Если комната посещена
+                    return place.get_border_symbol(y, x)  # Возвращаем символ и цвет двери в границе комнаты
+        elif kind == TileGrid.ROOM:  # Если координата находится в комнате
+            if place.has_character or crd in self.__lit_cells:  # Если персонаж находится в комнате или рядом и координата видима
+                return place.get_cell(y, x)  # Возвращаем символ и цвет клетки
+            if place.visited and place.is_exit(crd):  # Если комната посещена и координата является выходом
+                return place.get_cell(y, x)  # Возвращаем символ и цвет клетки
+        elif place.visited:  # Если координата является границей посещенной комнаты
+            return place.get_border_symbol(y, x)  # Возвращаем символ и цвет границы комнаты
 
         return self.__map_symbol, self.__map_color  # Возвращаем символ и цвет пустой клетки
 
-    def __is_character_near(self, crd: Coordinate) -> bool:
-        visibility = 3  # Радиус видимости
-        return (
-            abs(crd[0] - self.__character.get_crd()[0]) <= visibility
-            and abs(crd[1] - self.__character.get_crd()[1]) <= visibility
-        )  # Возвращаем True, если персонаж находится рядом с координатой
-
     def drop_item(self, item: Item | None):
         if item:  # Если предмет существует
             y_c, x_c = self.__character.get_crd()  # Координаты персонажа
@@ -506,10 +624,11 @@ class LevelMap:
 
             def place(y_, x_) -> bool:
                 nonlocal item  # Используем nonlocal для изменения переменной item
-                for obj in self.__rooms + self.__corridors:  # Проходим по комнатам и коридорам
-                    if obj.is_in_and_available((y_, x_)):  # Если координата находится в комнате или коридоре и доступна
-                        obj.add_item((y_, x_), item)  # Добавляем предмет в координату
-                        return True  # Возвращаем True
+                obj = self.__grid.place((y_, x_))  # Комната или коридор в координате
+                if obj and obj.is_in_and_available((y_, x_)):  # Если координата находится в комнате или коридоре и доступна
+                    obj.add_item((y_, x_), item)  # Добавляем предмет в координату
+                    self.__dirty.add((y_, x_))  # Отмечаем клетку предмета для перерисовки
+                    return True  # Возвращаем True
 
                 return False  # Возвращаем False
 
@@ -518,7 +637,7 @@ class LevelMap:
             direction = 0  # Направление для поиска места для предмета
             while y <= self.height and x <= self.width:  # Пока координаты находятся в пределах карты
                 if place(y, x):  # Если место для предмета найдено
-                    domain_log.info(f"{item.__class__.__name__} dropped item.")  # Логируем выброс предмета
+                    domain_log.info("{name} dropped item.", name=item.__class__.__name__)  # Логируем выброс предмета
                     break  # Выходим из цикла
 
                 if step == turn:  # Если шаг равен повороту
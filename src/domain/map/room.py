@@ -1,18 +1,23 @@
 from dataclasses import dataclass
-from random import choice, randint, random, sample
+from random import Random
 from typing import Any
 
 from domain import Coordinate
 from domain.map.corridor import Corridor, Door, Key
+from domain.map.free_cells import FreeCells
+from domain.map.spatial_hash import SpatialHash
 from domain.map.settings import (
     ENEMY_CREATION_PROB,
     ITEM_CREATION_PROB,
     ROOM_INDENT,
     ROOM_MINIMUM_HEIGHT,
     ROOM_MINIMUM_WIDTH,
+    ROOM_ROWS,
+    ROOM_COLUMNS,
 )
 from domain.objects.character import Character
 from domain.objects.enemies import ENEMIES
+from domain.objects.enemies.enemy import Enemy
 from domain.objects.items import ITEMS_GEN
 from utils.logger import domain_log
 
@@ -26,26 +31,35 @@ class Room:
     room_symbol_color = 1  # Цвет символа комнаты
     room_border_color = 30  # Цвет границы комнаты
 
-    __doors_map = {  # Словарь для определения возможных сторон дверей
-        0: ["D", "R"],
-        1: ["L", "D", "R"],
-        2: ["L", "D"],
-        3: ["U", "R", "D"],
-        4: ["U", "R", "L", "D"],
-        5: ["U", "L", "D"],
-        6: ["U", "R"],
-        7: ["L", "U", "R"],
-        8: ["L", "U"],
-    }
-
-    def __init__(self, start_x: int, start_y: int, height: int, width: int, id_: int):
+    def __init__(
+        self,
+        start_x: int,
+        start_y: int,
+        height: int,
+        width: int,
+        id_: int,
+        rng: Random,
+        rows: int = ROOM_ROWS,
+        columns: int = ROOM_COLUMNS,
+    ):
+        """
+        :param id_: идентификатор комнаты - номер в сетке комнат по строкам
+        :param rows: количество строк в сетке комнат уровня
+        :param columns: количество столбцов в сетке комнат уровня
+        """
         self.id = id_  # Идентификатор комнаты
-        self.x, self.y, self.x_, self.y_ = generate_room(start_x, start_y, height, width)  # Генерация координат комнаты
+        self.__columns = columns  # Количество столбцов в сетке комнат
+        self.__rng = rng  # Генератор случайных чисел уровня
+        self.x, self.y, self.x_, self.y_ = generate_room(start_x, start_y, height, width, rng)  # Генерация координат комнаты
         self.__objects: dict[Coordinate, Any] = {}  # Словарь для хранения объектов в комнате
         self.__exit: dict[Coordinate, Any] = {}  # Словарь для хранения выхода из комнаты
         self.__items: dict[Coordinate, Any] = {}  # Словарь для хранения предметов в комнате
         self.__keys: dict[Coordinate, Any] = {}  # Словарь для хранения ключей в комнате
-        self.__sides = self.__doors_map[self.id].copy()  # Копия списка возможных сторон дверей
+        self.__free_cells = FreeCells(
+            rng, ((y, x) for y in range(self.y, self.y_ + 1) for x in range(self.x, self.x_ + 1))
+        )  # Свободные клетки комнаты без объектов, выхода, предметов и ключей
+        self.__enemy_index: SpatialHash | None = None  # Пространственный индекс противников уровня
+        self.__sides = grid_sides(id_, rows, columns)  # Стороны, с которых есть соседние комнаты
         self.__doors_coordinates = set()  # Множество для хранения координат дверей
         self.has_character = False  # Флаг наличия персонажа в комнате
         self.__visited = False  # Флаг посещения комнаты
@@ -57,6 +71,9 @@ class Room:
     def visited(self):
         return self.__visited  # Возвращает флаг посещения комнаты
 
+    def visit(self):
+        self.__visited = True  # Устанавливает флаг посещения комнаты
+
     @property
     def doors(self) -> list[Door]:
         return self.__doors  # Возвращает список дверей
@@ -120,16 +137,23 @@ class Room:
             and crd not in self.__items
         )  # Проверяет, находится ли координата внутри комнаты и доступна
 
-    def place_character(self):
-        crds = randint(self.y, self.y_), randint(self.x, self.x_)  # Генерация случайных координат для персонажа
-        self.__objects[crds] = Character.get_instance()  # Размещение персонажа в комнате
-        Character.get_instance().place(crds)  # Установка координат персонажа
+    def place_character(self) -> Coordinate:
+        """
+        Занять клетку персонажа в начальной комнате.
+        Сам персонаж добавляется в комнату картой уровня, когда она становится текущей.
+        :return: координата персонажа
+        """
+        crds = self.__allocate_coordinates()  # Генерация случайных координат для персонажа
+        self.__free_cells.discard(crds)  # Клетка персонажа больше не свободна
         domain_log.info("Character is placed to room id={id}", id=self.id)  # Логирование размещения персонажа
         self.has_character = True  # Установка флага наличия персонажа в комнате
         self.__visited = True  # Установка флага посещения комнаты
+        return crds  # Возвращает координаты персонажа
 
     def place_exit(self):
-        self.__exit[randint(self.y, self.y_), randint(self.x, self.x_)] = Exit()  # Размещение выхода в комнате
+        crd = self.__allocate_coordinates()  # Генерация случайных координат для выхода
+        self.__exit[crd] = Exit()  # Размещение выхода в комнате
+        self.__free_cells.discard(crd)  # Клетка выхода больше не свободна
         domain_log.info("Exit is placed to room id={id}", id=self.id)  # Логирование размещения выхода
 
     def generate_enemies(self, level: int, coef: float):
@@ -140,9 +164,10 @@ class Room:
         :param coef: [0, 2], 1 = не изменять стандартный шанс на генерацию
         """
         for _ in range(level // 4 + 2):
-            if random() - ((level * coef) / 100) < ENEMY_CREATION_PROB:
-                domain_log.info("Generating enemy in room id={id}", id=self.id)  # Логирование генерации врага
-                self.__objects[self.__allocate_coordinates()] = choice(ENEMIES)(level)  # Генерация врага
+            if self.__rng.random() - ((level * coef) / 100) < ENEMY_CREATION_PROB:
+                if crd := self.__allocate_coordinates():  # Если в комнате есть свободная клетка
+                    domain_log.info("Generating enemy in room id={id}", id=self.id)  # Логирование генерации врага
+                    self.add_object(crd, self.__rng.choice(ENEMIES)(level, self.__rng))  # Генерация врага
 
     def generate_items(self, level: int, coef: float):
         """
@@ -156,76 +181,109 @@ class Room:
         coef = (20 * coef) / 100
         if self.__objects:
             for _ in range(len(self.__objects) - self.has_character):
-                if random() - coef + level / 100 < ITEM_CREATION_PROB:
+                if self.__rng.random() - coef + level / 100 < ITEM_CREATION_PROB and (crd := self.__allocate_coordinates()):
                     domain_log.info("Generating item in room id={id}", id=self.id)  # Логирование генерации предмета
-                    self.__items[self.__allocate_coordinates()] = choice(ITEMS_GEN)(level)  # Генерация предмета
-        elif random() - coef + level / 100 < ITEM_CREATION_PROB:
+                    self.add_item(crd, self.__rng.choice(ITEMS_GEN)(level, self.__rng))  # Генерация предмета
+        elif self.__rng.random() - coef + level / 100 < ITEM_CREATION_PROB and (crd := self.__allocate_coordinates()):
             domain_log.info("Generating item in room id={id}", id=self.id)  # Логирование генерации предмета
-            self.__items[self.__allocate_coordinates()] = choice(ITEMS_GEN)(level)  # Генерация предмета
+            self.add_item(crd, self.__rng.choice(ITEMS_GEN)(level, self.__rng))  # Генерация предмета
 
     def generate_keys(self):
+        """
+        Разместить ключи в комнате.
+        Ключи размещаются раньше врагов и предметов, поэтому свободная клетка для них всегда есть.
+        """
         for key in self.has_keys:
-            self.__keys[self.__allocate_coordinates()] = Key(key)  # Генерация ключа
+            crd = self.__allocate_coordinates()  # Генерация случайных координат для ключа
+            self.__keys[crd] = Key(key)  # Генерация ключа
+            self.__free_cells.discard(crd)  # Клетка ключа больше не свободна
 
     def get_random_crd_in_zone(self, crd: Coordinate, radius: int) -> Coordinate:
         """
         Получить рандомную координату в зоне с радиусом
         :param crd: начальная координата
         :param radius: радиус, если радиус == 0 выбрать всю доступную область
+        :return: свободная координата или начальная координата, если свободных клеток нет
         """
         if not radius:
-            return self.__allocate_coordinates()  # Возвращает случайные координаты в комнате
+            return self.__allocate_coordinates() or crd  # Возвращает случайные координаты в комнате
 
         y, x = crd
-        x_ = randint(max(self.x, x - radius), min(self.x_, x + radius))
-        y_ = randint(max(self.y, y - radius), min(self.y_, y + radius))
-        while (y_, x_) in (self.__objects | self.__items | self.__keys):
-            x_ = randint(max(self.x, x - radius), min(self.x_, x + radius))
-            y_ = randint(max(self.y, y - radius), min(self.y_, y + radius))
-        return y_, x_  # Возвращает случайные координаты в зоне
-
-    def __allocate_coordinates(self) -> Coordinate:
-        x_ = randint(self.x, self.x_)
-        y_ = randint(self.y, self.y_)
-        while (y_, x_) in (self.__objects | self.__exit | self.__items | self.__keys):
-            x_ = randint(self.x, self.x_)
-            y_ = randint(self.y, self.y_)
-        return y_, x_  # Возвращает случайные координаты в комнате
+        zone = [
+            (y_, x_)
+            for y_ in range(max(self.y, y - radius), min(self.y_, y + radius) + 1)
+            for x_ in range(max(self.x, x - radius), min(self.x_, x + radius) + 1)
+            if (y_, x_) in self.__free_cells
+        ]  # Свободные клетки в зоне
+        return self.__rng.choice(zone) if zone else crd  # Возвращает случайные координаты в зоне
+
+    def __allocate_coordinates(self) -> Coordinate | None:
+        return self.__free_cells.choice()  # Возвращает случайные свободные координаты в комнате или None
+
+    def __release(self, crd: Coordinate):
+        if crd not in self.__objects and crd not in self.__exit and crd not in self.__items and crd not in self.__keys:
+            self.__free_cells.add(crd)  # Возвращает клетку в свободные, если в ней ничего не осталось
 
     def random_door_sides(self) -> list[str]:
-        return sample(self.__sides, k=randint(1, len(self.__sides))) if self.__sides else self.__sides  # Возвращает случайные стороны для дверей
+        return self.__rng.sample(self.__sides, k=self.__rng.randint(1, len(self.__sides))) if self.__sides else self.__sides  # Возвращает случайные стороны для дверей
 
     def __remove_side(self, side: str):
         if side in self.__sides:
             self.__sides.remove(side)  # Удаляет сторону из списка возможных сторон дверей
 
-    def generate_door(self, side: str) -> tuple[int, str, Coordinate]:
-        self.__remove_side(side)  # Удаляет сторону из списка возможных сторон дверей
+    @property
+    def free_sides(self) -> list[str]:
+        return self.__sides.copy()  # Возвращает стороны, на которых еще нет дверей
+
+    def neighbour(self, side: str) -> tuple[int, str]:
+        """
+        Получить соседнюю комнату по стороне.
+        :return: идентификатор соседней комнаты и сторона, которой она обращена к этой комнате
+        """
         match side:
             case "U":
-                crd = self.y - 1, randint(self.x + 1, self.x_ - 1)
-                self.__doors_coordinates.add(crd)
-                return self.id - 3, "D", crd  # Возвращает идентификатор соседней комнаты, сторону и координаты двери
+                return self.id - self.__columns, "D"
             case "D":
-                crd = self.y_ + 1, randint(self.x + 1, self.x_ - 1)
-                self.__doors_coordinates.add(crd)
-                return self.id + 3, "U", crd  # Возвращает идентификатор соседней комнаты, сторону и координаты двери
+                return self.id + self.__columns, "U"
             case "L":
-                crd = randint(self.y + 1, self.y_ - 1), self.x - 1
-                self.__doors_coordinates.add(crd)
-                return self.id - 1, "R", crd  # Возвращает идентификатор соседней комнаты, сторону и координаты двери
+                return self.id - 1, "R"
             case "R":
-                crd = randint(self.y + 1, self.y_ - 1), self.x_ + 1
-                self.__doors_coordinates.add(crd)
-                return self.id + 1, "L", crd  # Возвращает идентификатор соседней комнаты, сторону и координаты двери
+                return self.id + 1, "L"
             case _:
                 raise ValueError(f"Unable to generate door with an unknown side {side}")  # Выбрасывает исключение при неизвестной стороне
 
+    def generate_door(self, side: str) -> tuple[int, str, Coordinate]:
+        next_id, next_side = self.neighbour(side)  # Соседняя комната
+        self.__remove_side(side)  # Удаляет сторону из списка возможных сторон дверей
+        match side:
+            case "U":
+                crd = self.y - 1, self.__rng.randint(self.x + 1, self.x_ - 1)
+            case "D":
+                crd = self.y_ + 1, self.__rng.randint(self.x + 1, self.x_ - 1)
+            case "L":
+                crd = self.__rng.randint(self.y + 1, self.y_ - 1), self.x - 1
+            case _:
+                crd = self.__rng.randint(self.y + 1, self.y_ - 1), self.x_ + 1
+        self.__doors_coordinates.add(crd)
+        return next_id, next_side, crd  # Возвращает идентификатор соседней комнаты, сторону и координаты двери
+
+    def track_enemies(self, index: SpatialHash):
+        self.__enemy_index = index  # Подключает пространственный индекс противников
+        for crd, obj in self.__objects.items():
+            if isinstance(obj, Enemy):
+                index.add(crd, obj, self)  # Добавляет уже размещенных противников в индекс
+
     def add_object(self, crd: Coordinate, obj: Any):
         self.__objects[crd] = obj  # Добавляет объект в комнату
+        self.__free_cells.discard(crd)  # Клетка объекта больше не свободна
+        if self.__enemy_index is not None and isinstance(obj, Enemy):
+            self.__enemy_index.add(crd, obj, self)  # Добавляет противника в индекс
 
     def remove_object(self, crd: Coordinate):
         del self.__objects[crd]  # Удаляет объект из комнаты
+        self.__release(crd)  # Освобождает клетку
+        if self.__enemy_index is not None:
+            self.__enemy_index.discard(crd)  # Удаляет противника из индекса
 
     def get_object(self, crd: Coordinate) -> Any | None:
         """
@@ -247,8 +305,9 @@ class Room:
 
     def get_key(self, crd: Coordinate) -> Any | None:
         if key := self.__keys.get(crd):
-            Character.get_instance().keys.append(key.color - 3)  # Добавляет ключ персонажу
+            Character.get_instance().keys.append(key.door_color)  # Добавляет ключ персонажу
             self.__keys.pop(crd)  # Удаляет ключ из комнаты
+            self.__release(crd)  # Освобождает клетку
             return key  # Возвращает ключ
         return None  # Возвращает None, если ключа нет
 
@@ -261,9 +320,11 @@ class Room:
 
     def add_item(self, crd: Coordinate, obj: Any):
         self.__items[crd] = obj  # Добавляет предмет в комнату
+        self.__free_cells.discard(crd)  # Клетка предмета больше не свободна
 
     def remove_item(self, crd: Coordinate):
         del self.__items[crd]  # Удаляет предмет из комнаты
+        self.__release(crd)  # Освобождает клетку
 
     def get_item(self, crd: Coordinate) -> Any | None:
         """
@@ -275,22 +336,43 @@ class Room:
     def is_exit(self, crd: Coordinate) -> bool:
         return crd in self.__exit  # Возвращает True, если координата является выходом
 
-def generate_room(x: int, y: int, height: int, width: int) -> tuple[int, int, int, int]:
+def grid_sides(id_: int, rows: int, columns: int) -> list[str]:
+    """
+    Получить стороны комнаты, с которых в сетке есть соседние комнаты.
+    :param id_: Номер комнаты в сетке по строкам
+    :param rows: Количество строк сетки
+    :param columns: Количество столбцов сетки
+    :return: Стороны из "U", "L", "R", "D"
+    """
+    row, column = divmod(id_, columns)
+    sides = []
+    if row > 0:
+        sides.append("U")
+    if column > 0:
+        sides.append("L")
+    if column < columns - 1:
+        sides.append("R")
+    if row < rows - 1:
+        sides.append("D")
+    return sides
+
+def generate_room(x: int, y: int, height: int, width: int, rng: Random) -> tuple[int, int, int, int]:
     """
     Сгенерировать комнату внутри заданного прямоугольника.
     :param x: Координата колонки
     :param y: Координата строки
     :param height: Длина стороны y
     :param width: Длина стороны x
+    :param rng: Генератор случайных чисел уровня
     :return: Координаты комнаты (лев верх, прав ниж)
     """
     if height - ROOM_INDENT * 2 < ROOM_MINIMUM_HEIGHT or width - ROOM_INDENT * 2 < ROOM_MINIMUM_WIDTH:
         raise ValueError("Unable to create room with insufficient space")  # Выбрасывает исключение при недостаточном пространстве
 
-    r_width = randint(ROOM_MINIMUM_WIDTH, width - ROOM_INDENT * 2)
-    r_height = randint(ROOM_MINIMUM_HEIGHT, height - ROOM_INDENT * 2)
+    r_width = rng.randint(ROOM_MINIMUM_WIDTH, width - ROOM_INDENT * 2)
+    r_height = rng.randint(ROOM_MINIMUM_HEIGHT, height - ROOM_INDENT * 2)
 
-    room_x = randint(x + ROOM_INDENT, x + width - ROOM_INDENT - r_width)
-    room_y = randint(y + ROOM_INDENT, y + height - ROOM_INDENT - r_height)
+    room_x = rng.randint(x + ROOM_INDENT, x + width - ROOM_INDENT - r_width)
+    room_y = rng.randint(y + ROOM_INDENT, y + height - ROOM_INDENT - r_height)
 
     return room_x, room_y, room_x + r_width - 1, room_y + r_height - 1  # Возвращает координаты комнаты
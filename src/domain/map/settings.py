@@ -1,6 +1,12 @@
 HEIGHT = 40 # 34
 WIDTH = 80 # 80
 
+MAP_HEIGHT = HEIGHT  # высота карты уровня; если карта больше окна игры, окно прокручивается за персонажем
+MAP_WIDTH = WIDTH  # ширина карты уровня
+
+ROOM_ROWS = 3  # кл-во строк в сетке комнат уровня
+ROOM_COLUMNS = 3  # кл-во столбцов в сетке комнат уровня; клетка сетки должна вмещать комнату минимального размера с отступами
+
 ROOM_INDENT = 2  # минимальное кл-во клеток между комнатами
 ROOM_MINIMUM_WIDTH = 4
 ROOM_MINIMUM_HEIGHT = 3
@@ -8,4 +14,9 @@ ROOM_MINIMUM_HEIGHT = 3
 ENEMY_CREATION_PROB = 0.3  # [0, 1] чем меньше число тем меньше шанс генерации
 ITEM_CREATION_PROB = 0.6  # [0, 1] чем меньше число тем меньше шанс генерации
 
+KEY_COLORS = 3  # кл-во цветов закрытых дверей и ключей на уровне, не больше кл-ва цветов в DoorsColor (6)
+
+DORMANT_DISTANCE = 20  # противники дальше этого кл-ва клеток от персонажа (по любой оси) и в непосещенных комнатах не ходят
+# спящие противники замирают целиком: эффекты и шаблоны движения не продвигаются, пропущенные ходы не воспроизводятся
+
 MAX_LEVEL = 21
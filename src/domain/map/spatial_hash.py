@@ -0,0 +1,64 @@
+from typing import Any  # Импортируем Any для аннотации объектов и мест
+
+from domain import Coordinate  # Импортируем класс Coordinate из модуля domain
+
+
+class SpatialHash:  # Определяем класс SpatialHash для пространственного индекса объектов
+    """
+    Пространственный индекс объектов уровня на равномерной сетке корзин.
+    Для каждой координаты хранится объект и место (комната или коридор), в котором он находится.
+    """
+
+    def __init__(self, cell_size: int):  # Конструктор класса SpatialHash
+        self.cell_size = max(cell_size, 1)  # Размер стороны корзины
+        self.__entries: dict[Coordinate, tuple[Any, Any]] = {}  # Объекты и места по координатам
+        self.__buckets: dict[Coordinate, set[Coordinate]] = {}  # Координаты объектов по корзинам
+        self.__locations: dict[int, Coordinate] = {}  # Координаты объектов по их идентификаторам
+
+    def __len__(self) -> int:  # Метод для получения количества объектов
+        return len(self.__entries)  # Возвращаем количество объектов
+
+    def __bucket(self, crd: Coordinate) -> Coordinate:  # Метод для получения корзины координаты
+        return crd[0] // self.cell_size, crd[1] // self.cell_size  # Возвращаем номер корзины
+
+    def add(self, crd: Coordinate, obj: Any, place: Any):  # Метод для добавления объекта в индекс
+        self.__entries[crd] = (obj, place)  # Запоминаем объект и место
+        self.__locations[id(obj)] = crd  # Запоминаем координату объекта
+        self.__buckets.setdefault(self.__bucket(crd), set()).add(crd)  # Добавляем координату в корзину
+
+    def discard(self, crd: Coordinate):  # Метод для удаления объекта из индекса
+        if (entry := self.__entries.pop(crd, None)) is None:  # Если объекта нет в индексе
+            return  # Выходим из метода
+        if self.__locations.get(id(entry[0])) == crd:  # Если объект не был уже перенесен на новую координату
+            del self.__locations[id(entry[0])]  # Забываем координату объекта
+        bucket = self.__bucket(crd)  # Корзина координаты
+        self.__buckets[bucket].discard(crd)  # Удаляем координату из корзины
+        if not self.__buckets[bucket]:  # Если корзина опустела
+            del self.__buckets[bucket]  # Удаляем корзину
+
+    def query(self, crd: Coordinate, radius: int) -> list[tuple[Coordinate, Any, Any]]:  # Метод для поиска объектов рядом с координатой
+        """
+        Найти объекты в квадрате со стороной 2 * radius + 1 с центром в crd.
+        :return: список (координата, объект, место)
+        """
+        y, x = crd  # Координаты центра
+        (b_y, b_x), (b_y_, b_x_) = self.__bucket((y - radius, x - radius)), self.__bucket((y + radius, x + radius))  # Крайние корзины
+        found = []  # Список найденных объектов
+        for by in range(b_y, b_y_ + 1):  # Проходим по строкам корзин
+            for bx in range(b_x, b_x_ + 1):  # Проходим по столбцам корзин
+                for crd_ in self.__buckets.get((by, bx), ()):  # Проходим по координатам в корзине
+                    if abs(crd_[0] - y) <= radius and abs(crd_[1] - x) <= radius:  # Если координата в квадрате
+                        found.append((crd_, *self.__entries[crd_]))  # Добавляем объект в список
+        return found  # Возвращаем найденные объекты
+
+    def locate(self, obj: Any) -> tuple[Coordinate, Any] | None:  # Метод для поиска объекта в индексе
+        """
+        Найти координату и место объекта.
+        :return: (координата, место) или None, если объекта нет в индексе
+        """
+        if (crd := self.__locations.get(id(obj))) is None:  # Если объекта нет в индексе
+            return None  # Возвращаем None
+        return crd, self.__entries[crd][1]  # Возвращаем координату и место
+
+    def items(self) -> list[tuple[Coordinate, Any, Any]]:  # Метод для получения всех объектов
+        return [(crd, obj, place) for crd, (obj, place) in self.__entries.items()]  # Возвращаем снимок всех объектов
@@ -0,0 +1,104 @@
+from array import array  # Импортируем array для компактного хранения клеток
+
+from domain import Coordinate  # Импортируем класс Coordinate из модуля domain
+
+
+class TileGrid:  # Определяем класс TileGrid для индекса клеток уровня
+    """
+    Индекс клеток уровня.
+    Каждая клетка хранит одно число: тип клетки в младших битах и номер владельца (комнаты или коридора) в старших.
+    """
+
+    EMPTY = 0  # Пустая клетка
+    ROOM = 1  # Клетка внутри комнаты
+    WALL = 2  # Граница комнаты
+    CORRIDOR = 3  # Клетка коридора
+    DOOR = 4  # Дверь
+    LOCKED = 8  # Флаг закрытой двери
+
+    __kind_mask = 0b111  # Маска типа клетки
+    __owner_shift = 4  # Сдвиг номера владельца
+
+    def __init__(self, height: int, width: int):  # Конструктор класса TileGrid
+        self.height = height  # Высота карты
+        self.width = width  # Ширина карты
+        self.__cells = array("H", [self.EMPTY]) * (height * width)  # Массив клеток карты
+        self.__places: list = []  # Список владельцев клеток (комнаты и коридоры)
+        self.__door_rooms: dict = {}  # Словарь комнат, в границе которых находятся двери
+
+    def build(self, rooms: list, corridors: list):  # Метод для заполнения индекса
+        """
+        Заполнить индекс комнатами и коридорами.
+        Порядок владельцев совпадает с порядком rooms + corridors.
+        """
+        self.__places = [*rooms, *corridors]  # Сохраняем список владельцев
+        for place_id, room in enumerate(rooms):  # Проходим по комнатам
+            for y in range(room.y - 1, room.y_ + 2):  # Проходим по строкам комнаты вместе с границей
+                for x in range(room.x - 1, room.x_ + 2):  # Проходим по столбцам комнаты вместе с границей
+                    kind = self.ROOM if room.is_in((y, x)) else self.WALL  # Определяем тип клетки
+                    self.__set((y, x), place_id, kind)  # Записываем клетку
+            for door in room.doors:  # Проходим по дверям комнаты
+                self.__door_rooms[door.crd] = room  # Запоминаем комнату двери
+
+        for place_id, corridor in enumerate(corridors, start=len(rooms)):  # Проходим по коридорам
+            for crd in corridor.cells:  # Проходим по клеткам коридора
+                if self.kind(crd) == self.EMPTY:  # Если клетка еще не занята
+                    self.__set(crd, place_id, self.CORRIDOR)  # Записываем клетку коридора
+            for crd, door in corridor.doors.items():  # Проходим по дверям коридора
+                self.__set(crd, place_id, self.DOOR | (self.LOCKED if door.is_closed else 0))  # Записываем дверь
+
+    def __index(self, crd: Coordinate) -> int:  # Метод для получения индекса клетки в массиве
+        y, x = crd  # Координаты клетки
+        if 0 <= y < self.height and 0 <= x < self.width:  # Если клетка внутри карты
+            return y * self.width + x  # Возвращаем индекс клетки
+        return -1  # Возвращаем -1 для клетки вне карты
+
+    def __set(self, crd: Coordinate, place_id: int, kind: int):  # Метод для записи клетки
+        if (i := self.__index(crd)) >= 0:  # Если клетка внутри карты
+            self.__cells[i] = ((place_id + 1) << self.__owner_shift) | kind  # Записываем владельца и тип клетки
+
+    def __get(self, crd: Coordinate) -> int:  # Метод для чтения клетки
+        i = self.__index(crd)  # Индекс клетки
+        return self.__cells[i] if i >= 0 else self.EMPTY  # Возвращаем значение клетки
+
+    def kind(self, crd: Coordinate) -> int:  # Метод для получения типа клетки
+        return self.__get(crd) & self.__kind_mask  # Возвращаем тип клетки без флагов
+
+    def is_locked(self, crd: Coordinate) -> bool:  # Метод для проверки закрытой двери
+        return bool(self.__get(crd) & self.LOCKED)  # Возвращаем True, если дверь закрыта
+
+    def owner(self, crd: Coordinate):  # Метод для получения владельца клетки
+        """
+        Вернуть комнату или коридор, которому принадлежит клетка (включая границы комнат).
+        """
+        value = self.__get(crd)  # Значение клетки
+        return self.__places[(value >> self.__owner_shift) - 1] if value else None  # Возвращаем владельца или None
+
+    def place(self, crd: Coordinate):  # Метод для получения комнаты или коридора в клетке
+        """
+        Вернуть комнату или коридор для клетки внутри комнаты, коридора или двери.
+        Границы комнат и пустые клетки не принадлежат ни одному месту.
+        """
+        value = self.__get(crd)  # Значение клетки
+        if (value & self.__kind_mask) in (self.EMPTY, self.WALL):  # Если клетка пустая или граница
+            return None  # Возвращаем None
+        return self.__places[(value >> self.__owner_shift) - 1]  # Возвращаем владельца клетки
+
+    def walkable_place(self, crd: Coordinate):  # Метод для получения места, по которому можно пройти
+        """
+        Вернуть комнату или коридор, если по клетке можно пройти (комната, коридор, открытая дверь).
+        """
+        value = self.__get(crd)  # Значение клетки
+        if (value & self.__kind_mask) in (self.EMPTY, self.WALL) or value & self.LOCKED:  # Если клетка непроходима
+            return None  # Возвращаем None
+        return self.__places[(value >> self.__owner_shift) - 1]  # Возвращаем владельца клетки
+
+    def is_walkable(self, crd: Coordinate) -> bool:  # Метод для проверки проходимости клетки
+        return self.walkable_place(crd) is not None  # Возвращаем True, если клетка проходима
+
+    def door_room(self, crd: Coordinate):  # Метод для получения комнаты, в границе которой находится дверь
+        return self.__door_rooms.get(crd)  # Возвращаем комнату или None
+
+    def set_locked(self, crd: Coordinate, locked: bool):  # Метод для обновления состояния двери
+        if (i := self.__index(crd)) >= 0 and (self.__cells[i] & self.__kind_mask) == self.DOOR:  # Если в клетке дверь
+            self.__cells[i] = self.__cells[i] | self.LOCKED if locked else self.__cells[i] & ~self.LOCKED  # Обновляем флаг закрытой двери
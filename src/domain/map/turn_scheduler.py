@@ -0,0 +1,41 @@
+from heapq import heappop, heappush  # Импортируем функции heappop и heappush из модуля heapq для очереди с приоритетом
+from itertools import count  # Импортируем count для порядка действий с одинаковым временем
+from typing import Any  # Импортируем Any для аннотации участников хода
+
+
+class TurnScheduler:  # Определяем класс TurnScheduler для очереди ходов
+    """
+    Очередь ходов на куче (время следующего действия, порядковый номер, участник).
+    Один ход персонажа - это отрезок времени [time, time + 1); участник с задержкой 0.5 действует в нем дважды, с задержкой 2 - через ход.
+    """
+
+    def __init__(self):  # Конструктор класса TurnScheduler
+        self.time = 0.0  # Начало текущего хода
+        self.__queue: list[tuple[float, int, Any]] = []  # Куча запланированных действий
+        self.__order = count()  # Счетчик порядка добавления
+        self.__scheduled: set[int] = set()  # Идентификаторы участников в очереди
+
+    def __len__(self) -> int:  # Метод для получения количества участников в очереди
+        return len(self.__queue)  # Возвращаем количество участников
+
+    def __contains__(self, actor: Any) -> bool:  # Метод для проверки, запланирован ли участник
+        return id(actor) in self.__scheduled  # Возвращаем True, если участник в очереди
+
+    def schedule(self, actor: Any, at: float):  # Метод для планирования действия участника
+        heappush(self.__queue, (at, next(self.__order), actor))  # Добавляем действие в кучу
+        self.__scheduled.add(id(actor))  # Запоминаем участника
+
+    def pop_due(self) -> tuple[float, Any] | None:  # Метод для получения следующего действия в текущем ходе
+        """
+        Забрать из очереди участника, чье действие приходится на текущий ход.
+        Чтобы участник действовал дальше, его нужно снова запланировать.
+        :return: (время действия, участник) или None, если в текущем ходе действий больше нет
+        """
+        if not self.__queue or self.__queue[0][0] >= self.time + 1:  # Если в текущем ходе действий нет
+            return None  # Возвращаем None
+        at, _, actor = heappop(self.__queue)  # Забираем ближайшее действие
+        self.__scheduled.discard(id(actor))  # Участник больше не в очереди
+        return at, actor  # Возвращаем время действия и участника
+
+    def advance(self):  # Метод для перехода к следующему ходу
+        self.time += 1  # Сдвигаем начало хода
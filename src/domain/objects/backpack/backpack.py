@@ -39,7 +39,7 @@ class Backpack:
         return events, added  # Возвращаем события и флаг добавления
 
     def drop_item(self, item_type, slot: int) -> tuple[list[RogueEvent], Item | None]:  # Метод для выброса предмета из рюкзака
-        domain_log.info(f"Dropping item from slot {slot} {item_type.__name__} compartment of backpack")  # Логируем выброс предмета
+        domain_log.info("Dropping item from slot {slot} {type} compartment of backpack", slot=slot, type=item_type.__name__)  # Логируем выброс предмета
         type_size = self.items.type_size(item_type)  # Получаем размер отделения для предметов
         item = None  # Инициализируем переменную для хранения предмета
         events = []  # Список для хранения событий
@@ -60,7 +60,7 @@ class Backpack:
             self.items.weapons.remove(weapon)  # Удаляем оружие из списка
 
     def use_item(self, item_type, slot: int) -> tuple[list[RogueEvent], Item | None]:  # Метод для использования предмета из рюкзака
-        domain_log.info(f"Using item from slot {slot} {item_type.__name__} section of backpack")  # Логируем использование предмета
+        domain_log.info("Using item from slot {slot} {type} section of backpack", slot=slot, type=item_type.__name__)  # Логируем использование предмета
         events = []  # Список для хранения событий
         item = None  # Инициализируем переменную для хранения предмета
 
@@ -78,5 +78,5 @@ class Backpack:
         return events, item  # Возвращаем события и предмет
 
     def show_items(self, item_type):  # Метод для отображения содержимого рюкзака
-        domain_log.info(f"Get backpack contents for {item_type.__name__}")  # Логируем отображение содержимого
+        domain_log.debug("Get backpack contents for {type}", type=item_type.__name__)  # Логируем отображение содержимого
         return self.items.show(item_type)  # Возвращаем содержимое отделения для предметов
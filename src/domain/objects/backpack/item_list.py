@@ -42,16 +42,19 @@ class ItemList:
         elif (isinstance(item, Weapon)) and len(self.weapons) < self.MAX_ITEMS_PER_TYPE:
             added = self._add_to_list(self.weapons, item)
 
-        domain_log.info(
-            f"food: {len(self.food)}/9 potion: {len(self.potions)}/9 scroll:"
-            f" {len(self.scrolls)}/9 weapon: {len(self.weapons)}/9"
+        domain_log.debug(
+            "food: {food}/9 potion: {potions}/9 scroll: {scrolls}/9 weapon: {weapons}/9",
+            food=len(self.food),
+            potions=len(self.potions),
+            scrolls=len(self.scrolls),
+            weapons=len(self.weapons),
         )
 
         return added
 
     @staticmethod
     def _add_to_list(lst: list, item: Item) -> bool:
-        domain_log.info("adding to list")
+        domain_log.debug("adding to list")
         lst.append(item)
         lst.sort()
 
@@ -101,7 +104,7 @@ class ItemList:
         return events, item
 
     def show(self, item_type):
-        domain_log.info(f"showing {self.type_size(item_type)} items of {item_type.__name__}")
+        domain_log.debug("showing {size} items of {type}", size=self.type_size(item_type), type=item_type.__name__)
         return (
             [str(food) for food in self.food]
             if item_type == Food
@@ -1,7 +1,6 @@
-from random import randint, uniform
-
-from pygame.mixer import Sound
+from random import Random
 
+from controller.sound.backend import Sound
 from controller.sound.sound_controller import SoundController, SoundType, SoundUsage
 from datalayer.stats import RogueStats
 from domain import Coordinate
@@ -61,6 +60,7 @@ class Character:
         self.__gold = 0
         self.__is_visible = True
         self.keys = []
+        self.rng = Random()
 
         self.__hit_sound = SoundController.get_instance().get_sound(SoundType.Character, SoundUsage.hit)
         self.__miss_sound = SoundController.get_instance().get_sound(SoundType.Character, SoundUsage.miss)
@@ -170,13 +170,13 @@ class Character:
         return events
 
     def __calculate_attr_up(self, attr, scale):
-        return round(attr * uniform(scale * (1 - self.__attr_random), scale * (1 + self.__attr_random)))
+        return round(attr * self.rng.uniform(scale * (1 - self.__attr_random), scale * (1 + self.__attr_random)))
 
     def __convert_exp_to_gold(self, value: int) -> list[RogueEvent]:
         """
         Добавить золото за убийство противника.
         """
-        gold_ = randint(value // 2, value * 2)
+        gold_ = self.rng.randint(value // 2, value * 2)
         self.__gold += gold_
         RogueStats.get_instance().gold += gold_
 
@@ -212,17 +212,17 @@ class Character:
         events = []
 
         damage_value = 0
-        if is_enemy_hits(e_agility, self.agility):
+        if is_enemy_hits(e_agility, self.agility, self.rng):
             sound.play()
             self.__color = self.harm_color
             damage_value = e_strength
-            domain_log.info(f"{e_name} атакует {self.nickname} нанося {damage_value} урона")
+            domain_log.info("{enemy} атакует {name} нанося {damage} урона", enemy=e_name, name=self.nickname, damage=damage_value)
             events.append(RogueEvent(f"{e_name} атакует {self.nickname} нанося {damage_value} урона", 22))
             if e_effect:
                 events.extend(self.apply_effect(e_effect))
         else:
             self.__miss_sound.play()
-            domain_log.info(f"{e_name} атакует {self.nickname} и промахивается")
+            domain_log.info("{enemy} атакует {name} и промахивается", enemy=e_name, name=self.nickname)
             events.append(RogueEvent(f"{e_name} атакует {self.nickname} и промахивается"))
 
         return events, self.__decrease_hp(damage_value)
@@ -338,7 +338,7 @@ class Character:
         return self.__y, self.__x
 
     def pick_up_item(self, item: Item) -> tuple[list[RogueEvent], bool]:
-        domain_log.info(f"Character picks up item : {item.type}")
+        domain_log.info("Character picks up item : {type}", type=item.type)
         if isinstance(item, Gold):
             return self.add_gold(item), True
 
@@ -1,9 +1,9 @@
 from enum import Enum, auto
+from itertools import count
 from math import ceil
-from random import uniform
-
-from pygame.mixer import Sound
+from random import Random
 
+from controller.sound.backend import Sound
 from controller.sound.sound_controller import SoundController, SoundType, SoundUsage
 from datalayer.stats import RogueStats
 from domain import Coordinate
@@ -28,6 +28,7 @@ class Enemy:
         "s": (25, 12, 1, 2, 10),  # Змей-маг
         "m": (30, 8, 1, 4, 2),  # Мимик
     }
+    MAX_HOSTILITY = max(attrs[4] for attrs in __enemies_attr_map.values())  # Максимальный радиус враждебности
 
     __enemies_names = {
         "z": "Зомби",
@@ -56,9 +57,17 @@ class Enemy:
         "m": MovePattern.ITEM,
     }
 
+    # Ловкость противника, который действует один раз за ход персонажа; задержка между действиями
+    # обратно пропорциональна базовой ловкости: змей-маг действует чаще персонажа, огр и зомби - реже
+    __reference_agility = 8
+
     harm_color = 10
 
-    def __init__(self, enemy_type: str, level: int):
+    __trace_ids = count(1)
+
+    def __init__(self, enemy_type: str, level: int, rng: Random | None = None):
+        self._rng = rng or Random()
+        self.trace_id = next(Enemy.__trace_ids)
         self._symbol = enemy_type
         self._color = self.__enemies_colors[enemy_type]
 
@@ -69,6 +78,7 @@ class Enemy:
         self.__agility = self.__attr_randomize(base_agility * scale_factor)
         self.__strength = self.__attr_randomize(base_strength * scale_factor)
         self.__speed = base_speed
+        self.__action_delay = round(self.__reference_agility / base_agility, 2)  # Ходов персонажа между действиями
         self._hostility = base_hostility
 
         self.__level = level
@@ -98,6 +108,10 @@ class Enemy:
     def speed(self):
         return self.__speed
 
+    @property
+    def action_delay(self):
+        return self.__action_delay
+
     @property
     def strength(self):
         return self.__strength
@@ -114,22 +128,21 @@ class Enemy:
     def is_visible(self):
         return self._is_visible
 
-    @staticmethod
-    def __attr_randomize(scaled_attr: int) -> float:
-        return round(scaled_attr * uniform(0.8, 1.2))
+    def __attr_randomize(self, scaled_attr: int) -> float:
+        return round(scaled_attr * self._rng.uniform(0.8, 1.2))
 
     def add_attack_effect(self) -> RogueEffect | None:
         return None
 
     def attack(self) -> tuple[str, int, int, RogueEffect | None, Sound]:
-        damage = round(uniform(self.__strength * 0.8, self.__strength * 1.2))
+        damage = round(self._rng.uniform(self.__strength * 0.8, self.__strength * 1.2))
         return self.name, damage, int(self.__agility), self.add_attack_effect(), self.__miss_sound
 
     def harm(
         self, e_name: str, e_strength: int, e_agility, e_effect: RogueEffect, sound: Sound
     ) -> tuple[list[RogueEvent], int]:
         events = []
-        if is_enemy_hits(e_agility, self.__agility):
+        if is_enemy_hits(e_agility, self.__agility, self._rng):
             sound.play()
             RogueStats.get_instance().total_hits += 1
             self._color = self.harm_color
@@ -234,9 +247,15 @@ class Enemy:
         s = (abs(x_ch - x_enemy) ** 2 + abs(y_ch - y_enemy) ** 2) ** 0.5
         engaged = s <= self._hostility
         if not engaged:
-            self._state = EnemyState.WALKING
+            self.idle()
         return engaged
 
+    def idle(self):
+        """
+        Перевести противника в обычный режим, когда персонаж вне радиуса враждебности.
+        """
+        self._state = EnemyState.WALKING
+
     def set_engaged_status(self):
         if self._state != EnemyState.ENGAGED:
             self.__engaged_sound.play()
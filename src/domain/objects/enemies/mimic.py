@@ -1,7 +1,6 @@
-from random import choice
-
-from pygame.mixer import Sound
+from random import Random
 
+from controller.sound.backend import Sound
 from controller.sound.sound_controller import SoundController, SoundType, SoundUsage
 from domain.objects.items import ITEMS
 from domain.objects.utils import RogueEffect
@@ -10,10 +9,10 @@ from .enemy import Enemy, EnemyState
 
 
 class Mimic(Enemy):
-    def __init__(self, level: int):
-        super().__init__("m", level)
+    def __init__(self, level: int, rng: Random | None = None):
+        super().__init__("m", level, rng)
         self.__hit_sound = SoundController.get_instance().get_sound(SoundType.Mimic, SoundUsage.hit)
-        mimic_item = choice(ITEMS)
+        mimic_item = self._rng.choice(ITEMS)
         self.mimic_color = mimic_item.color
         self.mimic_symbol = mimic_item.symbol
 
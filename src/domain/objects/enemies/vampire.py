@@ -1,8 +1,7 @@
 from copy import copy
-from random import random
-
-from pygame.mixer import Sound
+from random import Random
 
+from controller.sound.backend import Sound
 from controller.sound.sound_controller import SoundController, SoundType, SoundUsage
 from domain.objects.utils import RogueEffect, RogueEvent
 
@@ -12,14 +11,14 @@ from .enemy import Effects, Enemy
 class Vampire(Enemy):
     __DIMINISHED_HEALTH_PROP = 0.2
 
-    def __init__(self, level: int):
-        super().__init__("v", level)
+    def __init__(self, level: int, rng: Random | None = None):
+        super().__init__("v", level, rng)
         self.__first_hit = True
         self.__effect = RogueEffect(Effects.MAX_HEALTH, -(level * 4), 5)
         self.__hit_sound = SoundController.get_instance().get_sound(SoundType.Vampire, SoundUsage.hit)
 
     def add_attack_effect(self) -> RogueEffect | None:
-        return None if random() > self.__DIMINISHED_HEALTH_PROP else copy(self.__effect)
+        return None if self._rng.random() > self.__DIMINISHED_HEALTH_PROP else copy(self.__effect)
 
     def harm(
         self, e_name: str, e_strength: int, e_agility, e_effect: RogueEffect, sound: Sound
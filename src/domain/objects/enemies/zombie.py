@@ -1,5 +1,6 @@
-from pygame.mixer import Sound
+from random import Random
 
+from controller.sound.backend import Sound
 from controller.sound.sound_controller import SoundController, SoundType, SoundUsage
 
 from ..utils import RogueEffect
@@ -7,8 +8,8 @@ from .enemy import Enemy
 
 
 class Zombie(Enemy):
-    def __init__(self, level: int):
-        super().__init__("z", level)
+    def __init__(self, level: int, rng: Random | None = None):
+        super().__init__("z", level, rng)
         self.__hit_sound = SoundController.get_instance().get_sound(SoundType.Zombie, SoundUsage.hit)
 
     def attack(self) -> tuple[str, int, int, RogueEffect | None, Sound]:
@@ -1,4 +1,4 @@
-import random
+from random import Random
 
 from controller.sound.sound_controller import SoundController, SoundType, SoundUsage
 from datalayer.stats import RogueStats
@@ -19,8 +19,9 @@ class Food(Item):
     symbol = "\u2668" if IS_MACOS else "f"
     color = 9
 
-    def __init__(self, level: int):
-        self.name, self.health_points = self._random_type(level, food_types, base_weights, alpha_values)
+    def __init__(self, level: int, rng: Random | None = None):
+        self.__rng = rng or Random()
+        self.name, self.health_points = self._random_type(level, food_types, base_weights, alpha_values, self.__rng)
         self.__effect = RogueEffect(Effects.HEALTH, self.health_points, 0)
         self.__add_sound = SoundController.get_instance().get_sound(SoundType.Food, SoundUsage.add)
         self.__use_sound = SoundController.get_instance().get_sound(SoundType.Food, SoundUsage.use)
@@ -39,7 +40,7 @@ class Food(Item):
     def use(self) -> tuple[list[RogueEvent], RogueEffect]:
         self.__use_sound.play()
         RogueStats.get_instance().eaten_food += 1
-        return [RogueEvent(random.choice(messages))], self.__effect  # рандомное сообщение еда вкусная или нет
+        return [RogueEvent(self.__rng.choice(messages))], self.__effect  # рандомное сообщение еда вкусная или нет
 
     def _dump(self) -> dict:
         return {"name": self.name, "hp": self.health_points}
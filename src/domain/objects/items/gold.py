@@ -1,4 +1,4 @@
-import random
+from random import Random
 
 from controller.sound.sound_controller import SoundController, SoundType, SoundUsage
 from domain.objects.utils import RogueEvent
@@ -9,8 +9,9 @@ class Gold:
     type = "золото"
     color = 9
 
-    def __init__(self, level: int):
-        self.__amount = int(random.uniform(10, 20 + level) * (level / 7))
+    def __init__(self, level: int, rng: Random | None = None):
+        rng = rng or Random()
+        self.__amount = int(rng.uniform(10, 20 + level) * (level / 7))
         self.__sound = SoundController.get_instance().get_sound(SoundType.Gold, SoundUsage.add)
 
     @staticmethod
@@ -1,6 +1,6 @@
 import math
-import random
 from abc import ABC, abstractmethod
+from random import Random
 from typing import Any
 
 
@@ -16,7 +16,7 @@ class Item(ABC):
         raise NotImplementedError
 
     @staticmethod
-    def _random_type(level: int, item_types, base_weights, alpha_values) -> tuple[Any, Any]:  # TODO типы!
+    def _random_type(level: int, item_types, base_weights, alpha_values, rng: Random) -> tuple[Any, Any]:  # TODO типы!
         target = 0.5
 
         weights = {
@@ -30,7 +30,7 @@ class Item(ABC):
 
         items = list(normalized_weights.keys())
         probabilities = list(normalized_weights.values())
-        chosen_item = random.choices(items, probabilities, k=1)[0]
+        chosen_item = rng.choices(items, probabilities, k=1)[0]
 
         return chosen_item, item_types[chosen_item]
 
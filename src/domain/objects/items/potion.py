@@ -1,4 +1,4 @@
-import random
+from random import Random
 from enum import Enum
 
 from controller.sound.sound_controller import SoundController, SoundType, SoundUsage
@@ -30,14 +30,15 @@ class Potion(Item):
     type = "зелье"
     color = 25
 
-    def __init__(self, level: int):
-        self.feature = random.choice(list(Effects)[:3])
+    def __init__(self, level: int, rng: Random | None = None):
+        rng = rng or Random()
+        self.feature = rng.choice(list(Effects)[:3])
         feature_base = 100 if self.feature == Effects.MAX_HEALTH else 15 if self.feature == Effects.STRENGTH else 12
         self.points = round(
-            random.uniform(feature_base * 0.3 * pow(1.15, level - 1), feature_base * 0.5 * pow(1.15, level - 1))
+            rng.uniform(feature_base * 0.3 * pow(1.15, level - 1), feature_base * 0.5 * pow(1.15, level - 1))
         )
 
-        power = random.choice(list(Power))
+        power = rng.choice(list(Power))
         self.power = power.label
         self.time = power.time  # секунды
         self.__effect = RogueEffect(self.feature, self.points, self.time)
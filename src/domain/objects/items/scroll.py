@@ -1,4 +1,4 @@
-import random
+from random import Random
 
 from controller.sound.sound_controller import SoundController, SoundType, SoundUsage
 from datalayer.stats import RogueStats
@@ -11,11 +11,12 @@ class Scroll(Item):
     type = "свиток"
     color = 26
 
-    def __init__(self, level: int):
-        self.feature = random.choice(list(Effects)[:3])
+    def __init__(self, level: int, rng: Random | None = None):
+        rng = rng or Random()
+        self.feature = rng.choice(list(Effects)[:3])
         feature_base = 100 if self.feature == Effects.MAX_HEALTH else 15 if self.feature == Effects.STRENGTH else 12
         self.points = round(
-            random.uniform(feature_base * 0.05 * pow(1.15, level - 1), feature_base * 0.15 * pow(1.15, level - 1))
+            rng.uniform(feature_base * 0.05 * pow(1.15, level - 1), feature_base * 0.15 * pow(1.15, level - 1))
         )
 
         self.__effect = RogueEffect(self.feature, self.points, 0)
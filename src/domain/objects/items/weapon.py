@@ -1,3 +1,5 @@
+from random import Random
+
 from controller.sound.sound_controller import SoundController, SoundType, SoundUsage
 from domain.objects.items.item import Item
 from domain.objects.utils import Effects, RogueEffect, RogueEvent
@@ -38,8 +40,8 @@ class Weapon(Item):
     type = "оружие"
     color = 27
 
-    def __init__(self, level: int):
-        self.name, self.power = self._random_type(level, weapon_types, base_weights, alpha_values)
+    def __init__(self, level: int, rng: Random | None = None):
+        self.name, self.power = self._random_type(level, weapon_types, base_weights, alpha_values, rng or Random())
         self.__effect = RogueEffect(Effects.STRENGTH, self.power, 0)
         self.held = False
         self.__add_sound = SoundController.get_instance().get_sound(SoundType.Weapon, SoundUsage.add)
@@ -2,7 +2,7 @@ import math
 import platform
 from dataclasses import dataclass
 from enum import Enum
-from random import random
+from random import Random
 
 IS_MACOS = platform.system() == "Darwin"
 
@@ -47,7 +47,7 @@ class RogueEvent:
     color: int = 1
 
 
-def is_enemy_hits(attacker_agility, defender_agility) -> bool:
+def is_enemy_hits(attacker_agility, defender_agility, rng: Random) -> bool:
     k = 0.25
     probability_hit = 0.33 + (0.67 * (1 / (1 + math.exp(-k * (attacker_agility - defender_agility)))))
 
@@ -55,4 +55,4 @@ def is_enemy_hits(attacker_agility, defender_agility) -> bool:
         min_hit_probability = 0.33
         probability_hit = max(probability_hit, min_hit_probability)
 
-    return random() <= probability_hit
+    return rng.random() <= probability_hit
@@ -0,0 +1,16 @@
+from random import Random, SystemRandom
+
+
+def new_seed() -> int:
+    """
+    Сгенерировать новый seed игры.
+    """
+    return SystemRandom().randrange(2**32)
+
+
+def level_random(seed: int, level: int) -> Random:
+    """
+    Создать генератор случайных чисел уровня.
+    Одинаковые seed и уровень дают одинаковые карту, противников, предметы и бои на уровне.
+    """
+    return Random(f"{seed}:{level}")
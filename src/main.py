@@ -1,8 +1,60 @@
+import argparse
+import sys
+from pathlib import Path
+from time import perf_counter
+
 from controller.controller import Controller
+from datalayer.replay import Replay
+from domain.map.settings import HEIGHT, WIDTH
+from view.headless_renderer import HeadlessRenderer
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rogue Game")
+    parser.add_argument("--seed", type=int, default=None, help="seed новой игры для воспроизводимых уровней и боев")
+    parser.add_argument("--record", type=Path, default=None, help="записать seed и клавиши новой игры в файл")
+    parser.add_argument("--replay", type=Path, default=None, help="воспроизвести запись игры без терминала")
+    parser.add_argument("--trace", type=Path, default=None, help="файл для трассы действий (по умолчанию trace.bin в директории логов)")
+    parser.add_argument("--no-sound", action="store_true", help="играть без звука, не загружая pygame")
+    parser.add_argument("--latency", action="store_true", help="замерять задержки фаз хода и сохранить сводку в latency.json в директории логов")
+    return parser.parse_args()
+
+
+def play_replay(path: Path, trace: Path | None = None, latency: bool = False) -> bool:
+    """
+    Воспроизвести запись игры без терминала так быстро, как это возможно.
+    Первая клавиша отвечает на вопрос о начале новой игры, остальные берутся из записи.
+    :return: False, если итог воспроизведения не совпал с записанным
+    """
+    replay = Replay.load(path)
+    renderer = HeadlessRenderer(HEIGHT, WIDTH, ("\n", *replay.keys), nickname=replay.nickname)
+    controller = Controller(renderer, seed=replay.seed, persist=False, trace=trace, sound=False, latency=latency)
+
+    start = perf_counter()
+    controller.start_rogue()
+    elapsed = perf_counter() - start
+
+    print(f"Replayed {len(replay)} keys (seed {replay.seed}) in {elapsed:.3f}s, {renderer.frames} frames")
+    if latency:
+        for phase, stats in controller.latency.report().items():
+            print(f"{phase}: " + ", ".join(f"{name}={value}" for name, value in stats.items()))
+
+    if replay.final is None:
+        print("Replay has no recorded final state, nothing to check")
+        return True
+    final = controller.final_state()
+    if final != replay.final:
+        print(f"Replay check failed: recorded {replay.final}, replayed {final}")
+        return False
+    print(f"Replay check passed: level {final['level']}, crd {tuple(final['crd'])}")
+    return True
 
 
 def main():
-    controller = Controller()
+    args = parse_args()
+    if args.replay:
+        sys.exit(0 if play_replay(args.replay, args.trace, args.latency) else 1)
+    controller = Controller(seed=args.seed, record=args.record, trace=args.trace, sound=not args.no_sound, latency=args.latency)
     controller.start_rogue()
 
 
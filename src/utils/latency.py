@@ -0,0 +1,116 @@
+import json  # Импортируем модуль json для сохранения сводки задержек
+from array import array  # Импортируем array для компактного хранения счетчиков гистограммы
+from pathlib import Path  # Импортируем класс Path из модуля pathlib для работы с путями
+
+from utils.utils import get_log_dir  # Импортируем функцию get_log_dir из модуля utils.utils
+
+
+class LatencyHistogram:  # Определяем класс LatencyHistogram для распределения задержек
+    """
+    Гистограмма задержек фиксированного размера в наносекундах.
+    Корзины логарифмические: на каждую степень двойки приходится SUB_BUCKETS корзин,
+    поэтому память не зависит от количества замеров, а ошибка перцентиля не превышает 1 / SUB_BUCKETS.
+    """
+
+    SUB_BUCKETS = 16  # Количество корзин на степень двойки
+    MAX_BITS = 40  # Наибольшая задержка - 2 ** MAX_BITS нс (около 18 минут)
+
+    __shift = SUB_BUCKETS.bit_length()  # Количество старших бит значения, определяющих корзину
+
+    def __init__(self):  # Конструктор класса LatencyHistogram
+        self.__counts = array("Q", [0]) * ((self.MAX_BITS - self.__shift + 2) * self.SUB_BUCKETS)  # Счетчики корзин
+        self.count = 0  # Количество замеров
+        self.total_ns = 0  # Сумма задержек
+        self.max_ns = 0  # Наибольшая задержка
+
+    def __index(self, ns: int) -> int:  # Метод для получения корзины задержки
+        if ns < self.SUB_BUCKETS:  # Если задержка меньше количества корзин на степень двойки
+            return ns  # Маленькие задержки хранятся точно
+        exp = ns.bit_length() - self.__shift  # Степень двойки задержки
+        return min((exp + 1) * self.SUB_BUCKETS + (ns >> exp) - self.SUB_BUCKETS, len(self.__counts) - 1)  # Возвращаем номер корзины
+
+    def __upper_bound(self, index: int) -> int:  # Метод для получения верхней границы корзины
+        if index < self.SUB_BUCKETS:  # Если корзина хранит точное значение
+            return index  # Возвращаем значение корзины
+        exp, sub = divmod(index, self.SUB_BUCKETS)  # Степень двойки и номер корзины внутри нее
+        return ((sub + self.SUB_BUCKETS + 1) << (exp - 1)) - 1  # Возвращаем наибольшее значение в корзине
+
+    def record(self, ns: int):  # Метод для добавления замера
+        self.__counts[self.__index(ns)] += 1  # Увеличиваем счетчик корзины
+        self.count += 1  # Увеличиваем количество замеров
+        self.total_ns += ns  # Увеличиваем сумму задержек
+        self.max_ns = max(self.max_ns, ns)  # Обновляем наибольшую задержку
+
+    def percentile(self, q: float) -> int:  # Метод для получения перцентиля
+        """
+        Вернуть задержку, не меньше которой доля q замеров.
+        :param q: доля от 0 до 1
+        :return: верхняя граница корзины перцентиля в наносекундах
+        """
+        if not self.count:  # Если замеров нет
+            return 0  # Возвращаем 0
+        rank = max(1, round(q * self.count))  # Порядковый номер замера
+        seen = 0  # Количество пройденных замеров
+        for index, count in enumerate(self.__counts):  # Проходим по корзинам
+            seen += count  # Учитываем замеры корзины
+            if seen >= rank:  # Если нужный замер в этой корзине
+                return min(self.__upper_bound(index), self.max_ns)  # Возвращаем границу корзины, но не больше наибольшей задержки
+        return self.max_ns  # Возвращаем наибольшую задержку
+
+
+class TurnLatency:  # Определяем класс TurnLatency для задержек по фазам хода
+    """
+    Гистограммы задержек фаз обработки хода: нормализация ввода, действие автомата состояний,
+    ход противников, сбор клеток карты и вывод кадра на экран.
+    Замеры включаются явно; выключенный TurnLatency не накапливает ничего.
+    """
+
+    NORMALIZE = "input_normalize"  # Нормализация ввода
+    ACTION = "fsm_action"  # Действие конечного автомата
+    ROGUE_MOVE = "make_rogue_move"  # Ход противников
+    GET_CELL = "get_cell_loop"  # Сбор клеток карты для отрисовки
+    FLUSH = "flush"  # Вывод кадра на экран
+    DEFAULT_FILE = "latency.json"  # Имя файла сводки задержек по умолчанию в директории логов
+
+    def __init__(self, enabled: bool = False):  # Конструктор класса TurnLatency
+        """
+        :param enabled: True - записывать замеры; иначе record ничего не делает
+        """
+        self.enabled = enabled  # Флаг записи замеров
+        self.__phases = {
+            phase: LatencyHistogram() for phase in (self.NORMALIZE, self.ACTION, self.ROGUE_MOVE, self.GET_CELL, self.FLUSH)
+        }  # Гистограммы фаз
+
+    def record(self, phase: str, ns: int):  # Метод для добавления замера фазы
+        if not self.enabled:  # Если замеры выключены
+            return
+        self.__phases[phase].record(ns)  # Добавляем замер в гистограмму фазы
+
+    def report(self) -> dict[str, dict]:  # Метод для получения сводки задержек
+        """
+        Сводка задержек по фазам в микросекундах.
+        :return: словарь фаза -> {count, p50_us, p95_us, p99_us, max_us}
+        """
+        return {
+            phase: {
+                "count": hist.count,  # Количество замеров
+                "p50_us": round(hist.percentile(0.50) / 1000, 1),  # Медиана
+                "p95_us": round(hist.percentile(0.95) / 1000, 1),  # 95-й перцентиль
+                "p99_us": round(hist.percentile(0.99) / 1000, 1),  # 99-й перцентиль
+                "max_us": round(hist.max_ns / 1000, 1),  # Наибольшая задержка
+            }
+            for phase, hist in self.__phases.items()
+        }  # Возвращаем сводку
+
+    def dump(self, path: Path | None = None) -> Path:  # Метод для сохранения сводки задержек в файл
+        """
+        Сохранить сводку задержек в JSON.
+        :param path: путь к файлу; по умолчанию latency.json в директории логов
+        :return: путь к сохраненному файлу
+        """
+        if path is None:  # Если путь не задан
+            log_dir = get_log_dir()  # Директория логов
+            log_dir.mkdir(parents=True, exist_ok=True)  # Создаем директорию, если она не существует
+            path = log_dir / self.DEFAULT_FILE  # Путь к файлу сводки по умолчанию
+        path.write_text(json.dumps(self.report(), indent=4), encoding="utf-8")  # Записываем сводку
+        return path  # Возвращаем путь к файлу
@@ -1,11 +1,16 @@
+import os  # Импортируем модуль os для чтения переменных окружения
+
 from loguru import logger  # Импортируем библиотеку loguru для логирования
 
-from utils.utils import get_project_root  # Импортируем функцию get_project_root из модуля utils.utils
+from utils.utils import get_log_dir  # Импортируем функцию get_log_dir из модуля utils.utils
 
 logger.remove()  # Удаляем все предыдущие конфигурации логгера
 
-log_directory = get_project_root() / "log"  # Создаем путь к директории для логов
-log_directory.mkdir(exist_ok=True)  # Создаем директорию для логов, если она не существует
+log_directory = get_log_dir()  # Создаем путь к директории для логов; ROGUE_LOG_DIR переопределяет ее
+log_directory.mkdir(parents=True, exist_ok=True)  # Создаем директорию для логов, если она не существует
+
+log_level = os.environ.get("ROGUE_LOG_LEVEL", "INFO").upper()  # Уровень логирования, по умолчанию INFO
+log_debug = log_level in {"TRACE", "DEBUG"}  # Отладочный режим: трассировка и диагностика исключений
 
 controller_log = logger.bind(name="controller")  # Создаем логгер для контроллера
 controller_log.add(  # Добавляем конфигурацию для логгера контроллера
@@ -15,11 +20,12 @@ controller_log.add(  # Добавляем конфигурацию для лог
         "<cyan>{file}</cyan>:<cyan>{line}</cyan> "
         "<level>{level: <8}</level>: {message}"
     ),
-    level="DEBUG",  # Устанавливаем уровень логирования на DEBUG
+    level=log_level,  # Устанавливаем уровень логирования
     filter=lambda record: record["extra"].get("name") == "controller",  # Фильтруем логи по имени "controller"
     rotation="10 MB",  # Устанавливаем ротацию логов при достижении размера 10 MB
-    backtrace=True,  # Включаем трассировку стека
-    diagnose=True,  # Включаем диагностику
+    backtrace=log_debug,  # Трассировка стека только в отладочном режиме
+    diagnose=log_debug,  # Значения переменных в трассировке только в отладочном режиме
+    enqueue=True,  # Пишем в файл из фонового потока через очередь, чтобы не блокировать игровой цикл
 )
 
 view_log = logger.bind(name="view")  # Создаем логгер для представления
@@ -30,11 +36,12 @@ view_log.add(  # Добавляем конфигурацию для логгер
         "<cyan>{file}</cyan>:<cyan>{line}</cyan> "
         "<level>{level: <8}</level>: {message}"
     ),
-    level="DEBUG",  # Устанавливаем уровень логирования на DEBUG
+    level=log_level,  # Устанавливаем уровень логирования
     filter=lambda record: record["extra"].get("name") == "view",  # Фильтруем логи по имени "view"
     rotation="10 MB",  # Устанавливаем ротацию логов при достижении размера 10 MB
-    backtrace=True,  # Включаем трассировку стека
-    diagnose=True,  # Включаем диагностику
+    backtrace=log_debug,  # Трассировка стека только в отладочном режиме
+    diagnose=log_debug,  # Значения переменных в трассировке только в отладочном режиме
+    enqueue=True,  # Пишем в файл из фонового потока через очередь, чтобы не блокировать игровой цикл
 )
 
 domain_log = logger.bind(name="domain")  # Создаем логгер для домена
@@ -45,9 +52,10 @@ domain_log.add(  # Добавляем конфигурацию для логге
         "<cyan>{file}</cyan>:<cyan>{line}</cyan> "
         "<level>{level: <8}</level>: {message}"
     ),
-    level="DEBUG",  # Устанавливаем уровень логирования на DEBUG
+    level=log_level,  # Устанавливаем уровень логирования
     filter=lambda record: record["extra"].get("name") == "domain",  # Фильтруем логи по имени "domain"
     rotation="10 MB",  # Устанавливаем ротацию логов при достижении размера 10 MB
-    backtrace=True,  # Включаем трассировку стека
-    diagnose=True,  # Включаем диагностику
+    backtrace=log_debug,  # Трассировка стека только в отладочном режиме
+    diagnose=log_debug,  # Значения переменных в трассировке только в отладочном режиме
+    enqueue=True,  # Пишем в файл из фонового потока через очередь, чтобы не блокировать игровой цикл
 )
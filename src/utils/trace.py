@@ -0,0 +1,96 @@
+import struct  # Импортируем модуль struct для упаковки записей в байты
+from collections.abc import Iterator  # Импортируем Iterator для аннотации декодера
+from enum import IntEnum  # Импортируем IntEnum для кодов действий
+from pathlib import Path  # Импортируем класс Path из модуля pathlib для работы с путями
+
+from utils.utils import get_log_dir  # Импортируем функцию get_log_dir из модуля utils.utils
+
+
+class TraceAction(IntEnum):  # Определяем перечисление TraceAction для кодов действий в трассе
+    LEVEL = 1  # Создан уровень, координаты - (номер уровня, 0)
+    MOVE = 2  # Персонаж переместился
+    ATTACK = 3  # Персонаж атаковал противника в координате
+    KILL = 4  # Персонаж победил противника в координате
+    PICK_UP = 5  # Персонаж подобрал предмет
+    DOOR_OPEN = 6  # Персонаж открыл дверь ключом
+    DOOR_LOCKED = 7  # Персонаж уперся в запертую дверь
+    ENEMY_MOVE = 8  # Противник переместился
+    ENEMY_ATTACK = 9  # Противник атаковал персонажа
+    DEATH = 10  # Персонаж погиб
+
+
+class TraceBuffer:  # Определяем класс TraceBuffer для кольцевого буфера трассы
+    """
+    Кольцевой буфер бинарных записей трассы фиксированного размера.
+    Запись - номер хода, идентификатор действующего лица, код действия и координаты, упакованные struct.
+    Добавление записи не выделяет память и не пишет на диск; буфер сохраняется в файл только по запросу.
+    """
+
+    CHARACTER = 0  # Идентификатор персонажа в трассе
+    MAGIC = b"RGTR"  # Сигнатура файла трассы
+    VERSION = 1  # Версия формата файла трассы
+    DEFAULT_FILE = "trace.bin"  # Имя файла трассы по умолчанию в директории логов
+
+    record_struct = struct.Struct("<IIBhh")  # Формат записи: ход, действующее лицо, действие, y, x
+    header_struct = struct.Struct("<4sBBI")  # Формат заголовка: сигнатура, версия, размер записи, количество записей
+
+    def __init__(self, capacity: int):  # Конструктор класса TraceBuffer
+        self.capacity = capacity  # Наибольшее количество хранимых записей
+        self.turn = 0  # Номер текущего хода
+        self.__buffer = bytearray(capacity * self.record_struct.size)  # Память под записи
+        self.__written = 0  # Количество записей, добавленных за все время
+
+    def __len__(self) -> int:  # Метод для получения количества хранимых записей
+        return min(self.__written, self.capacity)  # Возвращаем количество хранимых записей
+
+    def next_turn(self):  # Метод для перехода к следующему ходу
+        self.turn += 1  # Увеличиваем номер хода
+
+    def record(self, action: TraceAction, actor: int, crd: tuple[int, int]):  # Метод для добавления записи
+        offset = self.__written % self.capacity * self.record_struct.size  # Смещение записи в буфере
+        self.record_struct.pack_into(self.__buffer, offset, self.turn, actor, action, crd[0], crd[1])  # Упаковываем запись на место самой старой
+        self.__written += 1  # Увеличиваем количество записей
+
+    def to_bytes(self) -> bytes:  # Метод для получения записей в хронологическом порядке
+        if self.__written <= self.capacity:  # Если буфер еще не переполнялся
+            return bytes(self.__buffer[: self.__written * self.record_struct.size])  # Возвращаем записанную часть
+        split = self.__written % self.capacity * self.record_struct.size  # Граница самой старой записи
+        return bytes(self.__buffer[split:] + self.__buffer[:split])  # Возвращаем записи от самой старой к самой новой
+
+    def dump(self, path: Path | None = None) -> Path:  # Метод для сохранения буфера в файл
+        """
+        Сохранить записи буфера в файл.
+        :param path: путь к файлу; по умолчанию trace.bin в директории логов
+        :return: путь к сохраненному файлу
+        """
+        path = path or self.default_path()  # Путь к файлу трассы
+        with path.open(mode="wb") as wr_f:  # Открываем файл для записи
+            wr_f.write(self.header_struct.pack(self.MAGIC, self.VERSION, self.record_struct.size, len(self)))  # Записываем заголовок
+            wr_f.write(self.to_bytes())  # Записываем записи
+        return path  # Возвращаем путь к файлу
+
+    @classmethod
+    def default_path(cls) -> Path:  # Метод для получения пути к файлу трассы по умолчанию
+        """
+        Путь к файлу трассы в директории логов, которую можно переопределить переменной окружения ROGUE_LOG_DIR.
+        """
+        log_dir = get_log_dir()  # Директория логов
+        log_dir.mkdir(parents=True, exist_ok=True)  # Создаем директорию, если она не существует
+        return log_dir / cls.DEFAULT_FILE  # Возвращаем путь к файлу трассы
+
+    @classmethod
+    def decode(cls, path: Path) -> Iterator[tuple[int, int, TraceAction, int, int]]:  # Метод для чтения файла трассы
+        """
+        Прочитать записи из файла трассы.
+        :return: итератор (ход, действующее лицо, действие, y, x)
+        """
+        data = path.read_bytes()  # Читаем файл целиком
+        magic, version, size, count = cls.header_struct.unpack_from(data)  # Распаковываем заголовок
+        if magic != cls.MAGIC or version != cls.VERSION or size != cls.record_struct.size:  # Если формат файла не поддерживается
+            raise ValueError(f"Unsupported trace file: {path}")  # Выбрасываем исключение
+
+        for turn, actor, action, y, x in cls.record_struct.iter_unpack(data[cls.header_struct.size :][: count * size]):  # Проходим по записям
+            yield turn, actor, TraceAction(action), y, x  # Возвращаем запись
+
+
+domain_trace = TraceBuffer(1 << 16)  # Трасса действий на уровне
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 
@@ -7,3 +8,7 @@ def get_project_root() -> Path:
         path_ = path_.parent
 
     return path_.parent
+
+
+def get_log_dir() -> Path:
+    return Path(os.environ.get("ROGUE_LOG_DIR") or get_project_root() / "log")
@@ -0,0 +1,98 @@
+from collections import deque
+from collections.abc import Iterable
+
+from controller.game_info import GameInfo
+from domain.objects.utils import RogueEvent
+from view.renderer import Renderer
+
+
+class HeadlessRenderer(Renderer):
+    """
+    Рендерер без терминала.
+    Хранит кадр карты в памяти и берет ввод из заранее заданной последовательности клавиш:
+    каждый вопрос и диалог получает ответ оттуда же, откуда его получил бы игрок у терминала.
+    Когда клавиши заканчиваются, отвечает выходом из игры и подтверждает его.
+    """
+
+    interactive = False
+
+    __empty_cell = (" ", 1)
+    __quit_key = "q"
+    __confirm_key = "\n"
+
+    def __init__(self, height: int, width: int, keys: Iterable[str] = (), nickname: str = "Rogue"):
+        self.height = height - 4
+        self.width = width
+        self.frame = [[self.__empty_cell] * self.width for _ in range(self.height)]
+        self.events: deque[RogueEvent] = deque(maxlen=4)
+        self.game_info: GameInfo | None = None
+        self.frames = 0
+        self.nickname = nickname
+        self.__keys = iter(keys)
+
+    def __next_key(self, default: str) -> str:
+        return next(self.__keys, default)
+
+    def render_controls(self):
+        pass
+
+    def render_event(self, event: RogueEvent):
+        self.events.appendleft(event)
+
+    def show_intro(self, start=True, death=True, pause=False):
+        pass
+
+    def clear_intro(self):
+        pass
+
+    def render_load_question(self) -> int | str:
+        return self.__next_key(self.__quit_key)
+
+    def render_start_question(self) -> int | str:
+        return self.__next_key(self.__quit_key)
+
+    def get_input(self, game_state: int, timeout: float | None = None) -> int | str | None:
+        return self.__next_key(self.__quit_key)
+
+    def get_player_name(self) -> str:
+        return self.nickname
+
+    def confirm_name(self) -> int | str:
+        return self.__next_key(self.__confirm_key)
+
+    def render_game_info(self, game_info: GameInfo):
+        self.game_info = game_info
+
+    def draw_inventory(self, content: list[str], question: str, choice: str) -> int | str:
+        return self.__next_key(self.__quit_key)
+
+    def clear_game_window(self):
+        for row in self.frame:
+            row[:] = [self.__empty_cell] * self.width
+
+    def refresh_game_window(self):
+        pass
+
+    def render_map_crd(self, y: int, x: int, symbol: str, color: int):
+        self.frame[y][x] = (symbol, color)
+
+    def render_map_row(self, y: int, x: int, cells: list[tuple[str, int]]):
+        self.frame[y][x : x + len(cells)] = cells
+
+    def draw_exit_window(self) -> int | str:
+        return self.__next_key(self.__confirm_key)
+
+    def show_stats(self, stats: list[dict]):
+        pass
+
+    def draw_event_box(self):
+        pass
+
+    def flush(self):
+        self.frames += 1
+
+    def dump(self) -> str:
+        """
+        Вернуть текущий кадр карты в виде текста.
+        """
+        return "\n".join("".join(symbol for symbol, _ in row) for row in self.frame)
@@ -1,9 +1,9 @@
 import curses
-import time
 
 from controller.game_info import GameInfo
 from domain.objects.utils import RogueEvent
 from view import utils
+from view.renderer import Renderer
 
 
 class EventSlot:
@@ -19,7 +19,7 @@ class EventSlot:
         self.color = color
         self.window.erase()
         self.window.addstr(0, 0, self.info[: self.__width - 1], curses.color_pair(self.color))
-        self.window.refresh()
+        self.window.noutrefresh()
 
     def pop(self) -> str:
         v = self.info
@@ -29,7 +29,12 @@ class EventSlot:
         return v, c
 
 
-class MapRenderer:
+class MapRenderer(Renderer):
+    __color_pairs = 37
+    __intro_time = 3000
+
+    flash_color = 28
+
     def __init__(self, height: int, width: int):
         self.height = height + 9
         self.width = max(width + 8, len(utils.STATS_TABLE_HEADER_1) + 4)
@@ -60,10 +65,9 @@ class MapRenderer:
             self.controls_window.addstr(i * 2 + 12, 5, key[1])
 
         self.controls_window.addstr(36, 7, "ROGUE 1980", curses.A_BOLD)
-        self.controls_window.refresh()
+        self.controls_window.noutrefresh()
 
-    @staticmethod
-    def __init_colors() -> None:
+    def __init_colors(self) -> None:
         curses.curs_set(0)
         curses.start_color()
         curses.init_pair(1, curses.COLOR_WHITE, curses.COLOR_BLACK)  # Пустое пространство
@@ -93,9 +97,18 @@ class MapRenderer:
         curses.init_pair(25, 160, curses.COLOR_BLACK)  # Зелья
         curses.init_pair(26, 229, curses.COLOR_BLACK)  # Свитки
         curses.init_pair(27, 129, curses.COLOR_BLACK)  # Оружие
+        curses.init_pair(28, curses.COLOR_WHITE, 197)  # Вспышка при попадании
 
         #curses.init_pair(31, 110, curses.COLOR_BLACK)  # Коридоры
         curses.init_pair(30, 100, curses.COLOR_BLACK)  # стены
+        curses.init_pair(31, curses.COLOR_BLACK, curses.COLOR_YELLOW)  # Yellow door
+        curses.init_pair(32, curses.COLOR_BLACK, curses.COLOR_CYAN)  # Cyan door
+        curses.init_pair(33, curses.COLOR_BLACK, curses.COLOR_MAGENTA)  # Magenta door
+        curses.init_pair(34, curses.COLOR_YELLOW, curses.COLOR_BLACK)  # Yellow Key
+        curses.init_pair(35, curses.COLOR_CYAN, curses.COLOR_BLACK)  # Cyan Key
+        curses.init_pair(36, curses.COLOR_MAGENTA, curses.COLOR_BLACK)  # Magenta Key
+
+        self.__color_attrs = [curses.color_pair(pair) for pair in range(self.__color_pairs)]
 
     def render_event(self, event: RogueEvent):
         self.draw_event_box()
@@ -117,21 +130,11 @@ class MapRenderer:
 
         self.common_window.refresh()
 
-        if pause:
-            start_time = time.time()
-            pause_time = 3
-
-            self.common_window.nodelay(True)
-
-            while time.time() - start_time < pause_time:
-                key = self.common_window.getch()
-                if key != -1:
-                    break
-                time.sleep(0.05)
-
-            self.common_window.nodelay(False)
-        else:
-            time.sleep(3)
+        if not pause:
+            curses.flushinp()
+        self.common_window.timeout(self.__intro_time)
+        self.common_window.getch()
+        self.common_window.timeout(-1)
 
         curses.flushinp()
 
@@ -165,12 +168,21 @@ class MapRenderer:
     def render_start_question(self) -> int | str:
         return self.__render_question(utils.START_QUESTION, utils.START_CHOICE)
 
-    def get_input(self, game_state: int) -> int | str:
+    def get_input(self, game_state: int, timeout: float | None = None) -> int | str | None:
         curses.flushinp()
         if game_state == 3:  # noqa PLR2004
             return self.__render_question(utils.DROP_QUESTION, utils.DROP_CHOICE, True)
 
-        return self.common_window.get_wch()
+        if timeout is None:
+            return self.common_window.get_wch()
+
+        self.common_window.timeout(max(round(timeout * 1000), 1))
+        try:
+            return self.common_window.get_wch()
+        except curses.error:
+            return None
+        finally:
+            self.common_window.timeout(-1)
 
     def get_player_name(self) -> str:
         input_win_height, input_win_width = 4, len(utils.GET_NAME_CHOICE) + 4
@@ -234,13 +246,13 @@ class MapRenderer:
             indent += len(line) + space + (extra_space > 0)
             extra_space -= 1
         self.game_info_window.box()
-        self.game_info_window.refresh()
+        self.game_info_window.noutrefresh()
 
     def draw_inventory(self, content: list[str], question: str, choice: str) -> int | str:
         self.game_window.erase()
         self.render_inventory(content)
         self.game_window.box()
-        self.game_window.refresh()
+        self.game_window.noutrefresh()
         ch = self.__render_question(question, choice, True)
         curses.flushinp()
         return ch
@@ -250,10 +262,22 @@ class MapRenderer:
 
     def refresh_game_window(self):
         self.game_window.box()
-        self.game_window.refresh()
+        self.game_window.noutrefresh()
 
     def render_map_crd(self, y: int, x: int, symbol: str, color: int):
-        self.game_window.addch(y + 1, x + 1, symbol, curses.color_pair(color))
+        self.game_window.addch(y + 1, x + 1, symbol, self.__color_attrs[color])
+
+    def render_map_row(self, y: int, x: int, cells: list[tuple[str, int]]):
+        """
+        Нарисовать подряд идущие клетки строки карты.
+        Клетки одного цвета выводятся одним вызовом addstr.
+        """
+        start = 0
+        for i in range(1, len(cells) + 1):
+            if i == len(cells) or cells[i][1] != cells[start][1]:
+                run = "".join(symbol for symbol, _ in cells[start:i])
+                self.game_window.addstr(y + 1, x + start + 1, run, self.__color_attrs[cells[start][1]])
+                start = i
 
     def render_inventory(self, content: list[str]):
         for i in range(len(content)):
@@ -327,6 +351,7 @@ class MapRenderer:
                 k += 1
 
         base_loop()
+        self.flush()
         while (w_char := self.common_window.get_wch()) not in ["q", "Q", "й", "Й"]:
             if w_char in ["s", "S", "ы", "Ы"] and f < n - 1:
                 s += 1
@@ -335,10 +360,18 @@ class MapRenderer:
             elif s != 0:
                 continue
             base_loop()
+            self.flush()
 
         self.common_window.refresh()
         curses.flushinp()
 
     def draw_event_box(self):
         self.event_box.box()
-        self.event_box.refresh()
+        self.event_box.noutrefresh()
+
+    @staticmethod
+    def flush():
+        """
+        Вывести на терминал все окна, подготовленные через noutrefresh, одним обновлением.
+        """
+        curses.doupdate()
@@ -0,0 +1,108 @@
+from abc import ABC, abstractmethod
+
+from controller.game_info import GameInfo
+from domain.objects.utils import RogueEvent
+
+
+class Renderer(ABC):
+    """
+    Интерфейс отрисовки и ввода, которым пользуется контроллер.
+    """
+
+    interactive = True
+    flash_color = 10
+
+    @abstractmethod
+    def render_controls(self):
+        """Нарисовать панель управления"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def render_event(self, event: RogueEvent):
+        """Показать игровое событие"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def show_intro(self, start=True, death=True, pause=False):
+        """Показать заставку"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear_intro(self):
+        """Убрать заставку"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def render_load_question(self) -> int | str:
+        """Спросить о загрузке сохранения и вернуть нажатую клавишу"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def render_start_question(self) -> int | str:
+        """Спросить о начале новой игры и вернуть нажатую клавишу"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_input(self, game_state: int, timeout: float | None = None) -> int | str | None:
+        """Получить клавишу в игровом цикле; None, если за timeout секунд клавиша не нажата"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_player_name(self) -> str:
+        """Получить никнейм персонажа"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def confirm_name(self) -> int | str:
+        """Подтвердить занятый никнейм и вернуть нажатую клавишу"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def render_game_info(self, game_info: GameInfo):
+        """Нарисовать характеристики персонажа"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def draw_inventory(self, content: list[str], question: str, choice: str) -> int | str:
+        """Показать инвентарь и вернуть нажатую клавишу"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear_game_window(self):
+        """Очистить окно карты"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def refresh_game_window(self):
+        """Подготовить окно карты к выводу"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def render_map_crd(self, y: int, x: int, symbol: str, color: int):
+        """Нарисовать клетку карты"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def render_map_row(self, y: int, x: int, cells: list[tuple[str, int]]):
+        """Нарисовать подряд идущие клетки строки карты"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def draw_exit_window(self) -> int | str:
+        """Спросить о выходе из игры и вернуть нажатую клавишу"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def show_stats(self, stats: list[dict]):
+        """Показать таблицу статистики"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def draw_event_box(self):
+        """Нарисовать рамку окна событий"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def flush(self):
+        """Вывести подготовленный кадр"""
+        raise NotImplementedError